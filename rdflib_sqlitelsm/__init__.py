@@ -41,3 +41,17 @@ plugin.register(
     "rdflib_sqlitelsm.sqlitelsmstore",
     "SQLiteLSMStore",
 )
+
+plugin.register(
+    "SQLiteLSMSharded",
+    store.Store,
+    "rdflib_sqlitelsm.shardedstore",
+    "ShardedSQLiteLSMStore",
+)
+
+plugin.register(
+    "SQLiteLSMPartitioned",
+    store.Store,
+    "rdflib_sqlitelsm.partitionedstore",
+    "PartitionedSQLiteLSMStore",
+)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+An asyncio facade over :class:`~rdflib_sqlitelsm.sqlitelsmstore.SQLiteLSMStore`.
+
+LSM scans and writes block, so :class:`AsyncSQLiteLSMStore` runs them on a
+bounded number of worker threads and hands results back to the event loop.
+:meth:`AsyncSQLiteLSMStore.atriples` is an async iterator over batches of
+a scan, each read by a call of its own in a worker, so other calls run
+between the batches of a scan and a slow consumer holds no worker. A scan
+never reads further ahead than ``prefetch`` batches.
+
+# async with AsyncSQLiteLSMStore(store) as astore:
+#     async for (s, p, o), contexts in astore.atriples((None, None, None)):
+#         ...
+
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
+
+__all__ = ["AsyncSQLiteLSMStore"]
+
+
+class AsyncSQLiteLSMStore:
+    """
+    Awaitable versions of the store operations that touch LSM.
+
+    Calls run on at most ``max_workers`` threads, each with a queue of its
+    own, taken in turn. Unless the store was created with
+    ``threadsafe=True`` its handles must not be used from two threads at
+    once, so ``max_workers`` is then forced to 1 and calls run one at a
+    time. The batches of a scan are all read in the one thread, whose read
+    handles the scan's cursors are on.
+    """
+
+    def __init__(self, store, max_workers=4, batch_size=1000, prefetch=2):
+        if not getattr(store, "threadsafe", False):
+            max_workers = 1
+        self.store = store
+        self.batch_size = batch_size
+        self.prefetch = prefetch
+        self.max_workers = max_workers
+        self.__workers = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlitelsm")
+            for _ in range(max_workers)
+        ]
+        self.__turn = count()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def __worker(self):
+        return self.__workers[next(self.__turn) % len(self.__workers)]
+
+    async def __run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__worker(), func, *args)
+
+    async def atriples(self, spo, context=None):
+        """
+        An async iterator over the ``((s, p, o), contexts)`` matches of
+        :meth:`~SQLiteLSMStore.triples`, with ``contexts`` as a tuple
+        """
+        loop = asyncio.get_running_loop()
+        worker = self.__worker()
+        batch_size = self.batch_size
+        triples = await loop.run_in_executor(
+            worker, self.store.triples, spo, context
+        )
+
+        def fetch():
+            return [
+                (triple, tuple(contexts))
+                for triple, contexts in islice(triples, batch_size)
+            ]
+
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < max(1, self.prefetch):
+                    pending.append(loop.run_in_executor(worker, fetch))
+                batch = await pending.popleft()
+                for item in batch:
+                    yield item
+                if len(batch) < batch_size:
+                    break
+        finally:
+            for fetched in pending:
+                try:
+                    await fetched
+                except Exception:  # pragma: no cover
+                    pass
+            await loop.run_in_executor(worker, triples.close)
+
+    async def aadd(self, triple, context, quoted=False):
+        await self.__run(self.store.add, triple, context, quoted)
+
+    async def aadd_n(self, quads):
+        """
+        Add ``quads`` with :meth:`~SQLiteLSMStore.addN` in a worker thread
+        """
+        await self.__run(self.store.addN, quads)
+
+    async def aremove(self, triple, context=None):
+        await self.__run(self.store.remove, triple, context)
+
+    async def acount(self, context=None):
+        return await self.__run(self.store.__len__, context)
+
+    async def acontexts(self, triple=None):
+        return await self.__run(lambda: list(self.store.contexts(triple)))
+
+    async def aclose(self):
+        """
+        Wait for running calls and shut the worker threads down. The store
+        itself is left open.
+        """
+        for worker in self.__workers:
+            await asyncio.get_running_loop().run_in_executor(
+                None, worker.shutdown
+            )
@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of a store's operations over one or more datasets, e.g.
+
+# python -m rdflib_sqlitelsm.benchmark test/sp2b/*.n3 -o baseline.json
+# python -m rdflib_sqlitelsm.benchmark test/sp2b/*.n3 --baseline baseline.json
+# python -m rdflib_sqlitelsm.benchmark synthetic:100000 synthetic:1000000
+
+A dataset is a file, or ``synthetic:`` and a number of triples to make in
+the :data:`~rdflib_sqlitelsm.generate.SP2B` shape with
+:mod:`rdflib_sqlitelsm.generate`, for measurements at scale.
+
+Each dataset is parsed into a named graph of a new store, after which every
+operation of :data:`OPERATIONS` is timed twice over: ``cold``, as the first
+run on a newly opened store with empty term caches, and ``warm``, as the
+best of ``repeat`` runs after that. The writes are undone between runs, so
+each run starts from the same store. The results are JSON, with the
+environment and settings of the run, and :func:`compare` reports the
+timings of a run slower than those of a baseline by more than a tolerance.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import islice, product
+
+import rdflib
+from rdflib import ConjunctiveGraph, Literal, URIRef
+from rdflib.util import guess_format
+
+import rdflib_sqlitelsm
+from rdflib_sqlitelsm import generate
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+try:
+    from importlib import metadata
+except ImportError:  # pragma: no cover
+    # Python < 3.8
+    import importlib_metadata as metadata
+
+__all__ = ["OPERATIONS", "QUERIES", "benchmark", "compare", "environment"]
+
+
+SYNTHETIC = "synthetic:"
+
+DATA = URIRef("urn:x-rdflib-sqlitelsm:benchmark:data")
+SCRATCH = URIRef("urn:x-rdflib-sqlitelsm:benchmark:scratch")
+
+# The shapes of triple pattern, by the positions bound, e.g. "s?o"
+SHAPES = tuple(
+    "".join(t if bound else "?" for t, bound in zip("spo", mask))
+    for mask in product((True, False), repeat=3)
+)
+
+QUERIES = {
+    "sparql_count": """
+        SELECT (COUNT(?person) AS ?n)
+        WHERE { ?person a <http://xmlns.com/foaf/0.1/Person> }
+    """,
+    "sparql_join": """
+        SELECT ?title ?name WHERE {
+            ?document <http://purl.org/dc/elements/1.1/title> ?title ;
+                <http://purl.org/dc/elements/1.1/creator> ?creator .
+            ?creator <http://xmlns.com/foaf/0.1/name> ?name
+        }
+    """,
+}
+
+OPERATIONS = (
+    SHAPES
+    + ("contexts", "len", "namespaces", "bind")
+    + ("add", "addN", "remove", "remove_graph")
+    + tuple(QUERIES)
+)
+
+
+def environment():
+    """The machine, Python and packages on which the benchmarks were run"""
+    try:
+        lsm = metadata.version("lsm-db")
+    except metadata.PackageNotFoundError:  # pragma: no cover
+        lsm = None
+    return dict(
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        python=platform.python_version(),
+        implementation=platform.python_implementation(),
+        platform=platform.platform(),
+        machine=platform.machine(),
+        processor=platform.processor(),
+        cpu_count=os.cpu_count(),
+        rdflib=rdflib.__version__,
+        lsm_db=lsm,
+        rdflib_sqlitelsm=rdflib_sqlitelsm.__version__,
+    )
+
+
+class _Run:
+    """The state of the benchmarks of one dataset"""
+
+    def __init__(self, path, store_options, batch):
+        self.path = path
+        self.store_options = store_options
+        self.batch = batch
+        self.graph = None
+        self.binds = 0
+        self.open(create=True)
+        self.samples = []
+        self.quads = [
+            (
+                URIRef(f"urn:x-rdflib-sqlitelsm:benchmark:s{i}"),
+                URIRef("urn:x-rdflib-sqlitelsm:benchmark:p"),
+                Literal(i),
+                None,
+            )
+            for i in range(batch)
+        ]
+
+    def open(self, create=False):
+        """Open a new store on the path, with empty term caches"""
+        if self.graph is not None:
+            self.graph.close()
+        store = SQLiteLSMStore(**self.store_options)
+        for cache in (store._to_string, store._from_string, store.add_graph):
+            cache.cache_clear()
+        self.graph = ConjunctiveGraph(store)
+        self.graph.open(self.path, create=create)
+        self.store = store
+        self.data = self.graph.get_context(DATA)
+        self.scratch = self.graph.get_context(SCRATCH)
+
+    def close(self):
+        self.graph.close()
+        self.graph = None
+
+    def patterns(self, shape):
+        # Distinct, so that "???" is the one scan of the whole store
+        return dict.fromkeys(
+            tuple(
+                t if bound != "?" else None for t, bound in zip(triple, shape)
+            )
+            for triple in self.samples
+        )
+
+    # The operations, each returning the number of rows read or written,
+    # with before_ and after_ methods, untimed, to set up and undo them
+
+    def count(self, rows):
+        return sum(1 for row in rows)
+
+    def contexts(self):
+        return self.count(self.store.contexts())
+
+    def len(self):
+        return len(self.store)
+
+    def namespaces(self):
+        store = self.store
+        n = 0
+        for prefix, namespace in list(store.namespaces()):
+            store.namespace(prefix)
+            store.prefix(namespace)
+            n += 1
+        return n
+
+    def bind(self):
+        # New prefixes and namespaces every run, see SQLiteLSMStore.bind
+        self.binds += 1
+        for i in range(self.batch):
+            self.store.bind(
+                f"bench{self.binds}x{i}",
+                f"urn:x-rdflib-sqlitelsm:benchmark:{self.binds}:{i}#",
+            )
+        return self.batch
+
+    def after_bind(self):
+        for i in range(self.batch):
+            self.store.unbind(f"bench{self.binds}x{i}".encode())
+
+    def add(self):
+        store, scratch = self.store, self.scratch
+        for s, p, o, c in self.quads:
+            store.add((s, p, o), scratch)
+        return self.batch
+
+    def after_add(self):
+        self.store.remove_graph(self.scratch)
+
+    def addN(self):
+        scratch = self.scratch
+        self.store.addN((s, p, o, scratch) for s, p, o, c in self.quads)
+        return self.batch
+
+    after_addN = after_add
+
+    before_remove = add
+
+    def remove(self):
+        store, scratch = self.store, self.scratch
+        for s, p, o, c in self.quads:
+            store.remove((s, p, o), scratch)
+        return self.batch
+
+    before_remove_graph = addN
+
+    def remove_graph(self):
+        self.store.remove_graph(self.scratch)
+        return self.batch
+
+    def operation(self, name):
+        """The operation named ``name``, with its before and after"""
+        if name in SHAPES:
+
+            def operation():
+                triples = self.store.triples
+                return sum(
+                    self.count(triples(pattern, None))
+                    for pattern in self.patterns(name)
+                )
+
+        elif name in QUERIES:
+
+            def operation():
+                return self.count(self.graph.query(QUERIES[name]))
+
+        else:
+            operation = getattr(self, name)
+        none = lambda: None  # noqa: E731
+        return (
+            getattr(self, f"before_{name}", none),
+            operation,
+            getattr(self, f"after_{name}", none),
+        )
+
+
+def _timed(function):
+    gcold = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        rows = function()
+        return time.perf_counter() - t0, rows
+    finally:
+        if gcold:
+            gc.enable()
+
+
+def benchmark(
+    location,
+    path=None,
+    operations=OPERATIONS,
+    repeat=5,
+    samples=10,
+    batch=1000,
+    store_options=None,
+):
+    """
+    Time the ``operations`` on the dataset at ``location`` (a file or
+    ``synthetic:`` and a number of triples) in a new store
+    at ``path`` (by default, in a temporary directory), removed afterwards.
+
+    The triple patterns of each shape are made from ``samples`` triples of
+    the dataset taken at even intervals, and the writes are of ``batch``
+    new triples. Returns a dict of the number of ``triples`` loaded, the
+    time taken to ``load`` them and the ``operations``, each a dict of the
+    ``rows`` read or written and the ``cold`` and ``warm`` times.
+    """
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(), "rdflib_sqlitelsm_bench")
+    shutil.rmtree(path, ignore_errors=True)
+    run = _Run(path, store_options or {}, batch)
+    try:
+        if location.startswith(SYNTHETIC):
+            count = int(location[len(SYNTHETIC) :])
+            seconds, rows = _timed(
+                lambda: generate.load(
+                    run.store,
+                    count,
+                    shape=generate.SP2B,
+                    contexts=0,
+                    default_context=run.data,
+                )
+            )
+        else:
+            seconds, rows = _timed(
+                lambda: run.data.parse(
+                    location=location, format=guess_format(location) or "n3"
+                )
+            )
+        triples = len(run.data)
+        step = max(1, triples // samples)
+        rows = run.store.triples((None, None, None), None)
+        run.samples = [
+            triple
+            for triple, contexts in islice(rows, 0, step * samples, step)
+        ]
+        rows.close()
+        results = {}
+        for name in operations:
+            run.open()
+            timings = []
+            for i in range(1 + repeat):
+                before, operation, after = run.operation(name)
+                before()
+                timing, rows = _timed(operation)
+                after()
+                timings.append(timing)
+            results[name] = dict(
+                rows=rows, cold=timings[0], warm=min(timings[1:] or timings)
+            )
+        return dict(triples=triples, load=seconds, operations=results)
+    finally:
+        if run.graph is not None:
+            run.close()
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def compare(results, baseline, tolerance=0.25, minimum=0.001):
+    """
+    The timings of ``results`` slower than the same ones of ``baseline`` by
+    more than ``tolerance`` (a fraction of the baseline) and by more than
+    ``minimum`` seconds, below which the differences are noise, as a list
+    of dicts of the ``dataset``, ``operation``, ``mode`` (``load``,
+    ``cold`` or ``warm``), the ``baseline`` and ``current`` times and their
+    ``ratio``.
+    """
+    regressions = []
+
+    def check(dataset, operation, mode, before, after):
+        if after > before * (1 + tolerance) and after - before > minimum:
+            regressions.append(
+                dict(
+                    dataset=dataset,
+                    operation=operation,
+                    mode=mode,
+                    baseline=before,
+                    current=after,
+                    ratio=after / before if before else float("inf"),
+                )
+            )
+
+    for dataset, current in results["datasets"].items():
+        previous = baseline["datasets"].get(dataset)
+        if previous is None:
+            continue
+        check(dataset, "load", "load", previous["load"], current["load"])
+        for name, timings in current["operations"].items():
+            if name not in previous["operations"]:
+                continue
+            for mode in ("cold", "warm"):
+                check(
+                    dataset,
+                    name,
+                    mode,
+                    previous["operations"][name][mode],
+                    timings[mode],
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark SQLiteLSM store operations over datasets"
+    )
+    parser.add_argument(
+        "datasets",
+        nargs="+",
+        help="RDF files to load, or synthetic:N for N generated triples",
+    )
+    parser.add_argument(
+        "-o", "--output", help="file to write the JSON results to"
+    )
+    parser.add_argument(
+        "--baseline", help="JSON results to compare the results with"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="slowdown flagged as a regression (default: 0.25)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="warm runs of each operation (default: 5)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=1000,
+        help="triples written by each write operation (default: 1000)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=("files", "keyspace"),
+        default="files",
+        help="layout of the store (default: files)",
+    )
+    parser.add_argument(
+        "--operation",
+        action="append",
+        choices=OPERATIONS,
+        help="an operation to run (default: all)",
+    )
+    args = parser.parse_args(argv)
+    if args.baseline:
+        # Read first, the output may replace it
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = dict(
+        environment=environment(),
+        settings=dict(
+            repeat=args.repeat, batch=args.batch, layout=args.layout
+        ),
+        datasets={},
+    )
+    for location in args.datasets:
+        name = os.path.splitext(os.path.basename(location))[0]
+        results["datasets"][name] = result = benchmark(
+            location,
+            operations=args.operation or OPERATIONS,
+            repeat=args.repeat,
+            batch=args.batch,
+            store_options=dict(layout=args.layout),
+        )
+        print(
+            f"{name}: {result['triples']} triples"
+            f" loaded in {result['load']:.3f}s",
+            file=sys.stderr,
+        )
+        for operation, timings in result["operations"].items():
+            print(
+                f"  {operation:>12}: {timings['rows']:>8} rows"
+                f" cold {timings['cold']:.6f}s warm {timings['warm']:.6f}s",
+                file=sys.stderr,
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+    if args.baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for r in regressions:
+            print(
+                f"REGRESSION {r['dataset']} {r['operation']} ({r['mode']}):"
+                f" {r['baseline']:.6f}s -> {r['current']:.6f}s"
+                f" ({r['ratio']:.2f}x)",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Deterministic synthetic datasets of any size, for benchmarks at scale
+without network access or large fixtures, e.g.
+
+# python -m rdflib_sqlitelsm.generate 10000000 -o data.nq --contexts 10
+# python -m rdflib_sqlitelsm.generate 10000000 --store /data/store
+
+:func:`generate` yields quads made from a seeded random number generator,
+so the same arguments always make the same quads. The statements of a
+subject are made together, as in SP2B data, and the shape of the data is
+set by:
+
+- ``predicates``: their number (the first being ``rdf:type``), or the
+  predicates, chosen with ``weights`` or else with a Zipf distribution of
+  exponent ``skew`` (0 is uniform)
+- ``classes``: their number, or the classes, the objects of ``rdf:type``
+- ``literal_ratio``: the fraction of objects (other than of ``rdf:type``)
+  that are literals, the rest being other subjects
+- ``bnode_ratio``: the fraction of subjects that are blank nodes
+- ``contexts``: the number of named graphs, over which the subjects are
+  spread evenly, or 0 for the default graph
+- ``per_subject``: the number of statements of each subject
+
+:data:`SP2B` is the shape of the SP2B data of ``test/sp2b``.
+"""
+import argparse
+import os
+import random
+import sys
+from bisect import bisect
+from itertools import accumulate
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import DC, DCTERMS, FOAF, RDF, RDFS, Namespace
+from rdflib.plugins.serializers.nt import _quoteLiteral
+
+__all__ = ["SHAPE", "SP2B", "generate", "nquads", "write_nquads", "load"]
+
+
+BASE = "http://localhost/"
+
+SWRC = Namespace("http://swrc.ontoware.org/ontology#")
+BENCH = Namespace("http://localhost/vocabulary/bench/")
+
+# The default shape
+SHAPE = dict(
+    predicates=20,
+    weights=None,
+    skew=1.0,
+    classes=10,
+    literal_ratio=0.5,
+    bnode_ratio=0.0,
+    contexts=1,
+    per_subject=10,
+)
+
+# The predicates of the SP2B data weighted by their counts in 1ktriples.n3
+_sp2b = {
+    RDF.type: 260,
+    DC.creator: 200,
+    DC.title: 137,
+    FOAF.homepage: 132,
+    SWRC.journal: 129,
+    SWRC.pages: 127,
+    FOAF.name: 121,
+    RDFS.seeAlso: 105,
+    SWRC.note: 20,
+    RDFS.subClassOf: 9,
+    DCTERMS.issued: 8,
+    BENCH.cdrom: 6,
+    SWRC.volume: 5,
+    SWRC.number: 5,
+    SWRC.editor: 5,
+    BENCH.abstract: 5,
+    SWRC.month: 3,
+    BENCH.booktitle: 3,
+}
+
+SP2B = dict(
+    SHAPE,
+    predicates=tuple(_sp2b),
+    weights=tuple(_sp2b.values()),
+    classes=(
+        FOAF.Person,
+        BENCH.Article,
+        BENCH.Inproceedings,
+        BENCH.Journal,
+        BENCH.Proceedings,
+        BENCH.Book,
+        BENCH.Incollection,
+        BENCH.PhDThesis,
+        BENCH.MastersThesis,
+        BENCH.Www,
+    ),
+    literal_ratio=0.45,
+    per_subject=9,
+)
+
+_words = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo"
+    " lima mike november oscar papa quebec romeo sierra tango uniform"
+    " victor whiskey xray yankee zulu amber basalt cobalt dune ember fjord"
+    " garnet harbour iris jasper kestrel lagoon meadow nectar opal pebble"
+    " quartz raven saffron tundra umber vellum willow yarrow zephyr"
+).split()
+
+
+def _weights(n, skew):
+    return [1 / rank**skew for rank in range(1, n + 1)]
+
+
+def _terms(terms, kind):
+    if isinstance(terms, int):
+        return [URIRef(f"{BASE}vocabulary/{kind}{k}") for k in range(terms)]
+    return list(terms)
+
+
+def generate(count, seed=0, shape=None, **options):
+    """
+    A generator over ``count`` distinct quads ``(s, p, o, c)`` in the
+    ``shape`` (by default :data:`SHAPE`) updated with ``options``, made
+    from ``seed``. ``c`` is a URIRef, or None in the default graph.
+    """
+    shape = dict(SHAPE if shape is None else shape, **options)
+    unknown = set(shape) - set(SHAPE)
+    if unknown:
+        raise TypeError(f"Unknown shape options: {', '.join(sorted(unknown))}")
+    rng = random.Random(seed)
+    predicates = _terms(shape["predicates"], "p")
+    if isinstance(shape["predicates"], int) and predicates:
+        predicates[0] = RDF.type
+    weights = shape["weights"] or _weights(len(predicates), shape["skew"])
+    cumulative = list(accumulate(weights))
+    classes = _terms(shape["classes"], "C")
+    class_weights = list(accumulate(_weights(len(classes), shape["skew"])))
+    per_subject = shape["per_subject"]
+    subjects = -(-count // per_subject)
+    contexts = shape["contexts"]
+    literal_ratio = shape["literal_ratio"]
+    # Whether a subject is a blank node is a hash of its number, so that
+    # it is known wherever the subject is the object of a statement
+    bnodes = int(shape["bnode_ratio"] * 10000)
+
+    def node(i):
+        if (i * 2654435761 + seed) % 10000 < bnodes:
+            return BNode(f"b{i}")
+        return URIRef(f"{BASE}resource/{i}")
+
+    def choose(terms, cumulative):
+        return terms[bisect(cumulative, rng.random() * cumulative[-1])]
+
+    def literal():
+        if rng.random() < 0.25:
+            return Literal(rng.randrange(1 << 20))
+        return Literal(" ".join(rng.choices(_words, k=rng.randint(1, 8))))
+
+    n = 0
+    for i in range(subjects):
+        subject = node(i)
+        context = None
+        if contexts:
+            context = URIRef(f"{BASE}graph/{i % contexts}")
+        statements = set()
+        for j in range(min(per_subject, count - n)):
+            predicate = choose(predicates, cumulative)
+            if predicate == RDF.type:
+                object = choose(classes, class_weights)
+            elif rng.random() < literal_ratio:
+                object = literal()
+            else:
+                object = node(rng.randrange(subjects))
+            if (predicate, object) in statements:
+                object = Literal(f"statement {n}")
+            statements.add((predicate, object))
+            yield subject, predicate, object, context
+            n += 1
+
+
+def _render(node):
+    if isinstance(node, Literal):
+        return _quoteLiteral(node)
+    return node.n3()
+
+
+def nquads(quads):
+    """A generator over the N-Quads lines (bytes) of ``quads``"""
+    for s, p, o, c in quads:
+        terms = (s, p, o) if c is None else (s, p, o, c)
+        line = " ".join(_render(t) for t in terms) + " .\n"
+        yield line.encode("utf-8")
+
+
+def write_nquads(fileobj, count, seed=0, shape=None, **options):
+    """
+    Write the N-Quads of the quads of :func:`generate` to the binary
+    ``fileobj`` and return their number
+    """
+    n = 0
+    for line in nquads(generate(count, seed, shape, **options)):
+        fileobj.write(line)
+        n += 1
+    return n
+
+
+def load(store, count, seed=0, shape=None, default_context=None, **options):
+    """
+    Add the quads of :func:`generate` to the open ``store`` with its
+    :meth:`~rdflib_sqlitelsm.sqlitelsmstore.SQLiteLSMStore.import_nquads`,
+    those in the default graph to ``default_context``, and return the
+    number added
+    """
+    return store.import_nquads(
+        nquads(generate(count, seed, shape, **options)),
+        default_context=default_context,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate a deterministic synthetic dataset"
+    )
+    parser.add_argument("count", type=int, help="number of quads")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("-o", "--output", help="N-Quads file to write")
+    output.add_argument("--store", help="path of a store to add the quads to")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--sp2b", action="store_true", help="start from the SP2B shape"
+    )
+    for name, kind in (
+        ("predicates", int),
+        ("skew", float),
+        ("classes", int),
+        ("literal_ratio", float),
+        ("bnode_ratio", float),
+        ("contexts", int),
+        ("per_subject", int),
+    ):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=kind)
+    args = parser.parse_args(argv)
+    options = {
+        name: value
+        for name, value in vars(args).items()
+        if name in SHAPE and value is not None
+    }
+    shape = SP2B if args.sp2b else SHAPE
+    if "predicates" in options:
+        options["weights"] = None
+
+    if args.store:
+        from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+        store = SQLiteLSMStore()
+        # Added to an existing store, if any
+        exists = os.path.isdir(args.store) and os.listdir(args.store)
+        store.open(args.store, create=not exists)
+        try:
+            n = load(store, args.count, args.seed, shape, **options)
+        finally:
+            store.close()
+        print(f"{n} quads added to {args.store}", file=sys.stderr)
+    elif args.output:
+        with open(args.output, "wb") as f:
+            write_nquads(f, args.count, args.seed, shape, **options)
+    else:
+        write_nquads(
+            sys.stdout.buffer, args.count, args.seed, shape, **options
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Copy a store to a new store with another layout, e.g.
+
+# python -m rdflib_sqlitelsm.migrate /data/store /data/store-keyspace
+
+See :func:`rdflib_sqlitelsm.sqlitelsmstore.migrate`.
+"""
+import argparse
+
+from rdflib_sqlitelsm.sqlitelsmstore import LAYOUTS, migrate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Copy a SQLiteLSM store to a new store with a layout"
+    )
+    parser.add_argument("source", help="path of the existing store")
+    parser.add_argument("dest", help="path of the new store")
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default="keyspace",
+        help="layout of the new store (default: keyspace)",
+    )
+    args = parser.parse_args(argv)
+    counts = migrate(args.source, args.dest, args.layout)
+    for name, count in counts.items():
+        print(f"{name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
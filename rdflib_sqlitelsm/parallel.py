@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Scans of a whole store spread over a pool of worker processes.
+
+Decoding term IDs back into rdflib terms is CPU-bound, so a full pass over
+a large store runs on one core however fast LSM is. :class:`ParallelReader`
+opens the same store directory read-only in each of a pool of worker
+processes (the LSM databases are opened with ``multiple_processes=True``,
+so this is safe alongside a writer), splits the conjunctive rows of one index into key
+ranges and scans and decodes each range in a worker.
+
+# with ParallelReader(path, processes=4) as reader:
+#     assert reader.count() == len(graph)
+#     for (s, p, o), contexts in reader.triples():
+#         ...
+
+"""
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from rdflib.store import VALID_STORE
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+__all__ = ["ParallelReader"]
+
+
+_store = None
+
+
+def _open_store(path):
+    global _store
+    _store = SQLiteLSMStore()
+    if _store.open(path, create=False, readonly=True) != VALID_STORE:
+        raise ValueError(f"No store at {path}")
+
+
+def _scan(fn, index, start, end):
+    return fn(_store.scan_range(index, start, end))
+
+
+def _export(key):
+    buffer = io.BytesIO()
+    count = _store._export_nquads(buffer, [key])
+    return count, buffer.getvalue()
+
+
+def count(triples):
+    "The number of triples in a partition"
+    return sum(1 for _ in triples)
+
+
+def materialize(triples):
+    """
+    The triples of a partition as a list, with contexts as tuples of
+    context identifiers (the context graphs themselves refer to the
+    worker's store, so cannot be sent back to the parent)
+    """
+    return [
+        (triple, tuple(getattr(c, "identifier", c) for c in contexts))
+        for triple, contexts in triples
+    ]
+
+
+class ParallelReader:
+    """
+    Scan the store at ``path`` in ``processes`` worker processes.
+
+    The conjunctive rows of ``index`` (one of ``cspo``, ``cpos`` or
+    ``cosp``) are split on the boundaries between their leading terms, so
+    with the default ``cpos`` a partition holds the triples of a run of
+    whole predicates. There are ``partitions`` of them, by default four
+    per process so that partitions of uneven size even out over the pool.
+    If ``balanced`` is True they are instead the balanced
+    :meth:`~SQLiteLSMStore.scan_partitions` of the index, which may split
+    a leading term across partitions. The store is only read, never
+    written, by the workers.
+    """
+
+    def __init__(
+        self,
+        path,
+        processes=None,
+        index="cpos",
+        partitions=None,
+        mp_context=None,
+        balanced=False,
+    ):
+        self.path = path
+        self.index = index
+        self.balanced = balanced
+        self.processes = processes or multiprocessing.cpu_count()
+        self.npartitions = partitions or 4 * self.processes
+        self.__store = SQLiteLSMStore()
+        if self.__store.open(path, create=False, readonly=True) != VALID_STORE:
+            raise ValueError(f"No store at {path}")
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=mp_context or multiprocessing.get_context("spawn"),
+            initializer=_open_store,
+            initargs=(path,),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.__executor.shutdown()
+        self.__store.close()
+
+    def partitions(self):
+        """
+        The ``(start, end)`` key ranges of the partitions, in key order,
+        with None for an open end
+        """
+        if self.balanced:
+            return self.__store.scan_partitions(self.npartitions, self.index)
+        terms = self.__store.leading_terms(self.index)
+        n = min(self.npartitions, len(terms))
+        starts = [
+            b"^" + terms[len(terms) * i // n] + b"^" for i in range(1, n)
+        ]
+        return list(zip([None] + starts, starts + [None]))
+
+    def map(self, fn):
+        """
+        Call ``fn`` in a worker with an iterator over the
+        ``((s, p, o), contexts)`` of each partition and return a generator
+        over the results in partition order. ``fn`` must be picklable, i.e.
+        a module-level function.
+        """
+        partitions = self.partitions()
+        return self.__executor.map(
+            _scan,
+            [fn] * len(partitions),
+            [self.index] * len(partitions),
+            *zip(*partitions),
+        )
+
+    def count(self):
+        """
+        The number of triples in the store, counted in the workers
+        """
+        return sum(self.map(count))
+
+    def triples(self):
+        """
+        A generator over the ``((s, p, o), contexts)`` of every triple in
+        the store, decoded in the workers, in key order of the index, with
+        ``contexts`` a tuple of context identifiers
+        """
+        for triples in self.map(materialize):
+            yield from triples
+
+    def export_nquads(self, fileobj, contexts=None):
+        """
+        :meth:`~SQLiteLSMStore.export_nquads` with the work split by
+        context: the contexts are listed once, from one snapshot of the
+        store, and each worker is given the key prefix of one of them to
+        render; the parent writes them to ``fileobj`` in the same order.
+        Each context's quads are read from a single snapshot in its worker.
+        Returns the number of quads written.
+        """
+        with self.__store.snapshot():
+            keys = self.__store._context_keys(contexts)
+        total = 0
+        for n, data in self.__executor.map(_export, keys):
+            fileobj.write(data)
+            total += n
+        return total
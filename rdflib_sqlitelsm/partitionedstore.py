@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+"""
+A store which keeps each named graph in its own set of LSM files.
+
+In a :class:`~rdflib_sqlitelsm.sqlitelsmstore.SQLiteLSMStore` every graph
+shares the same three index databases, so dropping a graph means deleting
+its rows from all of them and loading one competes with all the others.
+:class:`PartitionedSQLiteLSMStore` instead gives each context (or, with
+``groups``, each of a fixed number of hash groups of contexts) a complete
+store of its own under ``graphs/``, while a ``catalog`` store holds the
+list of graphs and the namespace bindings:
+
+# <path>/catalog/
+# <path>/graphs/<sha1 of the graph name>/<version>/   (or group-0000, ...)
+
+The catalog records the current version of each partition. Dropping a
+graph deletes its partition and :meth:`replace_graph` loads the new
+content into a new version, then records it in the catalog (a single
+write, so atomic) and deletes the old one. Queries of the union graph are
+answered by merging the results of every partition.
+
+"""
+import hashlib
+import os
+import shutil
+import uuid
+import zlib
+from collections import OrderedDict
+from urllib.request import pathname2url
+
+from rdflib.store import NO_STORE, VALID_STORE, Store
+from rdflib.term import URIRef
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+__all__ = ["PartitionedSQLiteLSMStore"]
+
+
+class PartitionedSQLiteLSMStore(Store):
+    """
+    One SQLiteLSMStore per named graph, or per group of named graphs if
+    ``groups`` is given, see the module documentation. The grouping is
+    recorded in the catalog when the store is created. Partitions are
+    opened on first use, and the ``max_open`` most recently used of them
+    are kept open, others being closed unless a scan of them is under way.
+
+    Union-graph (``context=None``) reads of more than one partition hold
+    the merged matches in memory before yielding them, since one triple may
+    be in several partitions. Any other keyword arguments are passed to
+    each partition's :class:`SQLiteLSMStore`.
+    """
+
+    context_aware = True
+    formula_aware = True
+    transaction_aware = False
+    graph_aware = True
+
+    def __init__(
+        self,
+        configuration=None,
+        identifier=None,
+        groups=None,
+        max_open=32,
+        **options,
+    ):
+        self.__open = False
+        self.__identifier = identifier
+        self.groups = groups
+        self.max_open = max_open
+        self.options = options
+        self.__catalog = None
+        self.__partitions = OrderedDict()
+        self.__busy = {}
+        self.__retired = {}
+        self.path = None
+        super(PartitionedSQLiteLSMStore, self).__init__(configuration)
+
+    def __get_identifier(self):
+        return self.__identifier  # pragma: no cover
+
+    identifier = property(__get_identifier)
+
+    def is_open(self):
+        return self.__open
+
+    def __store(self, path, create):
+        store = SQLiteLSMStore(**self.options)
+        # Context graphs belong to this store, not to the partition
+        store.node_pickler.register(self, "S")
+        if store.open(path, create) != VALID_STORE:
+            return None
+        return store
+
+    def open(self, path, create=True):
+        self.path = os.path.abspath(path)
+        if self.__identifier is None:
+            self.__identifier = URIRef(pathname2url(self.path))
+
+        if create:
+            if os.path.exists(self.path) and os.listdir(self.path) != []:
+                raise Exception(
+                    f"Database {self.path} aready exists, please move or delete it."
+                )
+            os.makedirs(os.path.join(self.path, "graphs"))
+        elif not os.path.exists(os.path.join(self.path, "catalog")):
+            return NO_STORE
+
+        self.__catalog = self.__store(
+            os.path.join(self.path, "catalog"), create
+        )
+        if self.__catalog is None:
+            return NO_STORE  # pragma: no cover
+        if create:
+            self.__catalog.set_metadata("groups", self.groups or 0)
+        else:
+            self.groups = int(self.__catalog.metadata("groups", 0)) or None
+        self.__partitions = OrderedDict()
+        self.__busy = {}
+        self.__retired = {}
+        self.__open = True
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction=False):
+        for partition in self.__partitions.values():
+            partition.close(commit_pending_transaction)
+        for partition, path in self.__retired.items():
+            partition.close(commit_pending_transaction)
+            shutil.rmtree(path, ignore_errors=True)
+        self.__partitions = OrderedDict()
+        self.__busy = {}
+        self.__retired = {}
+        if self.__catalog is not None:
+            self.__catalog.close(commit_pending_transaction)
+        self.__open = False
+
+    def destroy(self, configuration=""):
+        assert self.__open is False, "The Store must be closed."
+        path = configuration or self.path
+        if path and os.path.exists(path):
+            shutil.rmtree(path)
+
+    def partition_name(self, context):
+        """
+        The name of the directory, under ``graphs/``, of the partition
+        which holds ``context``
+        """
+        name = str(getattr(context, "identifier", context)).encode("utf-8")
+        if self.groups:
+            return f"group-{zlib.crc32(name) % self.groups:04}"
+        return hashlib.sha1(name).hexdigest()
+
+    def __partition_path(self, name, version=None):
+        if version is None:
+            return os.path.join(self.path, "graphs", name)
+        return os.path.join(self.path, "graphs", name, version)
+
+    def __version(self, name):
+        """
+        The current version of the partition ``name``, or None if there
+        is none
+        """
+        return self.__catalog.metadata(f"version-{name}") or None
+
+    def __new_version(self, name, triples=None):
+        """
+        A new version of the partition ``name``, holding ``triples`` if
+        given, to be recorded as current by the caller
+        """
+        version = uuid.uuid4().hex
+        path = self.__partition_path(name, version)
+        os.makedirs(self.__partition_path(name), exist_ok=True)
+        try:
+            partition = self.__store(path, True)
+            if triples is not None:
+                partition.addN(triples)
+            partition.close()
+        except BaseException:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+        return version
+
+    def __open_partition(self, name, create=False):
+        """
+        The partition ``name``, opened if need be, or None if there is none
+        and ``create`` is False
+        """
+        partition = self.__partitions.get(name)
+        if partition is not None:
+            self.__partitions.move_to_end(name)
+            return partition
+        version = self.__version(name)
+        if version is None:
+            if not create:
+                return None
+            version = self.__new_version(name)
+            self.__catalog.set_metadata(f"version-{name}", version)
+        partition = self.__store(self.__partition_path(name, version), False)
+        self.__partitions[name] = partition
+        # Close the least recently used partitions not being scanned
+        for old in list(self.__partitions):
+            if len(self.__partitions) <= self.max_open:
+                break
+            if old != name and not self.__busy.get(self.__partitions[old]):
+                self.__partitions.pop(old).close()
+        return partition
+
+    def __partition(self, context, create=False):
+        """
+        The open partition which holds ``context``, or None if there is
+        none and ``create`` is False
+        """
+        return self.__open_partition(self.partition_name(context), create)
+
+    def __partition_names(self):
+        return [
+            name
+            for name in sorted(os.listdir(os.path.join(self.path, "graphs")))
+            if self.__version(name) is not None
+        ]
+
+    def __all_partitions(self):
+        for name in self.__partition_names():
+            yield self.__open_partition(name)
+
+    def __scan(self, name, method, *args):
+        """
+        Yield from ``method``, called with ``args``, of the partition
+        ``name`` if there is one, which is kept open meanwhile
+        """
+        partition = self.__open_partition(name)
+        if partition is None:
+            return
+        self.__busy[partition] = self.__busy.get(partition, 0) + 1
+        try:
+            yield from getattr(partition, method)(*args)
+        finally:
+            busy = self.__busy.get(partition, 0) - 1
+            if busy > 0:
+                self.__busy[partition] = busy
+            else:
+                self.__busy.pop(partition, None)
+                path = self.__retired.pop(partition, None)
+                if path is not None:
+                    partition.close()
+                    shutil.rmtree(path, ignore_errors=True)
+
+    def __retire(self, name, path):
+        """
+        Close the partition ``name`` if open and delete ``path``, its
+        directory or that of a version of it, or do so once the scans of
+        the partition under way are done
+        """
+        partition = self.__partitions.pop(name, None)
+        if partition is not None:
+            if self.__busy.get(partition):
+                self.__retired[partition] = path
+                return
+            partition.close()
+        shutil.rmtree(path, ignore_errors=True)
+
+    def __context(self, context):
+        if context is not None and context in [self.identifier, self]:
+            return None
+        return context
+
+    def add(self, triple, context, quoted=False):
+        assert self.__open, "The Store must be open."
+        assert context != self, "Can not add triple directly to store"
+        Store.add(self, triple, context, quoted)
+        partition = self.__partition(context, create=True)
+        partition.add(triple, context, quoted)
+        self.__catalog.add_graph(context)
+
+    def addN(self, quads):
+        assert self.__open, "The Store must be open."
+        batches = {}
+        for s, p, o, c in quads:
+            Store.add(self, (s, p, o), c)
+            batches.setdefault(c, []).append((s, p, o, c))
+        for context, batch in batches.items():
+            self.__partition(context, create=True).addN(batch)
+            self.__catalog.add_graph(context)
+
+    def remove(self, spo, context):
+        assert self.__open, "The Store must be open."
+        Store.remove(self, spo, context)
+        context = self.__context(context)
+        if context is None:
+            for partition in self.__all_partitions():
+                partition.remove(spo, None)
+            if spo == (None, None, None):
+                self.__catalog.remove(spo, None)
+        else:
+            partition = self.__partition(context)
+            if partition is not None:
+                partition.remove(spo, context)
+            if spo == (None, None, None):
+                self.__catalog.remove(spo, context)
+
+    def triples(self, spo, context=None):
+        """A generator over all the triples matching"""
+        assert self.__open, "The Store must be open."
+        context = self.__context(context)
+        if context is not None:
+            name = self.partition_name(context)
+            yield from self.__scan(name, "triples", spo, context)
+            return
+
+        names = self.__partition_names()
+        if len(names) == 1:
+            yield from self.__scan(names[0], "triples", spo, None)
+            return
+        merged = {}
+        for partition in self.__all_partitions():
+            for triple, contexts in partition.triples(spo, None):
+                merged.setdefault(triple, []).extend(contexts)
+        for triple, contexts in merged.items():
+            yield triple, iter(contexts)
+
+    def __len__(self, context=None):
+        assert self.__open, "The Store must be open."
+        context = self.__context(context)
+        if context is not None:
+            partition = self.__partition(context)
+            return 0 if partition is None else partition.__len__(context)
+        names = self.__partition_names()
+        if len(names) == 1:
+            return len(self.__open_partition(names[0]))
+        return len(
+            {
+                triple
+                for partition in self.__all_partitions()
+                for triple, contexts in partition.triples(
+                    (None, None, None), None
+                )
+            }
+        )
+
+    def contexts(self, triple=None):
+        if triple is None:
+            yield from self.__catalog.contexts()
+            return
+        seen = set()
+        for name in self.__partition_names():
+            for context in self.__scan(name, "contexts", triple):
+                if context not in seen:
+                    seen.add(context)
+                    yield context
+
+    def add_graph(self, graph):
+        self.__catalog.add_graph(graph)
+
+    def remove_graph(self, graph):
+        """
+        Remove ``graph``, by deleting its partition's files unless it
+        shares a partition with other graphs
+        """
+        assert self.__open, "The Store must be open."
+        if self.groups:
+            self.remove((None, None, None), graph)
+            return
+        Store.remove(self, (None, None, None), graph)
+        name = self.partition_name(graph)
+        version = self.__version(name)
+        self.__catalog.set_metadata(f"version-{name}", "")
+        if version is not None:
+            self.__retire(name, self.__partition_path(name, version))
+        try:
+            os.rmdir(self.__partition_path(name))
+        except OSError:
+            pass  # a version is still being read
+        self.__catalog.remove((None, None, None), graph)
+
+    def replace_graph(self, graph, triples):
+        """
+        Replace the content of ``graph`` with ``triples``, loaded into a
+        new version of its partition which is then recorded as current in
+        the catalog, so that the graph is never seen partly loaded. Needs
+        one partition per graph, i.e. no ``groups``.
+        """
+        assert self.__open, "The Store must be open."
+        assert not self.groups, "Graphs sharing a partition can't be renamed"
+        name = self.partition_name(graph)
+        old = self.__version(name)
+        version = self.__new_version(
+            name, ((s, p, o, graph) for s, p, o in triples)
+        )
+        self.__catalog.set_metadata(f"version-{name}", version)
+        if old is not None:
+            self.__retire(name, self.__partition_path(name, old))
+        self.__catalog.add_graph(graph)
+
+    def bind(self, prefix, namespace):
+        self.__catalog.bind(prefix, namespace)
+
+    def unbind(self, prefix):
+        self.__catalog.unbind(prefix)
+
+    def namespace(self, prefix):
+        return self.__catalog.namespace(prefix)
+
+    def prefix(self, namespace):
+        return self.__catalog.prefix(namespace)
+
+    def namespaces(self):
+        return self.__catalog.namespaces()
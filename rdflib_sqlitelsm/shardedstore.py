@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+A store which hash-partitions quads by subject over several
+:class:`~rdflib_sqlitelsm.sqlitelsmstore.SQLiteLSMStore` directories.
+
+Every LSM database takes a single writer, so one store directory caps
+ingest at one core and one LSM tree per index. A sharded store keeps N
+complete stores, ``shard-000`` to ``shard-<N-1>``, under its directory and
+sends each triple to the shard chosen by a hash of its subject, so a
+triple lives in exactly one shard. Each shard has its own term
+dictionary. Reads with a bound subject go to a single shard and other
+reads fan out over all of them, and since shards hold disjoint sets of
+triples their results are merged by concatenation. Namespace bindings and
+empty graphs are kept in the first shard.
+
+Encoding terms is bound by the GIL, so threads writing to the shards at
+once are no faster than one. Batched writes (``addN``) of at least
+:data:`PROCESS_BATCH` quads are instead written to the shards in parallel
+by worker processes, one per shard, while the shards are closed in this
+process. Smaller batches, and all writes if ``processes`` is False (by
+default, when there is a single CPU), are written shard by shard in this
+process.
+
+# graph = ConjunctiveGraph(ShardedSQLiteLSMStore(shards=8))
+# graph.open(path, create=True)
+
+"""
+import multiprocessing
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
+from urllib.request import pathname2url
+
+from rdflib.graph import Graph
+from rdflib.store import NO_STORE, VALID_STORE, Store
+from rdflib.term import URIRef
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+__all__ = ["ShardedSQLiteLSMStore", "shard_number", "PROCESS_BATCH"]
+
+# The size of the smallest addN batch written by worker processes
+PROCESS_BATCH = 1 << 12
+
+
+def shard_number(subject, nshards):
+    """
+    The number of the shard, of ``nshards``, which holds the triples with
+    ``subject``
+    """
+    return zlib.crc32(str(subject).encode("utf-8")) % nshards
+
+
+def _add_quads(path, options, quads):
+    """
+    Add ``quads``, with context graphs as their ``(type, identifier)``, to
+    the shard at ``path``, in a worker process
+    """
+    shard = SQLiteLSMStore(**options)
+    shard.open(path, create=False)
+    graphs = {}
+
+    def graph(c):
+        if not isinstance(c, tuple):
+            return c
+        g = graphs.get(c)
+        if g is None:
+            kind, identifier = c
+            # Pickled as the same key as the graph of the sharded store,
+            # which is registered with the shard as its store
+            g = graphs[c] = kind(shard, identifier)
+        return g
+
+    try:
+        shard.addN((s, p, o, graph(c)) for s, p, o, c in quads)
+    finally:
+        shard.close()
+    return len(quads)
+
+
+def _portable(context):
+    if isinstance(context, Graph):
+        return (type(context), context.identifier)
+    return context
+
+
+class ShardedSQLiteLSMStore(Store):
+    """
+    ``shards`` SQLiteLSMStore shards under one directory, see the module
+    documentation. When an existing store is opened the number of shards
+    is that found on disk. Any other keyword arguments are passed to each
+    shard's :class:`SQLiteLSMStore`, and to those opened by the worker
+    processes of ``addN``, so must then be picklable.
+
+    ``processes`` is whether large ``addN`` batches are written by worker
+    processes, by default if there is more than one CPU. While they are,
+    the shards are closed in this process, so the store must not be used
+    from other threads meanwhile.
+    """
+
+    context_aware = True
+    formula_aware = True
+    transaction_aware = False
+    graph_aware = True
+
+    def __init__(
+        self,
+        configuration=None,
+        identifier=None,
+        shards=4,
+        processes=None,
+        **options,
+    ):
+        self.__open = False
+        self.__identifier = identifier
+        self.nshards = shards
+        if processes is None:
+            processes = (os.cpu_count() or 1) > 1
+        self.processes = processes
+        self.options = options
+        self.__shards = []
+        self.__paths = []
+        self.__executor = None
+        self.__workers = None
+        self.path = None
+        super(ShardedSQLiteLSMStore, self).__init__(configuration)
+
+    def __get_identifier(self):
+        return self.__identifier  # pragma: no cover
+
+    identifier = property(__get_identifier)
+
+    def is_open(self):
+        return self.__open
+
+    def open(self, path, create=True):
+        self.path = os.path.abspath(path)
+        if self.__identifier is None:
+            self.__identifier = URIRef(pathname2url(self.path))
+
+        if create:
+            if os.path.exists(self.path) and os.listdir(self.path) != []:
+                raise Exception(
+                    f"Database {self.path} aready exists, please move or delete it."
+                )
+            os.makedirs(self.path, exist_ok=True)
+            names = [f"shard-{i:03}" for i in range(self.nshards)]
+        else:
+            if not os.path.exists(self.path):
+                return NO_STORE
+            names = sorted(
+                name
+                for name in os.listdir(self.path)
+                if name.startswith("shard-")
+            )
+            if not names:
+                return NO_STORE
+            self.nshards = len(names)
+
+        self.__shards = []
+        self.__paths = [os.path.join(self.path, name) for name in names]
+        for name in names:
+            shard = SQLiteLSMStore(**self.options)
+            # Context graphs belong to this store, not to the shard
+            shard.node_pickler.register(self, "S")
+            if (
+                shard.open(os.path.join(self.path, name), create)
+                != VALID_STORE
+            ):
+                return NO_STORE  # pragma: no cover
+            self.__shards.append(shard)
+        self.__executor = ThreadPoolExecutor(max_workers=self.nshards)
+        self.__open = True
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction=False):
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+        if self.__workers is not None:
+            self.__workers.shutdown()
+            self.__workers = None
+        for shard in self.__shards:
+            shard.close(commit_pending_transaction)
+        self.__open = False
+
+    def destroy(self, configuration=""):
+        assert self.__open is False, "The Store must be closed."
+        path = configuration or self.path
+        if path and os.path.exists(path):
+            import shutil
+
+            shutil.rmtree(path)
+
+    @property
+    def shards(self):
+        "The shard stores, in order"
+        return list(self.__shards)
+
+    def shard(self, subject):
+        """
+        The shard which holds the triples with ``subject``
+        """
+        return self.__shards[shard_number(subject, self.nshards)]
+
+    def __fan_out(self, method, *args):
+        return list(
+            self.__executor.map(
+                lambda shard: getattr(shard, method)(*args), self.__shards
+            )
+        )
+
+    def add(self, triple, context, quoted=False):
+        assert self.__open, "The Store must be open."
+        assert context != self, "Can not add triple directly to store"
+        Store.add(self, triple, context, quoted)
+        self.shard(triple[0]).add(triple, context, quoted)
+
+    def addN(self, quads):
+        """
+        Add ``quads``, written to the shards in parallel by worker processes
+        if there are at least :data:`PROCESS_BATCH` of them
+        """
+        assert self.__open, "The Store must be open."
+        batches = [[] for shard in self.__shards]
+        n = 0
+        for s, p, o, c in quads:
+            assert (
+                c is not None
+            ), f"Context associated with {s} {p} {o} is None!"
+            Store.add(self, (s, p, o), c)
+            batches[shard_number(s, self.nshards)].append((s, p, o, c))
+            n += 1
+        if self.processes and n >= PROCESS_BATCH:
+            self.__add_in_processes(batches)
+            return
+        for shard, batch in zip(self.__shards, batches):
+            if batch:
+                shard.addN(batch)
+
+    def __add_in_processes(self, batches):
+        if self.__workers is None:
+            self.__workers = ProcessPoolExecutor(
+                max_workers=self.nshards,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        written = [i for i, batch in enumerate(batches) if batch]
+        # A shard has one writer, the worker, and this process's term
+        # counter and caches would not see its writes
+        for i in written:
+            self.__shards[i].close()
+        try:
+            futures = [
+                self.__workers.submit(
+                    _add_quads,
+                    self.__paths[i],
+                    self.options,
+                    [(s, p, o, _portable(c)) for s, p, o, c in batches[i]],
+                )
+                for i in written
+            ]
+            for future in futures:
+                future.result()
+        finally:
+            for i in written:
+                shard = self.__shards[i]
+                shard.open(self.__paths[i], create=False)
+                if shard.result_cache is not None:
+                    shard.result_cache.clear()
+
+    def remove(self, spo, context):
+        assert self.__open, "The Store must be open."
+        Store.remove(self, spo, context)
+        if context == self:
+            context = None
+        if spo[0] is not None:
+            self.shard(spo[0]).remove(spo, context)
+        else:
+            self.__fan_out("remove", spo, context)
+
+    def triples(self, spo, context=None):
+        """A generator over all the triples matching, shard by shard"""
+        assert self.__open, "The Store must be open."
+        if context is not None and context in [self.identifier, self]:
+            context = None  # pragma: no cover
+        if spo[0] is not None:
+            return self.shard(spo[0]).triples(spo, context)
+        return chain.from_iterable(
+            shard.triples(spo, context) for shard in self.__shards
+        )
+
+    def __len__(self, context=None):
+        assert self.__open, "The Store must be open."
+        if context == self:
+            context = None
+        return sum(self.__fan_out("__len__", context))
+
+    def contexts(self, triple=None):
+        """
+        The contexts of the store, or of the triples matching ``triple``,
+        which are looked for in the subject's shard if it is bound and
+        otherwise in every shard
+        """
+        if triple is not None and None not in triple:
+            yield from self.shard(triple[0]).contexts(triple)
+            return
+        if triple is None:
+            found = (c for shard in self.__shards for c in shard.contexts())
+        else:
+            shards = self.__shards
+            if triple[0] is not None:
+                shards = [self.shard(triple[0])]
+            found = (
+                c
+                for shard in shards
+                for t, contexts in shard.triples(triple)
+                for c in contexts
+            )
+        seen = set()
+        for context in found:
+            if context not in seen:
+                seen.add(context)
+                yield context
+
+    def add_graph(self, graph):
+        self.__shards[0].add_graph(graph)
+
+    def remove_graph(self, graph):
+        self.remove((None, None, None), graph)
+
+    def bind(self, prefix, namespace):
+        self.__shards[0].bind(prefix, namespace)
+
+    def unbind(self, prefix):
+        self.__shards[0].unbind(prefix)
+
+    def namespace(self, prefix):
+        return self.__shards[0].namespace(prefix)
+
+    def prefix(self, namespace):
+        return self.__shards[0].prefix(namespace)
+
+    def namespaces(self):
+        return self.__shards[0].namespaces()
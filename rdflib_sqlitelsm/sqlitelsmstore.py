@@ -61,21 +61,48 @@ whereas LSM offers an interator:
 #
 
 """
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
-from functools import lru_cache
+import re
+import shutil
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache, wraps
+from itertools import count, islice
+from urllib.parse import parse_qsl
 from urllib.request import pathname2url
 
-from lsm import LSM
+from lsm import LSM, SAFETY_FULL, SAFETY_NORMAL, SAFETY_OFF, SEEK_GE
+from rdflib.compat import decodeUnicodeEscape
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID, Graph
+from rdflib.plugins.serializers.nt import _quoteLiteral
 from rdflib.store import NO_STORE, VALID_STORE, Store
-from rdflib.term import URIRef
+from rdflib.term import BNode, Literal, URIRef
 
 logging.basicConfig(level=logging.ERROR, format="%(message)s")
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
+# The log of the slow triples() and remove() calls, see SQLiteLSMStore
+slow_logger = logging.getLogger(__name__ + ".slow")
 
 
-__all__ = ["SQLiteLSMStore"]
+__all__ = [
+    "SQLiteLSMStore",
+    "ResultCache",
+    "StoreMetrics",
+    "tokenize",
+    "normalize",
+    "parse_tuning",
+    "migrate",
+]
 
 
 dbparams = dict(
@@ -88,6 +115,511 @@ dbparams = dict(
     transaction_log=False,
 )
 
+# The databases of a store by role, for tuning
+DB_ROLES = {
+    "index": ("cspo", "cpos", "cosp"),
+    "dictionary": ("k2i", "i2k"),
+    "namespace": ("namespace", "prefix"),
+    "contexts": ("contexts",),
+    "search": ("text", "autocomplete"),
+    "keyspace": ("keyspace",),
+}
+
+# Codecs for the "compression" option, as (compress, decompress)
+CODECS = {"zlib": (zlib.compress, zlib.decompress)}
+try:
+    import lz4.frame
+
+    CODECS["lz4"] = (lz4.frame.compress, lz4.frame.decompress)
+except ImportError:  # pragma: no cover
+    pass
+try:
+    import zstandard
+
+    CODECS["zstd"] = (
+        zstandard.ZstdCompressor().compress,
+        zstandard.ZstdDecompressor().decompress,
+    )
+except ImportError:  # pragma: no cover
+    pass
+
+_safety_levels = {
+    "off": SAFETY_OFF,
+    "normal": SAFETY_NORMAL,
+    "full": SAFETY_FULL,
+}
+_booleans = {
+    "true": True,
+    "yes": True,
+    "on": True,
+    "false": False,
+    "no": False,
+    "off": False,
+}
+
+
+def parse_tuning(configuration):
+    """
+    Parse LSM tuning options, given as a dict or as a query string such as
+    ``"index.mmap=1&index.block_size=8192&dictionary.safety=full"``, into
+    a dict of option dicts keyed by scope: None for options applying to
+    every database, else a role in :data:`DB_ROLES` or the name of a single
+    database. ``safety`` is accepted for ``write_safety`` and takes "off",
+    "normal" or "full" as well as LSM's numbers. ``compression`` takes the
+    name of one of the :data:`CODECS`, and applies only to the term
+    dictionary's values, so only to the ``dictionary`` or ``i2k`` scope.
+    """
+    if isinstance(configuration, str):
+        configuration = dict(parse_qsl(configuration.lstrip("?")))
+    tuning = defaultdict(dict)
+    for key, value in (configuration or {}).items():
+        scope, _, option = key.rpartition(".")
+        scope = scope or None
+        if scope is not None and not (
+            scope in DB_ROLES
+            or any(scope in names for names in DB_ROLES.values())
+        ):
+            raise ValueError(f"Unknown database or role {scope!r} in {key!r}")
+        if option == "safety":
+            option = "write_safety"
+        if option == "compression":
+            if scope not in ("dictionary", "i2k"):
+                raise ValueError(
+                    f"Only the dictionary can be compressed, not by {key!r}"
+                )
+            if value not in CODECS:
+                raise ValueError(f"Unknown or unavailable codec {value!r}")
+        elif isinstance(value, str):
+            lowered = value.lower()
+            if option == "write_safety" and lowered in _safety_levels:
+                value = _safety_levels[lowered]
+            elif lowered in _booleans:
+                value = _booleans[lowered]
+            else:
+                value = int(value)
+        tuning[scope][option] = value
+    return dict(tuning)
+
+
+_token_re = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Split ``text`` into the case-folded word tokens used by the full-text
+    index, e.g. ``tokenize("Tim Berners-Lee")`` gives
+    ``["tim", "berners", "lee"]``.
+    """
+    return [token.casefold() for token in _token_re.findall(text)]
+
+
+def normalize(term, length=64):
+    """
+    The string under which ``term`` is entered in the autocomplete index:
+    the case-folded lexical form of a Literal or the local name (the part
+    after the last "#", "/" or ":") of a URIRef, whitespace-collapsed and
+    truncated to ``length`` characters. None for any other kind of term.
+    """
+    if isinstance(term, Literal):
+        text = str(term)
+    elif isinstance(term, URIRef):
+        text = re.split(r"[#/:]", term)[-1]
+    else:
+        return None
+    return " ".join(text.casefold().split())[:length]
+
+
+def writer(method):
+    """
+    Serialise calls of a store method that writes on the store's write lock,
+    each in a transaction where the layout allows, and refuse them if the
+    store is open read-only
+    """
+
+    @wraps(method)
+    def write(self, *args, **kwargs):
+        if self.readonly:
+            raise PermissionError(
+                f"{method.__name__.strip('_')}: the store is open read-only"
+            )
+        with self._write_lock, self._transaction():
+            return method(self, *args, **kwargs)
+
+    return write
+
+
+class ResultCache:
+    """
+    A memory-bounded LRU cache of :meth:`SQLiteLSMStore.triples` results.
+
+    Entries are keyed by the scanned index prefix (i.e. the term IDs of the
+    pattern and context) and carry the write generation current when they
+    were filled. Writes bump per-predicate and per-context generation
+    counters, so invalidation is a counter increment rather than a search
+    of the cache. An entry for a pattern with a bound predicate depends only
+    on that predicate's generation, one with a bound context (and no
+    predicate) only on that context's generation and any other entry on
+    the store-wide generation.
+
+    Memory is an estimate based on the size of the scanned index rows.
+    The cache may be shared between threads. A store given a
+    ``result_cache_size`` has one of that many bytes as ``result_cache``,
+    which only sees the writes made through that store instance.
+    """
+
+    row_overhead = 128
+
+    def __init__(self, maxmemory):
+        self.maxmemory = maxmemory
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__generations = defaultdict(int)
+        self.__lock = threading.Lock()
+
+    def token(self, predicate, context):
+        """
+        The write generation which a result for a pattern with the
+        predicate and context term IDs given depends on
+        """
+        generations = self.__generations
+        if predicate is not None:
+            return (generations["p"], generations["p", predicate])
+        if context is not None:
+            return (generations["c"], generations["c", context])
+        return generations["*"]
+
+    def written(self, predicate, context):
+        """
+        Record a write of triples with the predicate and context term IDs
+        given, None meaning any
+        """
+        generations = self.__generations
+        with self.__lock:
+            generations["*"] += 1
+            if predicate is None:
+                generations["p"] += 1
+            else:
+                generations["p", predicate] += 1
+            if context is None:
+                generations["c"] += 1
+            else:
+                generations["c", context] += 1
+
+    def get(self, key, token):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                if entry[0] == token:
+                    self.__entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self.__discard(key)
+            self.misses += 1
+            return None
+
+    def put(self, key, token, results, size):
+        if size > self.maxmemory:
+            return
+        with self.__lock:
+            self.__discard(key)
+            self.__entries[key] = (token, results, size)
+            self.memory += size
+            while self.memory > self.maxmemory:
+                self.__discard(next(iter(self.__entries)))
+
+    def __discard(self, key):
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.memory -= entry[2]
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__generations.clear()
+            self.memory = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / lookups if lookups else 0.0,
+            entries=len(self.__entries),
+            memory=self.memory,
+            maxmemory=self.maxmemory,
+        )
+
+
+class StoreMetrics:
+    """
+    Call counts, rows returned and latency histograms of store operations,
+    see the ``metrics`` option of :class:`SQLiteLSMStore`.
+
+    Latencies are counted in power-of-two buckets of microseconds, so the
+    percentiles given are the upper bounds of buckets, within a factor of
+    two. The time of an operation returning a generator is the time spent
+    in the generator, not in its consumer. If given, ``sink`` is called
+    with the operation's name, its time in seconds and the rows returned
+    after each operation, e.g. to feed a metrics system. The metrics may be
+    shared between threads and between stores.
+    """
+
+    buckets = 40
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.__operations = {}
+        self.__lock = threading.Lock()
+
+    def record(self, operation, seconds, rows=0):
+        bucket = min(int(seconds * 1e6).bit_length(), self.buckets - 1)
+        with self.__lock:
+            stats = self.__operations.get(operation)
+            if stats is None:
+                stats = self.__operations[operation] = [
+                    0,
+                    0,
+                    0.0,
+                    [0] * self.buckets,
+                ]
+            stats[0] += 1
+            stats[1] += rows
+            stats[2] += seconds
+            stats[3][bucket] += 1
+        if self.sink is not None:
+            self.sink(operation, seconds, rows)
+
+    def instrument(self, operation, method):
+        """
+        ``method`` recording each call as ``operation``
+        """
+        record = self.record
+        clock = time.perf_counter
+
+        @wraps(method)
+        def instrumented(*args, **kwargs):
+            t0 = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(operation, clock() - t0)
+
+        for name in ("cache_clear", "cache_info"):
+            if hasattr(method, name):
+                setattr(instrumented, name, getattr(method, name))
+        return instrumented
+
+    def instrument_generator(self, operation, method):
+        """
+        ``method``, which returns a generator, recording each call as
+        ``operation`` with the number of rows generated
+        """
+        record = self.record
+        clock = time.perf_counter
+
+        @wraps(method)
+        def instrumented(*args, **kwargs):
+            rows = 0
+            t0 = clock()
+            results = method(*args, **kwargs)
+            seconds = clock() - t0
+            try:
+                while True:
+                    t0 = clock()
+                    try:
+                        row = next(results)
+                    except StopIteration:
+                        return
+                    finally:
+                        seconds += clock() - t0
+                    rows += 1
+                    yield row
+            finally:
+                record(operation, seconds, rows)
+
+        return instrumented
+
+    @staticmethod
+    def __percentile(histogram, calls, fraction):
+        rank = fraction * calls
+        seen = 0
+        for bucket, n in enumerate(histogram):
+            seen += n
+            if seen >= rank:
+                return (1 << bucket) / 1e6
+        return (1 << len(histogram)) / 1e6  # pragma: no cover
+
+    def snapshot(self):
+        """
+        A dict of the ``calls``, ``rows``, total ``seconds``, ``mean``,
+        ``p50`` and ``p99`` (in seconds) by operation
+        """
+        with self.__lock:
+            operations = {
+                operation: (calls, rows, seconds, list(histogram))
+                for operation, (
+                    calls,
+                    rows,
+                    seconds,
+                    histogram,
+                ) in self.__operations.items()
+            }
+        return {
+            operation: dict(
+                calls=calls,
+                rows=rows,
+                seconds=seconds,
+                mean=seconds / calls,
+                p50=self.__percentile(histogram, calls, 0.5),
+                p99=self.__percentile(histogram, calls, 0.99),
+            )
+            for operation, (calls, rows, seconds, histogram) in sorted(
+                operations.items()
+            )
+        }
+
+    def reset(self):
+        with self.__lock:
+            self.__operations.clear()
+
+
+# The one-byte key prefixes of the tables of the "keyspace" layout, which
+# keeps every database of a store in one LSM database. 0 is reserved for
+# the layout's own catalog, of the optional tables present.
+TABLES = {
+    name: bytes([number])
+    for number, name in enumerate(
+        (
+            "cspo",
+            "cpos",
+            "cosp",
+            "contexts",
+            "namespace",
+            "prefix",
+            "k2i",
+            "i2k",
+            "text",
+            "autocomplete",
+        ),
+        start=1,
+    )
+}
+
+KEYSPACE_FILE = "keyspace.db"
+
+LAYOUTS = ("files", "keyspace")
+
+
+class Table:
+    """
+    The keys of an LSM database starting with the one-byte ``prefix``,
+    seen as a database of their own: the part of the LSM API which the
+    store uses, with the prefix added to keys given and stripped from keys
+    returned. Opening a table opens the database, closing it does nothing.
+    """
+
+    def __init__(self, db, prefix):
+        self.db = db
+        self.prefix = prefix
+        self.end = bytes([prefix[0] + 1])
+
+    @property
+    def filename(self):
+        return self.db.filename
+
+    @property
+    def is_open(self):
+        return self.db.is_open
+
+    def open(self):
+        return self.db.is_open or self.db.open()
+
+    def close(self):
+        pass
+
+    def flush(self):
+        self.db.flush()
+
+    def checkpoint(self, nkb):
+        return self.db.checkpoint(nkb)
+
+    def __key(self, key):
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+        return self.prefix + key
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.__range(key.start, key.stop)
+        return self.db[self.__key(key)]
+
+    def __range(self, start, stop):
+        # The slices of LSM include their end, which for the whole of the
+        # table is the (empty) first key of the next one
+        end = self.end if stop is None else self.__key(stop)
+        n = len(self.prefix)
+        for k, v in self.db[self.__key(start or b"") : end]:
+            if k == self.end:
+                break
+            yield k[n:], v
+
+    def __setitem__(self, key, value):
+        self.db[self.__key(key)] = value
+
+    def delete(self, key):
+        self.db.delete(self.__key(key))
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def keys(self):
+        return (k for k, v in self[:])
+
+    def cursor(self):
+        return TableCursor(self)
+
+
+class TableCursor:
+    """
+    A cursor over the keys of a :class:`Table`
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.cursor = table.db.cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.cursor.close()
+
+    def seek(self, key, method=SEEK_GE):
+        self.cursor.seek(self.table.prefix + key, method)
+        if not self.cursor.key().startswith(self.table.prefix):
+            raise KeyError(key)
+
+    def key(self):
+        return self.cursor.key()[1:]
+
+    def value(self):
+        return self.cursor.value()
+
+    def keys(self):
+        prefix = self.table.prefix
+        for key in self.cursor.keys():
+            if not key.startswith(prefix):
+                break
+            yield key[1:]
+
+    def __iter__(self):
+        return iter(self.table)
+
 
 class SQLiteLSMStore(Store):
     """
@@ -107,10 +639,54 @@ class SQLiteLSMStore(Store):
     db_env = None
     should_create = True
 
-    def __init__(self, configuration=None, identifier=None):
+    def __init__(
+        self,
+        configuration=None,
+        identifier=None,
+        text_index=False,
+        autocomplete_index=False,
+        result_cache_size=None,
+        threadsafe=False,
+        open_hook=None,
+        layout="files",
+        metrics=None,
+        slow_log_threshold=None,
+    ):
+        assert layout in LAYOUTS, f"layout must be one of {LAYOUTS}"
         self.__open = False
+        self.layout = layout
+        self.__keyspace = None
+        self.__timings = {}
+        self.threadsafe = threadsafe
+        self.readonly = False
+        self.open_hook = open_hook
+        self._write_lock = threading.RLock() if threadsafe else nullcontext()
+        self.__local = threading.local() if threadsafe else None
+        # The read handles of each thread, by a key of the thread's own
+        self.__readers = {}
+        self.__threads = count()
+        self.__snapshot = None
+        self.__vacuums = 0
+        self.text_index = text_index
+        self.autocomplete_index = autocomplete_index
+        self.result_cache = None
+        if result_cache_size:
+            self.result_cache = ResultCache(result_cache_size)
+        self.slow_log_threshold = slow_log_threshold
+        self.metrics = None
+        if metrics:
+            if not isinstance(metrics, StoreMetrics):
+                metrics = StoreMetrics()
+            self.metrics = metrics
+            self.__instrument()
         self._terms = 0
         self.__identifier = identifier
+        self.tuning = {}
+        if isinstance(configuration, dict):
+            self.tuning = parse_tuning(configuration)
+            configuration = None
+        self.__params = {}
+        self.__codec = None
         super(SQLiteLSMStore, self).__init__(configuration)
         self._loads = self.node_pickler.loads
         self._dumps = self.node_pickler.dumps
@@ -118,12 +694,56 @@ class SQLiteLSMStore(Store):
 
         self.__indices = None
         self.__indices_info = None
+        self.__scanners = None
         self.__lookup_dict = None
         self.__contexts = None
         self.__namespace = None
         self.__prefix = None
         self.__k2i = None
         self.__i2k = None
+        self.__text = None
+        self.__autocomplete = None
+
+    def __instrument(self):
+        """
+        Shadow the instrumented methods with instance attributes recording
+        their calls in ``metrics``, so that a store without metrics runs
+        exactly the code it would anyway
+        """
+        for name in INSTRUMENTED:
+            self.__dict__[name] = self.metrics.instrument(
+                name, getattr(self, name)
+            )
+        for name in INSTRUMENTED_GENERATORS:
+            self.__dict__[name] = self.metrics.instrument_generator(
+                name, getattr(self, name)
+            )
+
+    def metrics_snapshot(self):
+        """
+        The :meth:`StoreMetrics.snapshot` of the store's ``metrics`` as
+        ``operations``, with the hits and misses of the term caches and of
+        the result cache as ``caches`` and, by file, the pages read and
+        written by LSM as ``lsm``. Only a store given ``metrics`` (True or
+        a :class:`StoreMetrics`) counts and times the calls of the methods
+        in :data:`INSTRUMENTED` and :data:`INSTRUMENTED_GENERATORS`, and
+        only those made through the attribute, as rdflib makes them.
+        """
+        assert self.metrics is not None, "The Store has no metrics."
+        caches = dict(
+            to_string=self._to_string.cache_info()._asdict(),
+            from_string=self._from_string.cache_info()._asdict(),
+        )
+        if self.result_cache is not None:
+            caches["result_cache"] = self.result_cache.stats()
+        lsm = {}
+        if self.__open:
+            for db in self.__files():
+                lsm[os.path.basename(os.fsdecode(db.filename))] = dict(
+                    pages_read=db.pages_read(),
+                    pages_written=db.pages_written(),
+                )
+        return dict(operations=self.metrics.snapshot(), caches=caches, lsm=lsm)
 
     def __get_identifier(self):
         return self.__identifier  # pragma: no cover
@@ -133,6 +753,150 @@ class SQLiteLSMStore(Store):
     def is_open(self):
         return self.__open
 
+    def __reader(self, db):
+        """
+        The handle on which the current thread reads ``db``
+        """
+        if self.__local is None:
+            if self.__snapshot is not None:
+                return self.__snapshot[id(db)]
+            return db
+        snapshot = getattr(self.__local, "snapshot", None)
+        if snapshot is not None:
+            return snapshot[id(db)]
+        readers = getattr(self.__local, "readers", None)
+        if readers is None:
+            readers = self.__local.readers = {}
+            self.__local.handles = {}
+            key = next(self.__threads)
+            with self._write_lock:
+                self.__readers[key] = self.__local.opened = []
+            # The thread's handles are closed as it exits, when its
+            # thread-local data goes
+            self.__local.owner = owner = _ThreadHandles()
+            weakref.finalize(
+                owner,
+                _close_thread_handles,
+                self._write_lock,
+                self.__readers,
+                key,
+            )
+        reader = readers.get(id(db))
+        if reader is None:
+            with self._write_lock:
+                reader = self.__reopen(
+                    db, self.__local.handles, self.__local.opened
+                )
+            readers[id(db)] = reader
+        return reader
+
+    def __reopen(self, db, handles, opened):
+        """
+        ``db`` read through a handle of its own on its file, taken from
+        ``handles`` (by the id of the store's handle on the file) or else
+        opened, added to ``handles`` and appended to ``opened``
+        """
+        table = db if isinstance(db, Table) else None
+        if table is not None:
+            db = table.db
+        handle = handles.get(id(db))
+        if handle is None:
+            handle = LSM(db.filename, **self.__params[id(db)])
+            handles[id(db)] = handle
+            opened.append(handle)
+        if table is not None:
+            return Table(handle, table.prefix)
+        return handle
+
+    def __pinned(self):
+        """
+        The current thread's snapshot handles, if any
+        """
+        if self.__local is None:
+            return self.__snapshot
+        return getattr(self.__local, "snapshot", None)
+
+    def __databases(self):
+        dbs = self.__indices + [
+            self.__contexts,
+            self.__namespace,
+            self.__prefix,
+            self.__k2i,
+            self.__i2k,
+        ]
+        if self.__text is not None:
+            dbs.append(self.__text)
+        if self.__autocomplete is not None:
+            dbs.append(self.__autocomplete)
+        return dbs
+
+    def __files(self):
+        """
+        The handles on the store's database files
+        """
+        if self.__keyspace is not None:
+            return [self.__keyspace]
+        return self.__databases()
+
+    def _transaction(self):
+        """
+        A transaction of the whole store if it has the keyspace layout
+        """
+        if self.__keyspace is None:
+            return nullcontext()
+        return self.__keyspace.transaction()
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Read the store as of the start of the ``with`` block:
+
+        # with store.snapshot():
+        #     for triple, contexts in store.triples((None, None, None)):
+        #         ...
+
+        Each database is read through its own handle, pinned with an open
+        cursor, which holds an LSM read transaction for the length of the
+        block. Writers are not blocked, and see none of it; reads in the
+        block see neither their writes nor the block's own. The handles
+        are pinned under the write lock, so between (not part way
+        through) the writes made through this store. Snapshots are per
+        thread and may be nested, an inner one reading as the outermost.
+        Results read in a snapshot bypass the result cache.
+        """
+        assert self.__open, "The Store must be open."
+        if self.__pinned() is not None:
+            yield self
+            return
+        readers = {}
+        opened = []
+        cursors = []
+        vacuums = self.__vacuums
+        try:
+            with self._write_lock:
+                handles = {}
+                for db in self.__databases():
+                    readers[id(db)] = self.__reopen(db, handles, opened)
+                cursors = [handle.cursor() for handle in opened]
+            if self.__local is None:
+                self.__snapshot = readers
+            else:
+                self.__local.snapshot = readers
+            yield self
+        finally:
+            if self.__local is None:
+                self.__snapshot = None
+            else:
+                self.__local.snapshot = None
+            for cursor in cursors:
+                cursor.close()
+            for handle in opened:
+                handle.close()
+            if self.__vacuums != vacuums:
+                # Terms read in the block may have been deleted since
+                self._to_string.cache_clear()
+                self._from_string.cache_clear()
+
     def _init_db_environment(self, path, create=True):
         """
         Initialise the database environment prior to creating the files
@@ -154,12 +918,18 @@ class SQLiteLSMStore(Store):
             else:
                 self.dbdir = dbpathname
 
+        self.__params = {}
+        self.__keyspace = None
+        if self.layout == "keyspace":
+            self.__keyspace = self.__lsm("keyspace", KEYSPACE_FILE.encode())
+
         self.__indices = [
             None,
         ] * 3
         self.__indices_info = [
             None,
         ] * 3
+        self.__scanners = {}
         for i in range(0, 3):
             index_name = to_key_func(i)(
                 (
@@ -170,13 +940,13 @@ class SQLiteLSMStore(Store):
                 "c".encode("latin-1"),
             )
 
-            index = LSM(
-                os.path.join(self.dbdir, index_name + b".db"),
-                open_database=False,
-                **dbparams,
-            )
+            index = self.__db(INDEX_NAMES[i], index_name + b".db")
             self.__indices[i] = index
             self.__indices_info[i] = (index, to_key_func(i), from_key_func(i))
+            self.__scanners[INDEX_NAMES[i]] = (
+                index,
+                results_from_key_func(i, self._from_string),
+            )
 
         lookup = {}
         for i in range(0, 8):
@@ -219,55 +989,145 @@ class SQLiteLSMStore(Store):
 
         self.__lookup_dict = lookup
 
-        self.__contexts = LSM(
-            os.path.join(self.dbdir, b"contexts.db"),
-            open_database=False,
-            **dbparams,
-        )
+        self.__contexts = self.__db("contexts", b"contexts.db")
 
-        self.__namespace = LSM(
-            os.path.join(self.dbdir, b"namespace.db"),
-            open_database=False,
-            **dbparams,
-        )
+        self.__namespace = self.__db("namespace", b"namespace.db")
 
-        self.__prefix = LSM(
-            os.path.join(self.dbdir, b"prefix.db"),
-            open_database=False,
-            **dbparams,
-        )
+        self.__prefix = self.__db("prefix", b"prefix.db")
 
-        self.__k2i = LSM(
-            os.path.join(self.dbdir, b"k2i.db"),
-            open_database=False,
-            **dbparams,
-        )
+        self.__k2i = self.__db("k2i", b"k2i.db")
+
+        self.__i2k = self.__db("i2k", b"i2k.db")
+
+        self.__text = None
+        if (self.text_index and not self.readonly) or self.__exists(
+            b"text.db"
+        ):
+            self.__text = self.__term_index_db(b"text.db")
+
+        self.__autocomplete = None
+        if (self.autocomplete_index and not self.readonly) or self.__exists(
+            b"autocomplete.db"
+        ):
+            self.__autocomplete = self.__term_index_db(b"autocomplete.db")
+
+    def __exists(self, dbname):
+        if self.__keyspace is not None:
+            self.__open_file(self.__keyspace)
+            try:
+                self.__keyspace[b"\x00" + dbname[:-3]]
+                return True
+            except KeyError:
+                return False
+        return os.path.exists(os.path.join(self.dbdir, dbname))
+
+    def __term_index_db(self, dbname):
+        if self.__keyspace is not None and not self.readonly:
+            # Record the table in the keyspace's catalog
+            self.__open_file(self.__keyspace)
+            self.__keyspace[b"\x00" + dbname[:-3]] = b""
+        return self.__db(dbname[:-3].decode(), dbname)
 
-        self.__i2k = LSM(
-            os.path.join(self.dbdir, b"i2k.db"),
+    def db_params(self, name):
+        """
+        The LSM options with which the database ``name`` (one of those in
+        :data:`DB_ROLES`) is opened: ``dbparams`` updated with the tuning
+        options for all databases, for the database's role and for the
+        database itself, in that order
+        """
+        params = dict(dbparams)
+        params.update(self.tuning.get(None, {}))
+        for role, names in DB_ROLES.items():
+            if name in names:
+                params.update(self.tuning.get(role, {}))
+        params.update(self.tuning.get(name, {}))
+        return params
+
+    def __db(self, name, filename):
+        if self.__keyspace is not None:
+            return Table(self.__keyspace, TABLES[name])
+        return self.__lsm(name, filename)
+
+    def __lsm(self, name, filename):
+        params = self.db_params(name)
+        params.pop("compression", None)
+        if self.readonly:
+            params["readonly"] = True
+        db = LSM(
+            os.path.join(self.dbdir, filename),
             open_database=False,
-            **dbparams,
+            **params,
         )
+        self.__params[id(db)] = params
+        return db
 
-    def open(self, path, create=True):
+    def open(self, path, create=True, readonly=False):
+        """
+        Open the store at ``path``, creating it if ``create``.
+
+        The LSM options of the databases default to the module's
+        ``dbparams`` and can be tuned, for all databases or per role or
+        database (see :data:`DB_ROLES` and :func:`parse_tuning`), by giving
+        a dict of options as the ``configuration`` or a query string on the
+        path, which takes precedence, e.g.
+
+        # store.open(path + "?index.mmap=1&index.block_size=8192"
+        #            "&dictionary.safety=full&dictionary.transaction_log=1")
+
+        The ``dictionary.compression`` option names one of the
+        :data:`CODECS` with which to compress the pickled terms held as the
+        values of ``i2k.db``. It is recorded when the store is created and
+        used whenever it is reopened.
+
+        By default (``layout="files"``) each database is a file of its own.
+        With ``layout="keyspace"`` they are all tables of the one LSM
+        database ``keyspace.db`` (see :data:`TABLES`), so that each write
+        is a single transaction. An existing store is opened with the
+        layout it was created with, see :func:`migrate` to change it.
+
+        A store opened ``readonly`` (or with a ``readonly=1`` option) may
+        be served by any number of processes while one writer updates it.
+        Terms are then only looked up, never minted, and any write raises
+        PermissionError. A ``threadsafe`` store may be shared between
+        threads: each thread reads through its own LSM handles, closed
+        when the thread exits, while writes are serialised on a lock.
+
+        Closing a writable store leaves a ``clean-shutdown`` marker, which
+        the next open removes, running recovery checks if it is missing.
+        The ``open_hook``, if any, is then called with a dict of timings.
+        """
+        path, _, query = path.partition("?")
+        if query:
+            for scope, options in parse_tuning(query).items():
+                self.tuning.setdefault(scope, {}).update(options)
+        readonly = readonly or bool(self.tuning.get(None, {}).get("readonly"))
+        if not create:
+            # An existing store keeps the layout it was created with
+            if os.path.exists(os.path.join(path, KEYSPACE_FILE)):
+                self.layout = "keyspace"
+            elif os.path.exists(os.path.join(path, "c^s^p^o^.db")):
+                self.layout = "files"
+            elif readonly:
+                # LSM would create any missing database file
+                return NO_STORE
+        if readonly:
+            assert not create, "A read-only store can't be created"
+        self.readonly = readonly
         self.should_create = create
         self.path = path
 
         if self.__identifier is None:
             self.__identifier = URIRef(pathname2url(os.path.abspath(path)))
 
+        started = time.perf_counter()
+        self.__timings = {}
         db_env = self._init_db_environment(path, create)
         if db_env == NO_STORE:
             return NO_STORE
         self.db_env = db_env
 
-        for db in self.__indices:
-            assert db.open() is True
-        assert self.__contexts.open() is True
-        assert self.__namespace.open() is True
-        assert self.__prefix.open() is True
-        assert self.__k2i.open() is True
-        assert self.__i2k.open() is True
+        for db in self.__files():
+            self.__open_file(db)
 
         try:
             self._terms = int(self.__k2i[b"__terms__"])
@@ -275,10 +1135,518 @@ class SQLiteLSMStore(Store):
         except KeyError:
             pass  # new store, no problem
 
+        marker = os.path.join(os.fsdecode(self.dbdir), CLEAN_SHUTDOWN_MARKER)
+        clean = create or os.path.exists(marker)
+        recovery = 0.0
+        if not readonly:
+            if not clean:
+                t0 = time.perf_counter()
+                self.__recover()
+                recovery = time.perf_counter() - t0
+            if os.path.exists(marker):
+                # Until closed again
+                os.remove(marker)
+
+        compression = self.db_params("i2k").get("compression")
+        if create:
+            if compression is not None:
+                self.set_metadata("compression", compression)
+        else:
+            recorded = self.metadata("compression")
+            if recorded != compression and compression is not None:
+                logger.warning(
+                    f"Store compressed with {recorded}, not {compression}"
+                )
+            compression = recorded
+        self.__codec = None
+        if compression is not None:
+            if compression not in CODECS:
+                raise ValueError(f"Store needs the {compression} codec")
+            self.__codec = CODECS[compression]
+
         self.__open = True
 
+        if self.open_hook is not None:
+            self.open_hook(
+                dict(
+                    path=os.path.abspath(path),
+                    clean=clean,
+                    databases=self.__timings,
+                    recovery=recovery,
+                    total=time.perf_counter() - started,
+                )
+            )
+
         return VALID_STORE
 
+    def __open_file(self, db):
+        """
+        Open the database file of ``db`` unless already open, timing it
+        """
+        if db.is_open:
+            return
+        t0 = time.perf_counter()
+        assert db.open() is True
+        name = os.path.basename(os.fsdecode(db.filename))[:-3]
+        self.__timings[name] = time.perf_counter() - t0
+
+    def __recover(self):
+        """
+        Repair what an unclean shutdown may have left inconsistent. The
+        databases are flushed independently, so the term count may have
+        been lost while terms minted under it were not, and would then be
+        minted again with the same IDs. Terms are minted with consecutive
+        IDs, so those lost from the count follow it, and are looked up one
+        by one rather than by reading every term.
+        """
+        last = self._terms
+        while str(last + 1).encode() in self.__i2k:
+            last += 1
+        if last > self._terms:
+            logger.warning(
+                f"Term count {self._terms} recovered to {last} in {self.path}"
+            )
+            self._terms = last
+            self.__k2i[b"__terms__"] = str(last).encode()
+
+    @staticmethod
+    def __checkpoint(db):
+        """
+        Flush and checkpoint ``db``, so that its file holds all its content
+        """
+        db.flush()
+        # A checkpoint may leave another (smaller) one to do, and only once
+        # there is none is the file left alone until written to
+        for i in range(4):
+            if not db.checkpoint(1):
+                break
+            db.flush()
+
+    def _tables(self):
+        """
+        The store's databases by name (as in :data:`TABLES`), for copying
+        """
+        tables = dict(zip(INDEX_NAMES, self.__indices))
+        tables.update(
+            contexts=self.__contexts,
+            namespace=self.__namespace,
+            prefix=self.__prefix,
+            k2i=self.__k2i,
+            i2k=self.__i2k,
+        )
+        if self.__text is not None:
+            tables["text"] = self.__text
+        if self.__autocomplete is not None:
+            tables["autocomplete"] = self.__autocomplete
+        return tables
+
+    def dump(self, fileobj):
+        """
+        Write the store to the binary ``fileobj`` as a stream of compact
+        length-prefixed records (see :data:`DUMP_SECTIONS`): the term count,
+        the namespace bindings, the contexts, the term dictionary and then
+        the keys of ``cspo``, in key order, with their values. The dump is
+        of a :meth:`snapshot` of the store, so writes may carry on. Returns
+        the number of records written by section.
+
+        Terms are written uncompressed, so a dump can be restored into a
+        store with any codec, and the other indices are left to
+        :meth:`restore` to rebuild.
+        """
+        assert self.__open, "The Store must be open."
+        with self.snapshot():
+            terms = self.metadata("terms", "0")
+            codec = self.__codec
+            sections = {
+                b"M": [(b"terms", terms.encode())],
+                b"N": self.__reader(self.__namespace),
+                b"P": self.__reader(self.__prefix),
+                b"C": self.__reader(self.__contexts),
+                b"T": (
+                    (i, k if codec is None else codec[1](k))
+                    for i, k in self.__reader(self.__i2k)
+                ),
+                b"Q": self.__reader(self.__indices[0]),
+            }
+            out = _BufferedWriter(fileobj)
+            out.write(DUMP_MAGIC)
+            counts = {}
+            for tag in DUMP_SECTIONS:
+                out.write(tag)
+                count = 0
+                for key, value in sections[tag]:
+                    out.record(key, value)
+                    count += 1
+                out.end_section()
+                counts[DUMP_SECTIONS[tag]] = count
+            out.flush()
+        return counts
+
+    def restore(self, fileobj):
+        """
+        Load a :meth:`dump` from the binary ``fileobj`` into this store,
+        which must be empty, and return the number of records read by
+        section. The ``cpos`` and ``cosp`` rows are derived from those of
+        ``cspo`` and written in sorted runs of :data:`BULK_CHUNK` keys, and
+        the optional term indices are rebuilt as the terms are read.
+        """
+        assert self.__open, "The Store must be open."
+        if self.readonly:
+            raise PermissionError("restore: the store is open read-only")
+        # Not a writer: a transaction would hold the whole store in memory
+        with self._write_lock:
+            return self.__restore(fileobj)
+
+    def __restore(self, fileobj):
+        if next(iter(self.__i2k), None) is not None:
+            raise Exception(f"Store {self.path} is not empty.")
+        source = _DumpReader(fileobj)
+        if source.read(len(DUMP_MAGIC)) != DUMP_MAGIC:
+            raise ValueError("Not a dump of a store, or of another version")
+        codec = self.__codec
+        cspo = self.__indices[0]
+        from_key = self.__indices_info[0][2]
+        derived = [(index, to_key) for index, to_key, _ in self.__indices_info]
+        pending = []
+
+        def write_derived():
+            for index, to_key in derived[1:]:
+                rows = []
+                for key, value in pending:
+                    c, s, p, o = from_key(key)
+                    rows.append((to_key((s, p, o), c), value))
+                rows.sort()
+                for key, value in rows:
+                    index[key] = value
+            pending.clear()
+
+        counts = {}
+        for tag in DUMP_SECTIONS:
+            if source.read(1) != tag:
+                raise ValueError(f"Expected section {tag!r} of the dump")
+            count = 0
+            for key, value in source.records():
+                if tag == b"M":
+                    if key == b"terms":
+                        self._terms = int(value)
+                    self.__k2i[b"__" + key + b"__"] = value
+                elif tag == b"N":
+                    self.__namespace[key] = value
+                elif tag == b"P":
+                    self.__prefix[key] = value
+                elif tag == b"C":
+                    self.__contexts[key] = value
+                elif tag == b"T":
+                    self.__i2k[key] = (
+                        value if codec is None else codec[0](value)
+                    )
+                    self.__k2i[value] = key
+                    self.__index_term(key.decode(), self._loads(value))
+                else:
+                    cspo[key] = value
+                    pending.append((key, value))
+                    if len(pending) == BULK_CHUNK:
+                        write_derived()
+                count += 1
+            counts[DUMP_SECTIONS[tag]] = count
+        write_derived()
+
+        self._to_string.cache_clear()
+        self._from_string.cache_clear()
+        self.add_graph.cache_clear()
+        if self.result_cache is not None:
+            self.result_cache.clear()
+        return counts
+
+    def export_nquads(self, fileobj, contexts=None, cache_size=1 << 16):
+        """
+        Write the quads of the store, or of the given ``contexts`` (graphs
+        or their identifiers), as UTF-8 N-Quads to the binary ``fileobj``
+        and return the number written. The quads of the default graph of a
+        Dataset are written as triples.
+
+        This bypasses rdflib's serializers: the rows of ``cspo`` are
+        scanned in key order, i.e. context by context, and each term ID is
+        rendered straight to its N-Triples form, with the renderings of
+        the last ``cache_size`` IDs cached. The export is of a
+        :meth:`snapshot` of the store.
+        """
+        assert self.__open, "The Store must be open."
+        with self.snapshot():
+            keys = self._context_keys(contexts)
+            return self._export_nquads(fileobj, keys, cache_size)
+
+    def _context_keys(self, contexts=None):
+        """
+        The term IDs, as the keys of ``contexts.db``, of the contexts of the
+        store or of those of the given ``contexts``, in key order
+        """
+        if contexts is not None:
+            contexts = {getattr(c, "identifier", c) for c in contexts}
+        keys = list(self.__reader(self.__contexts).keys())
+        if contexts is None:
+            return keys
+        wanted = []
+        for c in keys:
+            context = self._from_string(c)
+            if getattr(context, "identifier", context) in contexts:
+                wanted.append(c)
+        return wanted
+
+    def _export_nquads(self, fileobj, keys, cache_size=1 << 16):
+        """
+        :meth:`export_nquads` of the contexts whose term IDs are ``keys``
+        """
+        codec = self.__codec
+        loads = self._loads
+
+        with self.snapshot():
+            i2k = self.__reader(self.__i2k)
+            cspo = self.__reader(self.__indices[0])
+
+            def term(i):
+                k = i2k[i]
+                return loads(k if codec is None else codec[1](k))
+
+            @lru_cache(maxsize=cache_size)
+            def render(i):
+                node = term(i)
+                if isinstance(node, Literal):
+                    return _quoteLiteral(node).encode("utf-8", "replace")
+                return node.n3().encode("utf-8", "replace")
+
+            out = _BufferedWriter(fileobj)
+            count = 0
+            for c in keys:
+                context = term(c)
+                identifier = getattr(context, "identifier", context)
+                if identifier == DATASET_DEFAULT_GRAPH_ID:
+                    end = b" .\n"
+                else:
+                    end = b" " + identifier.n3().encode("utf-8") + b" .\n"
+                prefix = c + b"^"
+                for key, value in cspo[prefix:]:
+                    if not key.startswith(prefix):
+                        break
+                    _, s, p, o, _ = key.split(b"^")
+                    out.write(
+                        render(s) + b" " + render(p) + b" " + render(o) + end
+                    )
+                    count += 1
+            out.flush()
+        return count
+
+    def import_nquads(
+        self,
+        fileobj,
+        default_context=None,
+        processes=None,
+        batch_size=1 << 16,
+        cache_size=1 << 20,
+    ):
+        """
+        Add the statements of the N-Quads (or N-Triples) in the binary
+        ``fileobj`` to the store and return the number of quads added,
+        i.e. not already in it. Triples are added to ``default_context``,
+        by default the default graph of a Dataset.
+
+        This bypasses rdflib's parser and :meth:`add`: lines are split into
+        their term strings by a regular expression, term strings are mapped
+        to term IDs through a cache of up to ``cache_size`` of them (so an
+        rdflib term is only made for a term string not yet seen), and every
+        ``batch_size`` lines the new rows are written, sorted, in one
+        transaction where the layout allows. Nor are any events sent.
+
+        Given a number of ``processes`` above 1, lines are split into their
+        term strings in that many worker processes. Blank node labels are
+        scoped to the one import, as by rdflib's parser.
+        """
+        assert self.__open, "The Store must be open."
+        if self.readonly:
+            raise PermissionError("import_nquads: the store is open read-only")
+        if not isinstance(default_context, Graph):
+            default_context = Graph(
+                self, default_context or DATASET_DEFAULT_GRAPH_ID
+            )
+        _term_id = self.__term_id
+        ids = {}
+        graphs = {}
+        bnodes = {}
+
+        def term_id(token):
+            i = ids.get(token)
+            if i is None:
+                if len(ids) >= cache_size:
+                    ids.clear()
+                i = ids[token] = _term_id(_nquads_node(token, bnodes))
+            return i
+
+        def context_id(token):
+            i = graphs.get(token)
+            if i is None:
+                graph = Graph(self, _nquads_node(token, bnodes))
+                i = graphs[token] = _term_id(graph)
+            return i
+
+        added = 0
+        with self._write_lock:
+            for statements in self.__parse_nquads(
+                fileobj, processes, batch_size
+            ):
+                # The batch's new terms are minted in its transaction, and
+                # the term count recorded once
+                with self._transaction():
+                    terms = self._terms
+                    default = _term_id(default_context)
+                    quads = [
+                        (
+                            default if g is None else context_id(g),
+                            term_id(s),
+                            term_id(p),
+                            term_id(o),
+                        )
+                        for s, p, o, g in statements
+                    ]
+                    if self._terms != terms:
+                        self.__k2i[b"__terms__"] = str(self._terms).encode()
+                    added += self.__add_quads(quads)
+        return added
+
+    @staticmethod
+    def __parse_nquads(fileobj, processes, batch_size):
+        """
+        A generator over the lists of the term strings of the statements of
+        each ``batch_size`` lines of ``fileobj``, in order
+        """
+
+        def chunks():
+            first = 1
+            while True:
+                lines = list(islice(fileobj, batch_size))
+                if not lines:
+                    return
+                yield lines, first
+                first += len(lines)
+
+        if not processes or processes < 2:
+            for lines, first in chunks():
+                yield _parse_nquads(lines, first)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            # A bounded number of chunks is read ahead of the writer
+            pending = deque()
+            for lines, first in chunks():
+                pending.append(executor.submit(_parse_nquads, lines, first))
+                if len(pending) > 2 * processes:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def __add_quads(self, quads):
+        """
+        Add the ``(c, s, p, o)`` term IDs of ``quads`` to the indices, each
+        index's new rows written in key order, and return the number added.
+        A quad is in the store if its context is among those of the
+        conjunctive row of its triple, so that is the one row looked up.
+        """
+        cspo = self.__indices[0]
+        triples = defaultdict(set)
+        for c, s, p, o in quads:
+            triples[(s, p, o)].add(c.encode())
+
+        rows = [[] for index in self.__indices]
+        new_contexts = set()
+        added = 0
+        for (s, p, o), contexts in triples.items():
+            triple = (s.encode(), p.encode(), o.encode())
+            try:
+                value = cspo[b"^" + b"^".join(triple) + b"^"]
+            except KeyError:
+                value = b""
+            present = set(value.split(b"^"))
+            contexts -= present
+            if not contexts:
+                continue
+            value = b"^".join(present | contexts)
+            for n, (index, to_key, _) in enumerate(self.__indices_info):
+                rows[n].append((to_key(triple, b""), value))
+                for c in contexts:
+                    rows[n].append((to_key(triple, c), b""))
+            if self.result_cache is not None:
+                for c in contexts:
+                    self.result_cache.written(p, c.decode())
+            new_contexts |= contexts
+            added += len(contexts)
+
+        for index, index_rows in zip(self.__indices, rows):
+            index_rows.sort()
+            for key, value in index_rows:
+                index[key] = value
+        for c in sorted(new_contexts):
+            self.__contexts[c] = b""
+        return added
+
+    def storage_stats(self):
+        """
+        A dict of statistics of the store's storage, for capacity planning:
+
+        - ``terms``, the term count (the last term ID minted)
+        - ``databases``, by name as in :data:`TABLES`: the ``file`` holding
+          the database, its number of ``keys``, the total ``key_bytes`` and
+          ``value_bytes`` and the ``average_key_size`` and
+          ``average_value_size``, counted in a full scan of a
+          :meth:`snapshot` (``k2i`` includes the store metadata)
+        - ``files``, by file name: the ``size`` in bytes of the database
+          file and ``log_size`` of its log, and LSM's ``tree_size`` (of the
+          ``old`` and ``current`` in-memory trees, in KB), the
+          ``checkpoint_size`` (KB written since the last checkpoint) and
+          the ``pages_written`` and ``pages_read`` by this connection
+        - ``size``, the total bytes of the files and logs
+
+        A large old tree, or a checkpoint size or log that keeps growing,
+        means that flushing and checkpointing are falling behind writes.
+        """
+        assert self.__open, "The Store must be open."
+        databases = {}
+        with self.snapshot():
+            for name, db in self._tables().items():
+                keys = key_bytes = value_bytes = 0
+                for key, value in self.__reader(db):
+                    keys += 1
+                    key_bytes += len(key)
+                    value_bytes += len(value)
+                databases[name] = dict(
+                    file=os.path.basename(os.fsdecode(db.filename)),
+                    keys=keys,
+                    key_bytes=key_bytes,
+                    value_bytes=value_bytes,
+                    average_key_size=key_bytes / keys if keys else 0.0,
+                    average_value_size=value_bytes / keys if keys else 0.0,
+                )
+
+        files = {}
+        for db in self.__files():
+            filename = os.fsdecode(db.filename)
+            old, current = db.tree_size()
+            files[os.path.basename(filename)] = dict(
+                size=_file_size(filename),
+                log_size=_file_size(filename + "-log"),
+                tree_size=dict(old=old, current=current),
+                checkpoint_size=db.checkpoint_size(),
+                pages_written=db.pages_written(),
+                pages_read=db.pages_read(),
+            )
+        return dict(
+            terms=int(self.metadata("terms", "0")),
+            databases=databases,
+            files=files,
+            size=sum(f["size"] + f["log_size"] for f in files.values()),
+        )
+
     def dumpdb(self):
 
         dump = "\n"
@@ -290,6 +1658,10 @@ class SQLiteLSMStore(Store):
             "self.__i2k": self.__i2k,
             "self.__indices": self.__indices,
         }
+        if self.__text is not None:
+            dbs["self.__text"] = self.__text
+        if self.__autocomplete is not None:
+            dbs["self.__autocomplete"] = self.__autocomplete
 
         for name, entry in dbs.items():
             dump += f"db: {name}\n"
@@ -303,30 +1675,127 @@ class SQLiteLSMStore(Store):
         return dump
 
     def close(self, commit_pending_transaction=False):
-        for i in self.__indices:
-            i.close()
-        self.__contexts.close()
-        self.__namespace.close()
-        self.__prefix.close()
-        self.__i2k.close()
-        self.__k2i.close()
+        with self._write_lock:
+            for opened in self.__readers.values():
+                for reader in opened:
+                    reader.close()
+            # Cleared in place, the exits of threads still pop from it
+            self.__readers.clear()
+            self.__local = threading.local() if self.threadsafe else None
+            clean = self.__open and not self.readonly
+            for db in self.__files():
+                if clean:
+                    try:
+                        self.__checkpoint(db)
+                    except Exception as e:  # pragma: no cover
+                        logger.warning(f"Checkpoint of {db.filename}: {e}")
+                        clean = False
+                db.close()
+            if clean:
+                marker = os.path.join(
+                    os.fsdecode(self.dbdir), CLEAN_SHUTDOWN_MARKER
+                )
+                open(marker, "wb").close()
         self.__open = False
 
     def destroy(self, configuration=""):
         assert self.__open is False, "The Store must be closed."
 
         path = configuration or self.dbdir
+        if isinstance(path, str):
+            path = path.partition("?")[0]
         # logger.warning(f"path for destruction: {path}")
         if os.path.exists(path):
-            import shutil
-
             shutil.rmtree(path)
 
+    def backup(self, dest, incremental_from=None):
+        """
+        Back the store up to the directory ``dest``, which can afterwards
+        be opened as a store in its own right, and return the manifest
+        written to ``dest/manifest.json``.
+
+        Every database is flushed and checkpointed, so that its file holds
+        all of its content, and then the files are copied. This is done
+        under the write lock, so writes through this store wait for the
+        backup, while reads carry on. (Writers in other processes must be
+        paused by the caller.)
+
+        Given the directory of an earlier backup as ``incremental_from``,
+        database files unchanged since that backup (by size and
+        modification time) are hard-linked from it, or copied from it
+        where links aren't possible, rather than copied from the store.
+        Backups are never written to once made, so can share files.
+        """
+        assert self.__open, "The Store must be open."
+        if self.readonly:
+            raise PermissionError("backup: the store is open read-only")
+        # Not a writer: a database can't be flushed within a transaction
+        with self._write_lock:
+            return self.__backup(dest, incremental_from)
+
+    def __backup(self, dest, incremental_from):
+        if os.path.exists(dest) and os.listdir(dest) != []:
+            raise Exception(
+                f"Backup {dest} aready exists, please move or delete it."
+            )
+        previous = {}
+        if incremental_from is not None:
+            with open(os.path.join(incremental_from, BACKUP_MANIFEST)) as f:
+                previous = json.load(f)["files"]
+        os.makedirs(dest, exist_ok=True)
+
+        dbs = self.__files()
+        for db in dbs:
+            self.__checkpoint(db)
+
+        files = {}
+        for db in dbs:
+            source = os.fsdecode(db.filename)
+            name = os.path.basename(source)
+            target = os.path.join(dest, name)
+            stat = os.stat(source)
+            entry = dict(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            earlier = previous.get(name)
+            if (
+                earlier is not None
+                and earlier["size"] == entry["size"]
+                and earlier["mtime_ns"] == entry["mtime_ns"]
+            ):
+                try:
+                    os.link(os.path.join(incremental_from, name), target)
+                except OSError:
+                    shutil.copyfile(
+                        os.path.join(incremental_from, name), target
+                    )
+                entry.update(sha256=earlier["sha256"], copied=False)
+            else:
+                entry.update(sha256=_copy_file(source, target), copied=True)
+            files[name] = entry
+
+        manifest = dict(
+            created=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            source=os.path.abspath(self.path),
+            incremental_from=(
+                None
+                if incremental_from is None
+                else os.path.abspath(incremental_from)
+            ),
+            terms=self._terms,
+            files=files,
+        )
+        # The manifest is written last, marking the backup complete
+        temporary = os.path.join(dest, BACKUP_MANIFEST + ".tmp")
+        with open(temporary, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temporary, os.path.join(dest, BACKUP_MANIFEST))
+        return manifest
+
+    @writer
     def add(self, triple, context, quoted=False):
         """
         Add a triple to the store of triples.
         """
-        (subject, predicate, object) = triple
+        subject, predicate, object = triple
         assert self.__open, "The Store must be open."
         assert context != self, "Can not add triple directly to store"
         # Add the triple to the Store, triggering TripleAdded events
@@ -367,6 +1836,8 @@ class SQLiteLSMStore(Store):
                 cspo[f"^{s}^{p}^{o}^".encode()] = contexts_value
                 cpos[f"^{p}^{o}^{s}^".encode()] = contexts_value
                 cosp[f"^{o}^{s}^{p}^".encode()] = contexts_value
+            if self.result_cache is not None:
+                self.result_cache.written(p, c)
             # self.__needs_sync = True
 
         else:
@@ -380,11 +1851,24 @@ class SQLiteLSMStore(Store):
             self.__k2i,
             self.__i2k,
         ] + self.__indices
+        if self.__text is not None:
+            dbs.append(self.__text)
+        if self.__autocomplete is not None:
+            dbs.append(self.__autocomplete)
 
         for db in dbs:
             with db.cursor() as cursor:
                 for key, value in cursor:
-                    db.delete(key)
+                    # Keep the store metadata
+                    if not (db is self.__k2i and key.startswith(b"__")):
+                        db.delete(key)
+        # The IDs of the cached terms are gone with the term dictionary
+        self._to_string.cache_clear()
+        self._from_string.cache_clear()
+        self.add_graph.cache_clear()
+
+        if self.result_cache is not None:
+            self.result_cache.clear()
 
     def __remove(self, spo, c):
         s, p, o = spo
@@ -411,10 +1895,26 @@ class SQLiteLSMStore(Store):
             for i, _to_key, _from_key in self.__indices_info:
                 i.delete(_to_key((s, p, o), "".encode("latin-1")))
 
+    @writer
     def remove(self, spo, context):
         subject, predicate, object = spo
         assert self.__open, "The Store must be open."
+        plan = None
+        if self.slow_log_threshold is not None:
+            plan = dict(index=None, prefix=None, scanned=0, rows=0)
+            t0 = time.perf_counter()
         Store.remove(self, (subject, predicate, object), context)
+        self.__remove_matching(spo, context, plan)
+        if plan is not None:
+            seconds = time.perf_counter() - t0
+            if seconds > self.slow_log_threshold:
+                self.__log_slow("remove", spo, context, plan, seconds)
+
+    def __remove_matching(self, spo, context, plan):
+        """
+        :meth:`remove`, counting the keys scanned in ``plan`` if given
+        """
+        subject, predicate, object = spo
         _to_string = self._to_string
 
         if context is not None:
@@ -439,13 +1939,23 @@ class SQLiteLSMStore(Store):
             p = _to_string(predicate)
             o = _to_string(object)
             c = _to_string(context)
+            key = f"{c}^{s}^{p}^{o}^".encode()
             try:
-                value = self.__indices[0][f"{c}^{s}^{p}^{o}^".encode()]
+                value = self.__indices[0][key]
             except KeyError:
                 value = None
+            if plan is not None:
+                plan.update(
+                    index="cspo",
+                    prefix=key,
+                    scanned=1,
+                    rows=int(value is not None),
+                )
 
             if value is not None:
                 self.__remove((s.encode(), p.encode(), o.encode()), c.encode())
+                if self.result_cache is not None:
+                    self.result_cache.written(p, c)
 
                 # self.__needs_sync = True
 
@@ -453,8 +1963,12 @@ class SQLiteLSMStore(Store):
             index, prefix, from_key, results_from_key = self.__lookup(
                 (subject, predicate, object), context
             )
-            for key, value in index[prefix:]:
+            if plan is not None:
+                plan.update(index=self.__index_name(index), prefix=prefix)
+            for key, value in _scan(index, prefix, plan):
                 if key.startswith(prefix):
+                    if plan is not None:
+                        plan["rows"] += 1
                     c, s, p, o = from_key(key)
                     if context is None:
                         contexts_value = value or "".encode("latin-1")
@@ -475,13 +1989,60 @@ class SQLiteLSMStore(Store):
             if context is not None:
                 if subject is None and predicate is None and object is None:
                     self.__contexts.delete(_to_string(context).encode())
+                    # So that adding the graph again records it again
+                    self.add_graph.cache_clear()
+
+            if self.result_cache is not None:
+                self.result_cache.written(
+                    None if predicate is None else _to_string(predicate),
+                    None if context is None else _to_string(context),
+                )
 
             # self.__needs_sync = needs_sync
 
     def triples(self, spo, context=None):
         """A generator over all the triples matching"""
         assert self.__open, "The Store must be open."
+        if self.slow_log_threshold is None:
+            return self.__triples(spo, context, None)
+        return self.__logged_triples(spo, context)
+
+    def __logged_triples(self, spo, context):
+        plan = dict(index=None, prefix=None, scanned=0, rows=0)
+        clock = time.perf_counter
+        t0 = clock()
+        results = self.__triples(spo, context, plan)
+        seconds = clock() - t0
+        try:
+            while True:
+                t0 = clock()
+                try:
+                    row = next(results)
+                except StopIteration:
+                    return
+                finally:
+                    seconds += clock() - t0
+                plan["rows"] += 1
+                yield row
+        finally:
+            if seconds > self.slow_log_threshold:
+                self.__log_slow("triples", spo, context, plan, seconds)
+
+    def __log_slow(self, operation, spo, context, plan, seconds):
+        pattern = " ".join("?" if t is None else t.n3() for t in spo)
+        if context is not None:
+            context = getattr(context, "identifier", context).n3()
+        slow_logger.warning(
+            f"Slow {operation} of ({pattern}) in {context or 'any context'}"
+            f" took {seconds:.6f}s: index {plan['index']}, prefix"
+            f" {plan['prefix']!r}, {plan['scanned']} keys scanned,"
+            f" {plan['rows']} rows"
+        )
 
+    def __triples(self, spo, context, plan):
+        """
+        :meth:`triples`, counting the keys scanned in ``plan`` if given
+        """
         subject, predicate, object = spo
 
         if context is not None:
@@ -489,15 +2050,62 @@ class SQLiteLSMStore(Store):
                 context = None  # pragma: no cover
 
         # _from_string = self._from_string ## UNUSED
-        index, prefix, from_key, results_from_key = self.__lookup(
-            (subject, predicate, object), context
-        )
+        try:
+            index, prefix, from_key, results_from_key = self.__lookup(
+                (subject, predicate, object), context
+            )
+        except KeyError:
+            return  # a term unknown to a read-only store
+        if plan is not None:
+            plan.update(index=self.__index_name(index), prefix=prefix)
+
+        index = self.__reader(index)
+        cache = self.result_cache
+        if cache is not None and self.__pinned() is not None:
+            cache = None
+        if cache is None:
+            for key, value in _scan(index, prefix, plan):
+                if key.startswith(prefix):
+                    yield results_from_key(
+                        key, subject, predicate, object, value
+                    )
+                else:
+                    break
+            return
 
-        for key, value in index[prefix:]:
+        cachekey = (prefix, subject is None, predicate is None, object is None)
+        token = cache.token(
+            None if predicate is None else self._to_string(predicate),
+            None if context is None else self._to_string(context),
+        )
+        results = cache.get(cachekey, token)
+        if results is not None:
+            if plan is not None:
+                plan["index"] = "result cache"
+            for triple, contexts in results:
+                yield triple, iter(contexts)
+            return
+
+        results = []
+        size = 0
+        for key, value in _scan(index, prefix, plan):
             if key.startswith(prefix):
-                yield results_from_key(key, subject, predicate, object, value)
+                triple, contexts = results_from_key(
+                    key, subject, predicate, object, value
+                )
+                if results is not None:
+                    contexts = tuple(contexts)
+                    results.append((triple, contexts))
+                    size += len(key) + len(value) + cache.row_overhead
+                    if size > cache.maxmemory:
+                        results = None
+                    yield triple, iter(contexts)
+                else:
+                    yield triple, contexts
             else:
                 break
+        if results is not None:
+            cache.put(cachekey, token, results, size)
 
     def __len__(self, context=None):
         assert self.__open, "The Store must be open."
@@ -507,11 +2115,16 @@ class SQLiteLSMStore(Store):
 
         if context is None:
             prefix = "^".encode("latin-1")
-            return len(list(self.__indices[0][prefix:]))
+            return len(list(self.__reader(self.__indices[0])[prefix:]))
         else:
-            prefix = f"{self._to_string(context)}^".encode()
-            return len(list(self.__indices[0][prefix : prefix + b"xxxx"]))
+            try:
+                prefix = f"{self._to_string(context)}^".encode()
+            except KeyError:
+                return 0  # a context unknown to a read-only store
+            cspo = self.__reader(self.__indices[0])
+            return len(list(cspo[prefix : prefix + b"xxxx"]))
 
+    @writer
     def bind(self, prefix, namespace):
         prefix = prefix.encode("utf-8")
         namespace = namespace.encode("utf-8")
@@ -522,13 +2135,14 @@ class SQLiteLSMStore(Store):
             self.__prefix[namespace] = prefix
             self.__namespace[prefix] = namespace
 
+    @writer
     def unbind(self, prefix):
         self.__namespace.delete(prefix)
 
     def namespace(self, prefix):
         prefix = prefix.encode("utf-8")
         try:
-            ns = self.__namespace[prefix]
+            ns = self.__reader(self.__namespace)[prefix]
             return URIRef(ns.decode("utf-8"))
         except KeyError:
             return None
@@ -536,14 +2150,15 @@ class SQLiteLSMStore(Store):
     def prefix(self, namespace):
         namespace = namespace.encode("utf-8")
         try:
-            prefix = self.__prefix[namespace]
+            prefix = self.__reader(self.__prefix)[namespace]
             return prefix.decode("utf-8")
         except KeyError:
             return None
 
     def namespaces(self):
         for prefix, namespace in [
-            (k.decode(), v.decode()) for k, v in self.__namespace
+            (k.decode(), v.decode())
+            for k, v in self.__reader(self.__namespace)
         ]:
             yield prefix, URIRef(namespace)
 
@@ -555,20 +2170,44 @@ class SQLiteLSMStore(Store):
 
         if triple:
             s, p, o = triple
-            s = _to_string(s)
-            p = _to_string(p)
-            o = _to_string(o)
-            cxts = self.__indices[0][f"^{s}^{p}^{o}^".encode()]
+            try:
+                s = _to_string(s)
+                p = _to_string(p)
+                o = _to_string(o)
+                cxts = self.__reader(self.__indices[0])[
+                    f"^{s}^{p}^{o}^".encode()
+                ]
+            except KeyError:
+                return  # not in any context
 
         if cxts:
             for c in cxts.split("^".encode("latin-1")):
                 if c:
                     yield _from_string(c)
         else:
-            for k in self.__contexts.keys():
+            for k in self.__reader(self.__contexts).keys():
                 yield _from_string(k)
 
+    def metadata(self, name, default=None):
+        """
+        The store metadata value (a string) recorded under ``name``
+        """
+        try:
+            return self.__reader(self.__k2i)[f"__{name}__".encode()].decode()
+        except KeyError:
+            return default
+
+    @writer
+    def set_metadata(self, name, value):
+        """
+        Record the string ``value`` as store metadata under ``name``. Like
+        the term count, metadata is kept in ``k2i.db``, whose other keys are
+        pickled terms so cannot clash.
+        """
+        self.__k2i[f"__{name}__".encode()] = str(value).encode()
+
     @lru_cache(maxsize=5000)
+    @writer
     def add_graph(self, graph):
         self.__contexts[self._to_string(graph).encode()] = b""
 
@@ -580,7 +2219,9 @@ class SQLiteLSMStore(Store):
         """
         rdflib term from index number (as a string)
         """
-        k = self.__i2k[str(int(i)).encode()]
+        k = self.__reader(self.__i2k)[str(int(i)).encode()]
+        if self.__codec is not None:
+            k = self.__codec[1](k)
         if k is not None:
             val = self._loads(k)
             return val
@@ -594,24 +2235,461 @@ class SQLiteLSMStore(Store):
         """
         k = self._dumps(term)
         try:
-            i = self.__k2i[k]
+            i = self.__reader(self.__k2i)[k]
         except KeyError:  # pragma: no cover
             i = None  # pragma: no cover
 
         if i is None:  # (from BdbApi)
-            # Does not yet exist, increment refcounter and create
-            self._terms += 1
-            i = str(self._terms)
-            self.__i2k[i.encode()] = k
-            self.__k2i[k] = i.encode()
-            self.__k2i[b"__terms__"] = str(self._terms).encode()
+            if self.readonly:
+                # Not cached, the term may yet be added by a writer
+                raise KeyError(term)
+            return self.__mint(k, term)
         else:
             i = i.decode()  # pragma: no cover
         return i
 
-    def __lookup(self, spo, context):
+    @writer
+    def __mint(self, k, term):
+        if self.__local is not None or self.__snapshot is not None:
+            # Another thread may have minted the term meanwhile, or it may
+            # have been added since the snapshot being read was taken
+            try:
+                return self.__k2i[k].decode()
+            except KeyError:
+                pass
+        # Does not yet exist, increment refcounter and create
+        i = self.__new_term(k, term)
+        self.__k2i[b"__terms__"] = str(self._terms).encode()
+        return i
+
+    def __new_term(self, k, term):
+        """
+        Mint an ID for ``term``, pickled as ``k``, leaving the term count
+        for the caller to record
+        """
+        self._terms += 1
+        i = str(self._terms)
+        if self.__codec is not None:
+            self.__i2k[i.encode()] = self.__codec[0](k)
+        else:
+            self.__i2k[i.encode()] = k
+        self.__k2i[k] = i.encode()
+        self.__index_term(i, term)
+        return i
+
+    def __term_id(self, term):
+        """
+        The ID of ``term``, minted if need be by :meth:`__new_term`, for a
+        writer holding the write lock
+        """
+        k = self._dumps(term)
+        try:
+            return self.__k2i[k].decode()
+        except KeyError:
+            return self.__new_term(k, term)
+
+    def __index_term(self, i, term):
+        """
+        Enter a newly-minted term in the optional term indices
+        """
+        if self.__text is not None and isinstance(term, Literal):
+            for token in set(tokenize(term)):
+                self.__text[f"{token}^{i}".encode()] = b""
+        if self.__autocomplete is not None:
+            key = autocomplete_key(term)
+            if key is not None:
+                self.__autocomplete[key + f"\x00{i}".encode()] = b""
+
+    def __unindex_term(self, i, term):
+        """
+        Remove a deleted term from the optional term indices
+        """
+        if self.__text is not None and isinstance(term, Literal):
+            for token in set(tokenize(term)):
+                self.__text.delete(f"{token}^{i}".encode())
+        if self.__autocomplete is not None:
+            key = autocomplete_key(term)
+            if key is not None:
+                self.__autocomplete.delete(key + f"\x00{i}".encode())
+
+    def __rebuild_term_index(self, dbname):
+        assert self.__open, "The Store must be open."
+        db = self.__term_index_db(dbname)
+        assert db.open() is True
+        with db.cursor() as cursor:
+            for key, value in cursor:
+                db.delete(key)
+        return db
+
+    def __reindex_terms(self):
+        for i, k in self.__i2k:
+            if self.__codec is not None:
+                k = self.__codec[1](k)
+            self.__index_term(i.decode(), self._loads(k))
+
+    @writer
+    def rebuild_text_index(self):
+        """
+        (Re)build the full-text index from the term dictionary, e.g. to add
+        a full-text index to an existing store.
+        """
+        autocomplete, self.__autocomplete = self.__autocomplete, None
+        if self.__text is not None:
+            self.__text.close()
+        self.__text = self.__rebuild_term_index(b"text.db")
+        try:
+            self.__reindex_terms()
+        finally:
+            self.__autocomplete = autocomplete
+
+    @writer
+    def rebuild_autocomplete_index(self):
+        """
+        (Re)build the autocomplete index from the term dictionary, e.g. to
+        add an autocomplete index to an existing store.
+        """
+        text, self.__text = self.__text, None
+        if self.__autocomplete is not None:
+            self.__autocomplete.close()
+        self.__autocomplete = self.__rebuild_term_index(b"autocomplete.db")
+        try:
+            self.__reindex_terms()
+        finally:
+            self.__text = text
+
+    def vacuum_terms(self):
+        """
+        Delete the terms which no row of the indices refers to, e.g. those
+        of removed triples and graphs or those minted for the terms of
+        patterns which matched nothing, from the term dictionary and the
+        optional term indices, and return the number deleted.
+
+        The terms in use are found in one sweep, in key order, of the
+        context rows of ``cspo`` (each of which has every term of a quad)
+        and of the contexts, which may be empty, and marked in a bitmap of
+        the term IDs. The term dictionary is then swept in key order, and
+        the unmarked terms deleted in transactions of :data:`BULK_CHUNK`
+        terms where the layout allows. This is done under the write lock,
+        so writes through this store wait for it while reads carry on, and
+        reads within an earlier :meth:`snapshot` still see the deleted
+        terms. (Writers in other processes must be paused by the caller.)
+        Term IDs are not reused.
+        """
+        assert self.__open, "The Store must be open."
+        if self.readonly:
+            raise PermissionError("vacuum_terms: the store is open read-only")
+        # Not a writer: a transaction would hold every deletion in memory
+        with self._write_lock:
+            return self.__vacuum_terms()
+
+    def __vacuum_terms(self):
+        live = bytearray((self._terms >> 3) + 1)
+
+        def mark(ids):
+            for n in map(int, ids):
+                live[n >> 3] |= 1 << (n & 7)
+
+        for key in self.__indices[0].keys():
+            if key.startswith(b"^"):
+                # The conjunctive rows, which follow, repeat the terms
+                break
+            mark(key.split(b"^")[:4])
+        mark(self.__contexts.keys())
+
+        indexed = self.__text is not None or self.__autocomplete is not None
+        deleted = 0
+        last = None
+        while True:
+            dead = []
+            for i, k in self.__i2k if last is None else self.__i2k[last:]:
+                n = int(i)
+                if i != last and not live[n >> 3] >> (n & 7) & 1:
+                    dead.append((i, k))
+                    if len(dead) == BULK_CHUNK:
+                        break
+            with self._transaction():
+                for i, k in dead:
+                    if self.__codec is not None:
+                        k = self.__codec[1](k)
+                    self.__i2k.delete(i)
+                    self.__k2i.delete(k)
+                    if indexed:
+                        self.__unindex_term(i.decode(), self._loads(k))
+            deleted += len(dead)
+            if len(dead) < BULK_CHUNK:
+                break
+            last = dead[-1][0]
+
+        # The IDs of the cached terms may be gone
+        self.__vacuums += 1
+        self._to_string.cache_clear()
+        self._from_string.cache_clear()
+        self.add_graph.cache_clear()
+        if self.result_cache is not None:
+            self.result_cache.clear()
+        return deleted
+
+    def terms_with_prefix(self, prefix, kind=None, limit=10):
+        """
+        Up to ``limit`` terms whose :func:`normalize`-d string starts with
+        the normalized ``prefix``, in index order. ``kind`` restricts the
+        result to ``Literal`` or ``URIRef`` terms. Each kind is a single
+        range scan of the autocomplete index, ``autocomplete.db``, kept by
+        a store made with ``autocomplete_index=True``.
+        """
+        assert self.__open, "The Store must be open."
+        if self.__autocomplete is None:
+            raise Exception("The Store has no autocomplete index.")
+
+        prefix = normalize(Literal(prefix)).encode()
+        kinds = [Literal, URIRef] if kind is None else [kind]
+        found = []
+        for kind in kinds:
+            start = AUTOCOMPLETE_KINDS[kind] + prefix
+            n = 0
+            for key, value in self.__reader(self.__autocomplete)[start:]:
+                if not key.startswith(start) or n == limit:
+                    break
+                name, i = key[1:].rsplit(b"\x00", 1)
+                found.append((name, i))
+                n += 1
+        found.sort()
+        return [self._from_string(i) for name, i in found[:limit]]
+
+    def text_search(self, query, predicate=None, context=None):
+        """
+        A generator over the triples whose object is a literal containing
+        every word of ``query``, optionally restricted to ``predicate``
+        and ``context``. Matching is on case-folded :func:`tokenize` tokens.
+        The index, ``text.db``, is kept by a store made with
+        ``text_index=True`` and by any store which already has one.
+        """
+        assert self.__open, "The Store must be open."
+        if self.__text is None:
+            raise Exception("The Store has no full-text index.")
+
+        ids = None
+        for token in set(tokenize(query)):
+            prefix = f"{token}^".encode()
+            found = set()
+            for key, value in self.__reader(self.__text)[prefix:]:
+                if key.startswith(prefix):
+                    found.add(key[len(prefix) :])
+                else:
+                    break
+            ids = found if ids is None else ids & found
+            if not ids:
+                return
+
+        for i in sorted(ids or (), key=int):
+            literal = self._from_string(i)
+            yield from self.triples((None, predicate, literal), context)
+
+    def leading_terms(self, index="cspo"):
+        """
+        The distinct term IDs which lead the keys of the conjunctive (all
+        contexts) rows of ``index``, one of ``INDEX_NAMES``, in key order.
+        Found by seeking past each one in turn rather than by a scan, so
+        this costs one seek per distinct term.
+        """
+        assert self.__open, "The Store must be open."
+        db = self.__reader(self.__scanners[index][0])
+        terms = []
+        key = b"^"
+        with db.cursor() as cursor:
+            while True:
+                try:
+                    cursor.seek(key, SEEK_GE)
+                except KeyError:
+                    break
+                found = cursor.key()
+                if not found.startswith(b"^"):
+                    break
+                term = found.split(b"^", 2)[1]
+                terms.append(term)
+                # "_" is the byte after "^", so this seeks past every
+                # key which starts with the term
+                key = b"^" + term + b"_"
+        return terms
+
+    def scan_range(self, index="cspo", start=None, end=None):
+        """
+        A generator over the ``((s, p, o), contexts)`` of the conjunctive
+        rows of ``index``, one of ``INDEX_NAMES``, whose keys are at least
+        ``start`` and less than ``end``, in key order. None means the
+        first or last row respectively.
+        """
+        assert self.__open, "The Store must be open."
+        db, results_from_key = self.__scanners[index]
+        db = self.__reader(db)
+        for key, value in db[start or b"^" :]:
+            if not key.startswith(b"^") or (end is not None and key >= end):
+                break
+            yield results_from_key(key, None, None, None, value)
+
+    def scan_partitions(self, n, index="cspo", samples=1024):
+        """
+        Split the conjunctive rows of ``index`` into (at most) ``n`` key
+        ranges holding about the same number of rows, as the ``(start,
+        end)`` pairs of :meth:`scan_range`, in key order.
+
+        The boundaries are found by seeking, without reading the keys in
+        between: to the first key at or after each of ``samples`` points
+        spread over the term IDs in the leading position, then, under each
+        leading term found by more than one of them (so with few distinct
+        terms after it), to points over the IDs in the second position,
+        and so on to the third, the points of a prefix in proportion to
+        the seeks that found it. Each key found stands for the share of
+        the points that found it, and the boundaries are the quantiles of
+        those shares, so the partitions are only as even as the rows are
+        spread over the term IDs: well for ``cspo``, less so for ``cpos``
+        with its few predicates.
+        """
+        assert self.__open, "The Store must be open."
+        db = self.__reader(self.__scanners[index][0])
+        last = max(1, self._terms)
+        # The share of the rows estimated to be at each key found, up to
+        # the next key found
+        weights = defaultdict(float)
+
+        def points(k):
+            return sorted({1 + last * i // k for i in range(k)})
+
+        with db.cursor() as cursor:
+            prefixes = {b"^": 1.0}
+            for depth in range(1, 4):
+                hits = defaultdict(list)
+                for prefix, weight in prefixes.items():
+                    probes = points(max(1, int(samples * weight)))
+                    for i in probes:
+                        # The points are in numeric, not key, order
+                        try:
+                            cursor.seek(prefix + b"%d^" % i, SEEK_GE)
+                        except KeyError:
+                            continue
+                        key = cursor.key()
+                        if key.startswith(prefix):
+                            terms = key.split(b"^", depth + 1)[:-1]
+                            hits[b"^".join(terms) + b"^"].append(
+                                (key, weight / len(probes))
+                            )
+                prefixes = {}
+                for prefix, found in hits.items():
+                    weight = sum(w for key, w in found)
+                    if len(found) > 1:
+                        # Sampled again, in the next position
+                        prefixes[prefix] = weight
+                    else:
+                        weights[found[0][0]] += weight
+                if not prefixes:
+                    break
+            else:
+                for prefix, weight in prefixes.items():
+                    weights[prefix] += weight
+        if not weights:
+            return [(None, None)]
+        total = sum(weights.values())
+        starts = []
+        seen = 0.0
+        for key in sorted(weights):
+            if seen >= total * (len(starts) + 1) / n and len(starts) < n - 1:
+                starts.append(key)
+            seen += weights[key]
+        return list(zip([None] + starts, starts + [None]))
+
+    def parallel_scan(self, fn, n=None, index="cspo", processes=None):
+        """
+        Call ``fn`` with a generator over the ``((s, p, o), contexts)`` of
+        each of ``n`` :meth:`scan_partitions` of ``index``, all at once,
+        and return the results in key order of the partitions.
+
+        The partitions are scanned in threads if ``processes`` is False or
+        by default in a threadsafe store, otherwise in worker processes
+        (see :class:`~rdflib_sqlitelsm.parallel.ParallelReader`), in which
+        case ``fn`` must be picklable. Threads overlap the I/O, processes
+        also the decoding of terms.
+        """
+        assert self.__open, "The Store must be open."
+        n = n or os.cpu_count()
+        if processes is None:
+            processes = not self.threadsafe
+        if processes:
+            from rdflib_sqlitelsm.parallel import ParallelReader
+
+            with ParallelReader(
+                os.path.abspath(self.path),
+                processes=n,
+                index=index,
+                partitions=n,
+                balanced=True,
+            ) as reader:
+                return list(reader.map(fn))
+
+        assert self.threadsafe, "Threaded scans need a threadsafe Store."
+        partitions = self.scan_partitions(n, index)
+        with ThreadPoolExecutor(max_workers=len(partitions)) as executor:
+            return list(
+                executor.map(
+                    lambda partition: fn(self.scan_range(index, *partition)),
+                    partitions,
+                )
+            )
+
+    def explain(self, spo, context=None):
+        """
+        The plan of :meth:`triples` for the pattern ``spo`` in ``context``,
+        found without scanning anything or minting IDs for unknown terms:
+        a dict of the ``index`` to be scanned and the key ``prefix`` of the
+        rows matching, the term ``ids`` of the pattern (None for a
+        variable) and of the context, and the ``unknown`` terms of the
+        pattern, if any, in which case nothing can match and the ``prefix``
+        is None. The rows of an index are ordered by the terms in the order
+        of its name, after the context, and a pattern's bound terms always
+        make a prefix of one of the three.
+
+        A store given a ``slow_log_threshold`` logs each call of
+        :meth:`triples` or :meth:`remove` taking longer than that many
+        seconds on the ``rdflib_sqlitelsm.sqlitelsmstore.slow`` logger,
+        with this plan, the keys scanned and the rows yielded.
+        """
+        assert self.__open, "The Store must be open."
+        if context is not None and context in [self.identifier, self]:
+            context = None
+        elif context is not None and not isinstance(context, Graph):
+            context = Graph(self, context)
+        ids = {}
+        unknown = []
+        k2i = self.__reader(self.__k2i)
+        for term in tuple(spo) + (context,):
+            if term is not None and term not in ids:
+                try:
+                    ids[term] = k2i[self._dumps(term)].decode()
+                except KeyError:
+                    unknown.append(term)
+        index, prefix = None, None
+        if not unknown:
+            index, prefix, _, _ = self.__lookup(spo, context, ids.__getitem__)
+        else:
+            index, prefix, _, _ = self.__lookup(spo, context, lambda t: "?")
+            prefix = None
+        return dict(
+            index=self.__index_name(index),
+            prefix=prefix,
+            ids=tuple(None if t is None else ids.get(t) for t in spo),
+            context=None if context is None else ids.get(context),
+            unknown=unknown,
+        )
+
+    def __index_name(self, index):
+        for name, i in zip(INDEX_NAMES, self.__indices):
+            if i is index:
+                return name
+        return None  # pragma: no cover
+
+    def __lookup(self, spo, context, _to_string=None):
         subject, predicate, object = spo
-        _to_string = self._to_string
+        if _to_string is None:
+            _to_string = self._to_string
         if context is not None:
             context = _to_string(context)
         i = 0
@@ -633,6 +2711,318 @@ class SQLiteLSMStore(Store):
         return index, prefix, from_key, results_from_key
 
 
+BACKUP_MANIFEST = "manifest.json"
+
+# Left in the store directory by a close() which checkpointed everything
+CLEAN_SHUTDOWN_MARKER = "clean-shutdown"
+
+
+class _ThreadHandles:
+    """
+    The token, held in a thread's thread-local data, of its read handles
+    """
+
+
+def _close_thread_handles(lock, readers, key):
+    with lock:
+        for handle in readers.pop(key, ()):
+            try:
+                handle.close()
+            except Exception as e:  # pragma: no cover
+                logger.warning(f"Close of a thread's {handle.filename}: {e}")
+
+
+def _scan(index, prefix, plan):
+    """
+    The rows of ``index`` from ``prefix`` on, counted in ``plan["scanned"]``
+    as read if a ``plan`` is given
+    """
+    rows = index[prefix:]
+    if plan is None:
+        return rows
+    return _counted(rows, plan)
+
+
+def _counted(rows, plan):
+    for row in rows:
+        plan["scanned"] += 1
+        yield row
+
+
+def _file_size(filename):
+    """
+    The size of the file ``filename``, 0 if there is none
+    """
+    try:
+        return os.path.getsize(filename)
+    except FileNotFoundError:
+        return 0
+
+
+def _copy_file(source, target, chunk_size=1 << 20):
+    """
+    Copy ``source`` to ``target``, syncing it, and return its SHA-256
+    """
+    digest = hashlib.sha256()
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        for chunk in iter(lambda: src.read(chunk_size), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+        dst.flush()
+        os.fsync(dst.fileno())
+    return digest.hexdigest()
+
+
+# The first bytes of a dump() stream, with the version of its format
+DUMP_MAGIC = b"SQLiteLSM dump\x00\x01"
+
+# The sections of a dump() stream, in order, by their one-byte tags. Each
+# is a sequence of records, each the length of the key plus one and the
+# length of the value as varints, then the key and the value, and ends with
+# a 0 byte.
+DUMP_SECTIONS = {
+    b"M": "metadata",
+    b"N": "namespace",
+    b"P": "prefix",
+    b"C": "contexts",
+    b"T": "terms",
+    b"Q": "cspo",
+}
+
+# The number of cspo rows whose cpos and cosp rows restore() sorts at once
+BULK_CHUNK = 1 << 18
+
+
+def _varint(n):
+    """
+    ``n`` as an unsigned LEB128 varint
+    """
+    encoded = bytearray()
+    while n >= 0x80:
+        encoded.append(n & 0x7F | 0x80)
+        n >>= 7
+    encoded.append(n)
+    return encoded
+
+
+class _BufferedWriter:
+    """
+    Buffered writing to a binary file object, of the records of a dump or
+    of lines of N-Quads
+    """
+
+    def __init__(self, fileobj, chunk_size=1 << 16):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def record(self, key, value):
+        self.buffer += _varint(len(key) + 1)
+        self.buffer += key
+        self.buffer += _varint(len(value))
+        self.write(value)
+
+    def end_section(self):
+        self.write(b"\x00")
+
+    def flush(self):
+        self.fileobj.write(self.buffer)
+        self.buffer = bytearray()
+
+
+class _DumpReader:
+    """
+    Buffered reading of the records of a dump from a binary file object
+    """
+
+    def __init__(self, fileobj, chunk_size=1 << 16):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.buffer = b""
+        self.position = 0
+
+    def read(self, n):
+        end = self.position + n
+        if end > len(self.buffer):
+            self.buffer = self.buffer[self.position :]
+            self.position, end = 0, n
+            while len(self.buffer) < n:
+                chunk = self.fileobj.read(max(n, self.chunk_size))
+                if not chunk:
+                    raise ValueError("The dump is truncated")
+                self.buffer += chunk
+        data = self.buffer[self.position : end]
+        self.position = end
+        return data
+
+    def varint(self):
+        n = shift = 0
+        while True:
+            byte = self.read(1)[0]
+            n |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return n
+            shift += 7
+
+    def records(self):
+        while True:
+            n = self.varint()
+            if n == 0:
+                return
+            key = self.read(n - 1)
+            yield key, self.read(self.varint())
+
+
+_nquads_term = (
+    r"(<[^>]*>"
+    r"|_:[A-Za-z0-9_:](?:[-A-Za-z0-9_:.]*[-A-Za-z0-9_:])?"
+    r'|"(?:[^"\\]|\\.)*"(?:@[A-Za-z0-9-]+|\^\^<[^>]*>)?)'
+)
+_nquads_line = re.compile(
+    r"[ \t]*"
+    + r"[ \t]*".join([_nquads_term] * 3)
+    + r"[ \t]*"
+    + _nquads_term
+    + r"?[ \t]*\.[ \t]*(?:#.*)?$"
+)
+
+
+def _parse_nquads(lines, first):
+    """
+    The ``(s, p, o, g)`` term strings of the statements of the N-Quads
+    ``lines``, with None for ``g`` in a triple, skipping blank and comment
+    lines. ``first`` is the line number of the first line, for errors.
+    """
+    statements = []
+    match = _nquads_line.match
+    for n, line in enumerate(lines, first):
+        line = line.decode("utf-8").strip()
+        if not line or line.startswith("#"):
+            continue
+        m = match(line)
+        if m is None:
+            raise ValueError(f"Invalid N-Quads at line {n}: {line}")
+        statements.append(m.groups())
+    return statements
+
+
+def _nquads_node(token, bnodes):
+    """
+    The rdflib term of an N-Quads term string, making a new BNode for a
+    blank node label not in ``bnodes`` and entering it there
+    """
+    if token[0] == "<":
+        return URIRef(decodeUnicodeEscape(token[1:-1]))
+    if token[0] == "_":
+        bnode = bnodes.get(token)
+        if bnode is None:
+            bnode = bnodes[token] = BNode()
+        return bnode
+    value, _, suffix = token[1:].rpartition('"')
+    value = decodeUnicodeEscape(value)
+    if suffix.startswith("@"):
+        return Literal(value, lang=suffix[1:])
+    if suffix:
+        return Literal(value, datatype=URIRef(suffix[3:-1]))
+    return Literal(value)
+
+
+AUTOCOMPLETE_KINDS = {Literal: b"L", URIRef: b"U"}
+
+
+def autocomplete_key(term):
+    """
+    The autocomplete index key prefix of ``term``, the kind marker and its
+    normalized string, or None if ``term`` is not indexed
+    """
+    for kind, marker in AUTOCOMPLETE_KINDS.items():
+        if isinstance(term, kind):
+            return marker + normalize(term).encode()
+    return None
+
+
+INDEX_NAMES = ("cspo", "cpos", "cosp")
+
+# The store methods instrumented by the ``metrics`` option
+INSTRUMENTED = (
+    "add",
+    "addN",
+    "remove",
+    "__len__",
+    "_to_string",
+    "_from_string",
+)
+INSTRUMENTED_GENERATORS = ("triples", "contexts")
+
+
+def migrate(source, dest, layout="keyspace", configuration=None):
+    """
+    Copy the store at ``source`` to a new store at ``dest`` with the given
+    ``layout`` (see :meth:`SQLiteLSMStore.open`), key by key and table by
+    table in transactions of :data:`BULK_CHUNK` keys, so without decoding a
+    term unless ``configuration`` sets another ``dictionary.compression``
+    than that of ``source``, which is otherwise kept. The store at
+    ``source`` is opened read-only and left as it is. Returns the number of
+    keys copied by table.
+    """
+    old = SQLiteLSMStore()
+    if old.open(source, create=False, readonly=True) != VALID_STORE:
+        raise ValueError(f"No store at {source}")
+    try:
+        tables = old._tables()
+        new = SQLiteLSMStore(
+            configuration,
+            text_index="text" in tables,
+            autocomplete_index="autocomplete" in tables,
+            layout=layout,
+        )
+        compression = old.metadata("compression")
+        if compression is not None and "compression" not in new.db_params(
+            "i2k"
+        ):
+            new.tuning.setdefault("i2k", {})["compression"] = compression
+        new.open(dest, create=True)
+        try:
+            recompression = new.metadata("compression")
+            decode = CODECS[compression][1] if compression else bytes
+            encode = CODECS[recompression][0] if recompression else bytes
+            counts = {}
+            for name, table in new._tables().items():
+                rows = iter(tables[name])
+                if name == "i2k" and recompression != compression:
+                    rows = (
+                        (key, encode(decode(value))) for key, value in rows
+                    )
+                elif name == "k2i":
+                    # As recorded by the new store
+                    rows = (
+                        (key, value)
+                        for key, value in rows
+                        if key != b"__compression__"
+                    )
+                count = 0
+                while True:
+                    with new._transaction():
+                        n = 0
+                        for key, value in islice(rows, BULK_CHUNK):
+                            table[key] = value
+                            n += 1
+                    count += n
+                    if n < BULK_CHUNK:
+                        break
+                counts[name] = count
+        finally:
+            new.close()
+    finally:
+        old.close()
+    return counts
+
+
 def to_key_func(i):
     def to_key(triple, context):
         "Takes a string; returns key"
@@ -89,6 +89,8 @@ setup(
     entry_points={
         "rdf.plugins.store": [
             "SQLiteLSM = rdflib_sqlitelsm.sqlitelsmstore:SQLiteLSMStore",
+            "SQLiteLSMSharded = rdflib_sqlitelsm.shardedstore:ShardedSQLiteLSMStore",
+            "SQLiteLSMPartitioned = rdflib_sqlitelsm.partitionedstore:PartitionedSQLiteLSMStore",
         ],
     },
     **kwargs,
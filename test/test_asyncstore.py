@@ -0,0 +1,93 @@
+import asyncio
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import Graph, URIRef
+from rdflib.namespace import FOAF, RDF
+
+from rdflib_sqlitelsm.asyncstore import AsyncSQLiteLSMStore
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_async")
+
+context = URIRef("urn:example:graph")
+
+
+@pytest.fixture(params=[False, True], ids=["serial", "threadsafe"])
+def get_graph(request):
+    shutil.rmtree(path, ignore_errors=True)
+    graph = Graph(SQLiteLSMStore(threadsafe=request.param), context)
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(os.path.dirname(__file__), "sp2b", "1ktriples.n3"),
+        format="n3",
+    )
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_atriples(get_graph):
+    graph = get_graph
+    expected = set(graph.triples((None, None, None)))
+
+    async def scan(astore):
+        found = set()
+        async for triple, contexts in astore.atriples((None, None, None)):
+            assert contexts == (graph,)
+            found.add(triple)
+        return found
+
+    async def main():
+        async with AsyncSQLiteLSMStore(graph.store, batch_size=100) as astore:
+            assert await astore.acount() == len(expected)
+            results = await asyncio.gather(*[scan(astore) for _ in range(3)])
+            assert results == [expected] * 3
+
+            # Abandoning a scan part way releases its worker
+            async for triple, contexts in astore.atriples((None, None, None)):
+                break
+            assert await astore.acount(graph) == len(expected)
+
+            # Other calls run between the batches of a scan in progress
+            found = set()
+            async for triple, contexts in astore.atriples((None, None, None)):
+                if not found:
+                    count = astore.acount()
+                    assert await asyncio.wait_for(count, 10) == len(expected)
+                found.add(triple)
+            assert found == expected
+
+    asyncio.run(main())
+
+
+def test_awrites(get_graph):
+    graph = get_graph
+    n = len(graph)
+    persons = set(graph.subjects(RDF.type, FOAF.Person))
+    quads = [
+        (URIRef(f"urn:example:{i}"), RDF.type, FOAF.Person, graph)
+        for i in range(10)
+    ]
+
+    async def main():
+        async with AsyncSQLiteLSMStore(graph.store) as astore:
+            await astore.aadd_n(quads)
+            assert await astore.acount() == n + 10
+            await astore.aadd((quads[0][0], FOAF.name, quads[0][0]), graph)
+            await astore.aremove((quads[0][0], None, None), graph)
+            assert await astore.acount() == n + 9
+            found = {
+                s
+                async for (s, p, o), c in astore.atriples(
+                    (None, RDF.type, FOAF.Person)
+                )
+            }
+            assert len(found - persons) == 9
+            assert await astore.acontexts() == [graph]
+
+    asyncio.run(main())
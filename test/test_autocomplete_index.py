@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import ConjunctiveGraph, Literal, URIRef
+from rdflib.store import VALID_STORE
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore, normalize
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_autocomplete")
+
+data = """
+    PREFIX : <https://example.org/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    :Berlin rdfs:label "Berlin" .
+    :Bern rdfs:label "Bern"@de .
+    :Bergen rdfs:label "  BERGEN   an   See " .
+    :Paris rdfs:label "Paris" .
+    """
+
+
+@pytest.fixture
+def get_graph():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = ConjunctiveGraph(store=SQLiteLSMStore(autocomplete_index=True))
+    assert graph.open(path, create=True) == VALID_STORE
+    graph.parse(data=data, format="ttl")
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_normalize():
+    assert normalize(Literal("  BERGEN   an ")) == "bergen an"
+    assert normalize(URIRef("https://example.org/ns#Thing")) == "thing"
+    assert normalize(URIRef("urn:example:bob")) == "bob"
+    assert normalize(Literal("x" * 100)) == "x" * 64
+
+
+def test_terms_with_prefix(get_graph):
+    store = get_graph.store
+
+    assert store.terms_with_prefix("ber", kind=Literal) == [
+        Literal("  BERGEN   an   See "),
+        Literal("Berlin"),
+        Literal("Bern", lang="de"),
+    ]
+    assert store.terms_with_prefix("BERGEN  an", kind=Literal) == [
+        Literal("  BERGEN   an   See ")
+    ]
+    assert store.terms_with_prefix("ber", kind=URIRef, limit=2) == [
+        URIRef("https://example.org/Bergen"),
+        URIRef("https://example.org/Berlin"),
+    ]
+    assert len(store.terms_with_prefix("ber")) == 6
+    assert store.terms_with_prefix("ber", limit=1) == [
+        URIRef("https://example.org/Bergen")
+    ]
+    assert store.terms_with_prefix("london") == []
+
+
+def test_rebuild_autocomplete_index():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = ConjunctiveGraph(store="SQLiteLSM")
+    graph.open(path, create=True)
+    graph.parse(data=data, format="ttl")
+    with pytest.raises(Exception):
+        graph.store.terms_with_prefix("par")
+    graph.store.rebuild_autocomplete_index()
+    assert graph.store.terms_with_prefix("par") == [
+        Literal("Paris"),
+        URIRef("https://example.org/Paris"),
+    ]
+    graph.close()
+
+    graph = ConjunctiveGraph(store="SQLiteLSM")
+    graph.open(path, create=False)
+    graph.add((URIRef("urn:example:p"), URIRef("urn:example:q"), Literal("Pa")))
+    assert graph.store.terms_with_prefix("pa", kind=Literal) == [
+        Literal("Pa"),
+        Literal("Paris"),
+    ]
+    graph.close()
+    graph.destroy(configuration=path)
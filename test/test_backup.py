@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+from rdflib.store import VALID_STORE
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_backup")
+backups = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_backups")
+
+context = URIRef("http://rdflib.net")
+michel = URIRef("urn:example:michel")
+
+
+@pytest.fixture
+def get_graph():
+    shutil.rmtree(path, ignore_errors=True)
+    shutil.rmtree(backups, ignore_errors=True)
+    graph = Graph("SQLiteLSM", context)
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+    shutil.rmtree(backups, ignore_errors=True)
+
+
+def open_backup(name):
+    graph = Graph(SQLiteLSMStore(), context)
+    assert graph.open(os.path.join(backups, name), create=False) == VALID_STORE
+    return graph
+
+
+def test_backup(get_graph):
+    graph = get_graph
+    expected = set(graph)
+    full = os.path.join(backups, "full")
+    manifest = graph.store.backup(full)
+    with open(os.path.join(full, "manifest.json")) as f:
+        assert json.load(f) == manifest
+    assert set(manifest["files"]) == {
+        name for name in os.listdir(path) if name.endswith(".db")
+    }
+    assert all(entry["copied"] for entry in manifest["files"].values())
+
+    # The store carries on
+    graph.add((michel, RDF.type, FOAF.Person))
+
+    backup = open_backup("full")
+    assert set(backup) == expected
+    backup.close()
+
+    with pytest.raises(Exception):
+        graph.store.backup(full)
+
+
+def test_incremental_backup(get_graph):
+    graph = get_graph
+    full = os.path.join(backups, "full")
+    graph.store.backup(full)
+    graph.add((michel, FOAF.name, Literal("Michel")))
+
+    increment = os.path.join(backups, "increment")
+    manifest = graph.store.backup(increment, incremental_from=full)
+    assert manifest["incremental_from"] == os.path.abspath(full)
+    files = manifest["files"]
+    assert files["c^s^p^o^.db"]["copied"] and files["i2k.db"]["copied"]
+    # No namespaces were bound since the full backup
+    assert not files["namespace.db"]["copied"]
+    assert os.path.samefile(
+        os.path.join(full, "namespace.db"),
+        os.path.join(increment, "namespace.db"),
+    )
+
+    backup = open_backup("increment")
+    assert set(backup) == set(graph)
+    assert backup.value(michel, FOAF.name) == Literal("Michel")
+    assert backup.store.namespace("foaf") == graph.store.namespace("foaf")
+    backup.close()
+
+    backup = open_backup("full")
+    assert backup.value(michel, FOAF.name) is None
+    backup.close()
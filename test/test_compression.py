@@ -0,0 +1,95 @@
+import logging
+import os
+import shutil
+import tempfile
+from time import time
+
+import pytest
+from lsm import LSM
+from rdflib import Graph, Literal, URIRef
+
+from rdflib_sqlitelsm.sqlitelsmstore import CODECS, SQLiteLSMStore
+
+logging.basicConfig(level=logging.ERROR, format="%(message)s")
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_compression")
+
+context = URIRef("http://rdflib.net")
+a = URIRef("urn:example:a")
+b = URIRef("urn:example:b")
+
+
+def open_graph(fixture, configuration=None, create=True):
+    if create:
+        shutil.rmtree(path, ignore_errors=True)
+    graph = Graph(SQLiteLSMStore(configuration), context)
+    graph.open(path, create=create)
+    if create:
+        graph.parse(
+            location=os.path.join(os.path.dirname(__file__), "sp2b", fixture),
+            format="n3",
+        )
+    return graph
+
+
+def disk_size():
+    return sum(
+        os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)
+    )
+
+
+def i2k_size():
+    db = LSM(os.path.join(path, "i2k.db"))
+    size = sum(len(k) + len(v) for k, v in db)
+    db.close()
+    return size
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_compressed_store(codec):
+    graph = open_graph("1ktriples.n3", {"dictionary.compression": codec})
+    expected = set(graph)
+    assert len(expected) == 1285
+    assert graph.store.metadata("compression") == codec
+    graph.remove((None, None, None))
+    graph.store.remove((None, None, None), None)
+    graph.add((a, b, Literal("c")))
+    # Clearing the store keeps its metadata
+    assert graph.store.metadata("compression") == codec
+    graph.close()
+
+    graph = open_graph(None, create=False)
+    assert graph.value(a, b) == Literal("c")
+    graph.close()
+    shutil.rmtree(path)
+
+
+def test_compression_benchmark():
+    """
+    Size of the term dictionary data, size of the database files (which
+    LSM allocates in blocks) and full-scan throughput of the sp2b fixtures,
+    uncompressed and with each available codec
+    """
+    op = "fixture,codec,i2k_data_bytes,file_bytes,triples_per_second\n"
+    for fixture in ("1ktriples", "5ktriples", "10ktriples"):
+        for codec in [None] + sorted(CODECS):
+            configuration = {"dictionary.compression": codec} if codec else {}
+            graph = open_graph(f"{fixture}.n3", configuration)
+            graph.close()
+            i2k, total = i2k_size(), disk_size()
+
+            graph = open_graph(None, create=False)
+            # The term cache is shared between store instances
+            graph.store._from_string.cache_clear()
+            t0 = time()
+            ntriples = len(list(graph.triples((None, None, None))))
+            t1 = time()
+            graph.close()
+            op += (
+                f"{fixture},{codec or 'none'},{i2k},{total},"
+                f"{int(ntriples / (t1 - t0))}\n"
+            )
+    shutil.rmtree(path)
+    logger.info(op)
@@ -0,0 +1,98 @@
+import io
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import ConjunctiveGraph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_dump")
+restored = path + "-restored"
+dumpfile = path + ".dump"
+
+context1 = URIRef("urn:example:graph1")
+context2 = URIRef("urn:example:graph2")
+michel = URIRef("urn:example:michel")
+
+
+@pytest.fixture
+def get_graph():
+    for directory in (path, restored):
+        shutil.rmtree(directory, ignore_errors=True)
+    graph = ConjunctiveGraph(SQLiteLSMStore())
+    graph.open(path, create=True)
+    graph.get_context(context1).parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+    graph.bind("foaf", FOAF)
+
+    yield graph
+
+    graph.close()
+    for directory in (path, restored):
+        shutil.rmtree(directory, ignore_errors=True)
+    if os.path.exists(dumpfile):
+        os.remove(dumpfile)
+
+
+def test_dump_and_restore(get_graph):
+    graph = get_graph
+    person = next(graph.subjects(RDF.type, FOAF.Person))
+    graph.get_context(context2).add((person, RDF.type, FOAF.Person))
+    graph.get_context(context2).add((michel, FOAF.name, Literal("Michel")))
+    expected = set(graph.quads((None, None, None, None)))
+
+    with open(dumpfile, "wb") as f:
+        counts = graph.store.dump(f)
+    assert counts["cspo"] == 2 * 1285 + 3
+    assert counts["terms"] == int(graph.store.metadata("terms"))
+
+    # Restored into a store with other options
+    store = SQLiteLSMStore(
+        {"dictionary.compression": "zlib"},
+        text_index=True,
+        layout="keyspace",
+    )
+    store.open(restored, create=True)
+    with open(dumpfile, "rb") as f:
+        assert store.restore(f) == counts
+    store.close()
+
+    graph = ConjunctiveGraph(SQLiteLSMStore())
+    graph.open(restored, create=False)
+    assert set(graph.quads((None, None, None, None))) == expected
+    assert len(graph) == 1286
+    assert len(graph.get_context(context2)) == 2
+    assert {c.identifier for c in graph.contexts()} == {context1, context2}
+    assert set(graph.subjects(FOAF.name, Literal("Michel"))) == {michel}
+    assert graph.store.namespace("foaf") == URIRef(FOAF)
+    assert [t for t, c in graph.store.text_search("michel")] == [
+        (michel, FOAF.name, Literal("Michel"))
+    ]
+    graph.add((michel, RDF.type, FOAF.Person, context2))
+    assert len(graph) == 1287
+
+    with pytest.raises(Exception):
+        graph.store.restore(io.BytesIO(open(dumpfile, "rb").read()))
+    graph.close()
+
+
+def test_restore_errors(get_graph):
+    graph = get_graph
+    stream = io.BytesIO()
+    graph.store.dump(stream)
+    data = stream.getvalue()
+
+    store = SQLiteLSMStore()
+    store.open(restored, create=True)
+    with pytest.raises(ValueError):
+        store.restore(io.BytesIO(b"not a dump" + data))
+    with pytest.raises(ValueError):
+        store.restore(io.BytesIO(data[: len(data) // 2]))
+    store.close()
@@ -0,0 +1,91 @@
+import io
+import os
+import shutil
+import tempfile
+from collections import Counter
+
+import pytest
+from rdflib import BNode, Dataset, Literal, URIRef
+from rdflib.namespace import RDF
+
+from rdflib_sqlitelsm.generate import SP2B, generate, load, main, write_nquads
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_generate")
+output = path + ".nq"
+
+
+@pytest.fixture
+def get_store():
+    shutil.rmtree(path, ignore_errors=True)
+    store = SQLiteLSMStore()
+    store.open(path, create=True)
+
+    yield store
+
+    store.close()
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def test_generate():
+    quads = list(generate(10000, seed=1, contexts=4, bnode_ratio=0.2))
+    assert len(set(quads)) == 10000
+    assert quads == list(generate(10000, seed=1, contexts=4, bnode_ratio=0.2))
+    assert quads != list(generate(10000, seed=2, contexts=4, bnode_ratio=0.2))
+
+    assert {c for s, p, o, c in quads} == {
+        URIRef(f"http://localhost/graph/{i}") for i in range(4)
+    }
+    subjects = {s for s, p, o, c in quads}
+    assert len(subjects) == 1000
+    bnodes = sum(isinstance(s, BNode) for s in subjects)
+    assert 150 < bnodes < 250
+    predicates = Counter(p for s, p, o, c in quads)
+    assert len(predicates) == 20
+    assert predicates.most_common(1)[0][0] == RDF.type
+    literals = [o for s, p, o, c in quads if p != RDF.type]
+    literals = sum(isinstance(o, Literal) for o in literals) / len(literals)
+    assert 0.45 < literals < 0.55
+
+    # A uniform shape, with all of the objects literals, in the default graph
+    quads = list(
+        generate(1000, skew=0, predicates=2, literal_ratio=1, contexts=0)
+    )
+    assert {c for s, p, o, c in quads} == {None}
+    predicates = Counter(p for s, p, o, c in quads)
+    assert 400 < predicates[RDF.type] < 600
+    assert all(isinstance(o, Literal) for s, p, o, c in quads if p != RDF.type)
+
+    with pytest.raises(TypeError):
+        list(generate(10, colour="blue"))
+
+
+def test_load(get_store):
+    store = get_store
+    stream = io.BytesIO()
+    assert write_nquads(stream, 1000, shape=SP2B, contexts=2) == 1000
+
+    assert load(store, 1000, shape=SP2B, contexts=2) == 1000
+    assert len(store) == 1000
+    assert len(list(store.contexts())) == 2
+
+    graph = Dataset()
+    graph.parse(data=stream.getvalue(), format="nquads")
+    assert len(list(graph.quads((None, None, None, None)))) == 1000
+
+
+def test_main(get_store):
+    main(["100", "-o", output, "--sp2b", "--contexts", "0"])
+    with open(output, "rb") as f:
+        lines = f.readlines()
+    assert len(lines) == 100
+    stream = io.BytesIO()
+    write_nquads(stream, 100, shape=SP2B, contexts=0)
+    assert stream.getvalue().splitlines(keepends=True) == lines
+    os.remove(output)
+
+    store = get_store
+    store.close()
+    main(["100", "--store", path, "--predicates", "5"])
+    store.open(path, create=False)
+    assert len(store) == 100
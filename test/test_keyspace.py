@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import ConjunctiveGraph, Graph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+from rdflib.store import VALID_STORE
+
+from rdflib_sqlitelsm.migrate import main
+from rdflib_sqlitelsm.sqlitelsmstore import (
+    KEYSPACE_FILE,
+    SQLiteLSMStore,
+    migrate,
+)
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_keyspace")
+migrated = path + "-migrated"
+backup = path + "-backup"
+
+context = URIRef("http://rdflib.net")
+michel = URIRef("urn:example:michel")
+
+
+@pytest.fixture
+def get_graph():
+    for directory in (path, migrated, backup):
+        shutil.rmtree(directory, ignore_errors=True)
+    graph = Graph(SQLiteLSMStore(layout="keyspace", text_index=True), context)
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+
+    yield graph
+
+    graph.close()
+    for directory in (path, migrated, backup):
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_keyspace(get_graph):
+    graph = get_graph
+    assert [f for f in os.listdir(path) if f.endswith(".db")] == [
+        KEYSPACE_FILE
+    ]
+    assert len(graph) == 1285
+    persons = set(graph.subjects(RDF.type, FOAF.Person))
+    assert len(persons) == 121
+    graph.add((michel, FOAF.name, Literal("Michel Foucault")))
+    assert [t for t, c in graph.store.text_search("foucault")] == [
+        (michel, FOAF.name, Literal("Michel Foucault"))
+    ]
+    graph.remove((next(iter(persons)), None, None))
+    ntriples = len(graph)
+    graph.close()
+
+    # The layout is found on reopening, whatever is asked for
+    graph = Graph(SQLiteLSMStore(), context)
+    graph.open(path, create=False)
+    assert graph.store.layout == "keyspace"
+    assert len(graph) == ntriples
+    assert graph.value(michel, FOAF.name) == Literal("Michel Foucault")
+    assert [t for t, c in graph.store.text_search("foucault")] == [
+        (michel, FOAF.name, Literal("Michel Foucault"))
+    ]
+    with graph.store.snapshot():
+        graph.add((michel, RDF.type, FOAF.Person))
+        assert len(graph) == ntriples
+    assert len(graph) == ntriples + 1
+
+    manifest = graph.store.backup(backup)
+    assert list(manifest["files"]) == [KEYSPACE_FILE]
+    graph.close()
+
+    store = SQLiteLSMStore()
+    assert store.open(backup, create=False, readonly=True) == VALID_STORE
+    graph = ConjunctiveGraph(store)
+    assert len(graph) == ntriples + 1
+    graph.close()
+
+
+def test_migrate(get_graph):
+    graph = get_graph
+    graph.bind("foaf", FOAF)
+    expected = set(graph)
+    graph.close()
+
+    counts = migrate(path, migrated, layout="files")
+    # A row for the context and one for the conjunctive graph
+    assert counts["cspo"] == 2 * 1285
+    assert counts["text"] > 0
+    assert KEYSPACE_FILE not in os.listdir(migrated)
+    assert "text.db" in os.listdir(migrated)
+    shutil.rmtree(path)
+    main([migrated, path])
+    shutil.rmtree(migrated)
+
+    graph = Graph(SQLiteLSMStore(), context)
+    graph.open(path, create=False)
+    assert graph.store.layout == "keyspace"
+    assert set(graph) == expected
+    assert graph.store.namespace("foaf") == URIRef(FOAF)
+    assert list(graph.store.text_search("foucault")) == []
+    # Terms are minted after the copied ones
+    graph.add((michel, FOAF.name, Literal("Michel Foucault")))
+    assert len(graph) == 1286
+    assert [t for t, c in graph.store.text_search("foucault")] == [
+        (michel, FOAF.name, Literal("Michel Foucault"))
+    ]
+
+
+def test_migrate_compression(get_graph):
+    graph = get_graph
+    expected = set(graph)
+    graph.close()
+
+    # The terms are compressed as configured
+    migrate(path, migrated, configuration={"dictionary.compression": "zlib"})
+    # and stay so unless configured otherwise
+    migrate(migrated, backup)
+    for directory in (migrated, backup):
+        graph = Graph(SQLiteLSMStore(), context)
+        graph.open(directory, create=False)
+        assert graph.store.metadata("compression") == "zlib"
+        assert set(graph) == expected
+        graph.close()
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+
+from rdflib_sqlitelsm.sqlitelsmstore import (
+    INSTRUMENTED,
+    SQLiteLSMStore,
+    StoreMetrics,
+)
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_metrics")
+
+context = URIRef("http://rdflib.net")
+michel = URIRef("urn:example:michel")
+
+
+@pytest.fixture
+def get_graph():
+    shutil.rmtree(path, ignore_errors=True)
+    events = []
+    metrics = StoreMetrics(sink=lambda *event: events.append(event))
+    graph = Graph(
+        SQLiteLSMStore(metrics=metrics, result_cache_size=1 << 20), context
+    )
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+
+    yield graph, events
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_metrics(get_graph):
+    graph, events = get_graph
+    store = graph.store
+    store.metrics.reset()
+    del events[:]
+
+    persons = list(graph.subjects(RDF.type, FOAF.Person))
+    assert len(graph) == 1285
+    graph.add((michel, FOAF.name, Literal("Michel")))
+    graph.remove((michel, None, None))
+    assert len(list(graph.triples((None, None, None)))) == 1285
+    # Closed part way through
+    triples = graph.triples((None, None, None))
+    next(triples)
+    triples.close()
+    assert len(list(store.contexts())) == 1
+
+    snapshot = store.metrics_snapshot()
+    operations = snapshot["operations"]
+    assert operations["triples"]["calls"] == 3
+    assert operations["triples"]["rows"] == len(persons) + 1285 + 1
+    assert operations["__len__"]["calls"] == 1
+    assert operations["add"]["calls"] == 1
+    assert operations["remove"]["calls"] == 1
+    assert operations["contexts"]["rows"] == 1
+    assert operations["_to_string"]["calls"] > 0
+    for stats in operations.values():
+        assert 0 < stats["p50"] <= stats["p99"]
+        assert stats["mean"] == stats["seconds"] / stats["calls"]
+    assert sum(1 for event in events if event[0] == "triples") == 3
+    assert set(snapshot["caches"]) == {
+        "to_string",
+        "from_string",
+        "result_cache",
+    }
+    assert snapshot["caches"]["result_cache"]["misses"] > 0
+    assert set(snapshot["lsm"]) >= {"c^s^p^o^.db", "i2k.db"}
+
+    # The term caches are still there to clear
+    store.remove((None, None, None), None)
+    assert len(graph) == 0
+
+
+def test_no_metrics():
+    store = SQLiteLSMStore()
+    assert store.metrics is None
+    assert not set(INSTRUMENTED) & set(store.__dict__)
+    with pytest.raises(AssertionError):
+        store.metrics_snapshot()
@@ -1,7 +1,9 @@
+import io
 import os
 import pytest
+import shutil
 import tempfile
-from rdflib import ConjunctiveGraph, URIRef, Namespace
+from rdflib import BNode, ConjunctiveGraph, Dataset, Literal, URIRef, Namespace
 
 TEST_DIR = os.path.abspath(os.path.dirname(__file__))
 TEST_BASE = "test/nquads.rdflib"
@@ -174,3 +176,110 @@ def test_parse_shared_bnode_contexts_named_graphs(get_data):
     data.seek(0)
     h.parse(data, format="nquads", bnode_context=bnode_ctx)
     assert set(h.contexts()) == set(g.contexts())
+
+
+def quads(graph):
+    # Blank nodes are relabelled by the parser
+    return sorted(
+        repr(
+            [
+                None if isinstance(t, BNode) else t
+                for t in (s, p, o, c.identifier)
+            ]
+        )
+        for s, p, o, c in graph.quads((None,) * 4)
+    )
+
+
+def test_export_nquads(get_graph):
+    graph = get_graph
+    bob = URIRef("urn:example:bob")
+    likes = URIRef("urn:example:likes")
+    graph.add((bob, likes, Literal('a "quoted"\nline', lang="en")))
+
+    buffer = io.BytesIO()
+    assert graph.store.export_nquads(buffer) == 486
+    lines = buffer.getvalue().decode("utf-8").splitlines()
+    assert len(lines) == 486
+    assert [line for line in lines if line.startswith("<urn:")] == [
+        '<urn:example:bob> <urn:example:likes> "a \\"quoted\\"\\nline"@en '
+        + graph.default_context.identifier.n3()
+        + " ."
+    ]
+
+    g2 = ConjunctiveGraph()
+    g2.parse(data=buffer.getvalue(), format="nquads")
+    assert quads(g2) == quads(graph)
+
+    entity = URIRef("http://bibliographica.org/entity/E10009")
+    buffer = io.BytesIO()
+    n = graph.store.export_nquads(buffer, [entity])
+    assert n == len(graph.get_context(entity)) > 0
+    g2 = ConjunctiveGraph()
+    g2.parse(data=buffer.getvalue(), format="nquads")
+    assert {c.identifier for c in g2.contexts()} == {entity}
+
+
+def test_export_nquads_dataset():
+    graph = Dataset(store=store_name)
+    graph.open(path + "-dataset", create=True)
+    bob = URIRef("urn:example:bob")
+    likes = URIRef("urn:example:likes")
+    graph.add((bob, likes, URIRef("urn:example:pizza")))
+    graph.add((bob, likes, URIRef("urn:example:cheese"), bob))
+    buffer = io.BytesIO()
+    assert graph.store.export_nquads(buffer) == 2
+    # The default graph of a Dataset is written as triples
+    assert sorted(buffer.getvalue().decode().splitlines()) == [
+        "<urn:example:bob> <urn:example:likes> <urn:example:cheese> "
+        "<urn:example:bob> .",
+        "<urn:example:bob> <urn:example:likes> <urn:example:pizza> .",
+    ]
+    graph.close()
+    graph.destroy(path + "-dataset")
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_import_nquads(get_graph, processes):
+    graph = get_graph
+    shutil.rmtree(path + "-import", ignore_errors=True)
+    g2 = ConjunctiveGraph(store=store_name)
+    g2.open(path + "-import", create=True)
+    nq_path = os.path.join(TEST_DIR, "nquads.rdflib/example.nquads")
+    with open(nq_path, "rb") as data:
+        assert (
+            g2.store.import_nquads(data, processes=processes, batch_size=100)
+            == 485
+        )
+    assert quads(g2) == quads(graph)
+    assert len(g2.store) == 449
+    assert len([x for x in g2.store.contexts()]) == 16
+    # The count of the terms minted in batches is recorded
+    assert g2.store.metadata("terms") == str(g2.store._terms)
+    # Statements already in the store are not added again, but blank node
+    # labels are scoped to the import
+    with_bnodes = [
+        q for q in g2.quads((None,) * 4) if isinstance(q[0], BNode)
+    ] + [q for q in g2.quads((None,) * 4) if isinstance(q[2], BNode)]
+    with open(nq_path, "rb") as data:
+        assert g2.store.import_nquads(data) == len(set(with_bnodes))
+
+    bob = URIRef("urn:example:bob")
+    likes = URIRef("urn:example:likes")
+    data = io.BytesIO(
+        b"# A comment\n"
+        b"\n"
+        b'<urn:example:bob> <urn:example:likes> "caf\\u00e9 \\"au\\" lait"@fr .\n'
+        b"_:b1 <urn:example:likes> _:b2 <urn:example:g> .\n"
+        b"_:b2 <urn:example:likes> _:b1 <urn:example:g> .\n"
+    )
+    assert g2.store.import_nquads(data, default_context=g2.default_context) == 3
+    assert g2.value(bob, likes) == Literal('café "au" lait', lang="fr")
+    named = g2.get_context(URIRef("urn:example:g"))
+    (s, p, o), (s2, p2, o2) = sorted(named)
+    assert isinstance(s, BNode) and (s, o) == (o2, s2)
+
+    with pytest.raises(ValueError, match="line 2"):
+        g2.store.import_nquads(io.BytesIO(b"\n<urn:a> <urn:b> .\n"))
+    g2.close()
+    g2.destroy(path + "-import")
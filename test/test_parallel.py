@@ -0,0 +1,134 @@
+import io
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import Graph, URIRef
+
+from rdflib_sqlitelsm.parallel import ParallelReader, count, materialize
+from rdflib_sqlitelsm.sqlitelsmstore import (
+    CLEAN_SHUTDOWN_MARKER,
+    SQLiteLSMStore,
+)
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_parallel")
+
+context = URIRef("http://rdflib.net")
+
+
+@pytest.fixture
+def get_graph():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = Graph("SQLiteLSM", context)
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_leading_terms(get_graph):
+    store = get_graph.store
+    predicates = store.leading_terms("cpos")
+    assert len(predicates) == len(set(predicates))
+    assert {store._from_string(p) for p in predicates} == set(
+        get_graph.predicates()
+    )
+    # In key order of the index
+    keys = [b"^" + p + b"^" for p in predicates]
+    assert keys == sorted(keys)
+
+
+def test_scan_range(get_graph):
+    store = get_graph.store
+    triples = [t for t, c in store.scan_range("cspo")]
+    assert len(triples) == len(get_graph)
+    assert set(triples) == set(get_graph.triples((None, None, None)))
+
+    subjects = store.leading_terms("cspo")
+    start = b"^" + subjects[1] + b"^"
+    end = b"^" + subjects[2] + b"^"
+    subject = store._from_string(subjects[1])
+    assert {t for t, c in store.scan_range("cspo", start, end)} == set(
+        get_graph.triples((subject, None, None))
+    )
+
+
+def test_parallel_reader(get_graph):
+    graph = get_graph
+    expected = set(graph.triples((None, None, None)))
+
+    with ParallelReader(path, processes=2, partitions=5) as reader:
+        partitions = reader.partitions()
+        assert len(partitions) == 5
+        assert partitions[0][0] is None and partitions[-1][1] is None
+        assert reader.count() == len(expected)
+        triples = list(reader.triples())
+
+    assert len(triples) == len(expected)
+    assert {t for t, c in triples} == expected
+    assert {c for t, cs in triples for c in cs} == {context}
+    # Only read, so not marked as shut down cleanly under the open writer
+    assert not os.path.exists(os.path.join(path, CLEAN_SHUTDOWN_MARKER))
+
+    with pytest.raises(ValueError):
+        ParallelReader(path + "-missing", processes=1)
+
+
+def test_scan_partitions(get_graph):
+    store = get_graph.store
+    ntriples = len(get_graph)
+
+    partitions = store.scan_partitions(4, "cspo", samples=16)
+    assert len(partitions) == 4
+    sizes = [len(list(store.scan_range("cspo", *p))) for p in partitions]
+    assert sum(sizes) == ntriples
+    assert max(sizes) - min(sizes) < ntriples // 4
+    for index in ("cpos", "cosp"):
+        partitions = store.scan_partitions(4, index)
+        assert 1 < len(partitions) <= 4
+        starts = [start for start, end in partitions[1:]]
+        assert starts == sorted(set(starts))
+        sizes = [len(list(store.scan_range(index, *p))) for p in partitions]
+        assert sum(sizes) == ntriples
+
+    assert store.scan_partitions(1) == [(None, None)]
+
+
+def test_parallel_scan(get_graph):
+    graph = get_graph
+    ntriples = len(graph)
+
+    assert sum(graph.store.parallel_scan(count, 3, processes=True)) == ntriples
+    with pytest.raises(AssertionError):
+        graph.store.parallel_scan(count, 3, processes=False)
+    graph.close()
+
+    graph = Graph(SQLiteLSMStore(threadsafe=True), context)
+    graph.open(path, create=False)
+    results = graph.store.parallel_scan(materialize, 3, "cpos")
+    assert len(results) == 3
+    assert {t for r in results for t, c in r} == set(
+        graph.triples((None, None, None))
+    )
+    graph.close()
+
+
+def test_parallel_export_nquads(get_graph):
+    graph = get_graph
+    expected = io.BytesIO()
+    assert graph.store.export_nquads(expected) == len(graph)
+
+    exported = io.BytesIO()
+    with ParallelReader(path, processes=2) as reader:
+        assert reader.export_nquads(exported) == len(graph)
+        assert reader.export_nquads(io.BytesIO(), [URIRef("urn:x")]) == 0
+    assert exported.getvalue() == expected.getvalue()
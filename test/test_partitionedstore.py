@@ -0,0 +1,188 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import ConjunctiveGraph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+from rdflib.store import NO_STORE, VALID_STORE
+
+from rdflib_sqlitelsm.partitionedstore import PartitionedSQLiteLSMStore
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_partitioned")
+
+michel = URIRef("urn:example:michel")
+bob = URIRef("urn:example:bob")
+likes = URIRef("urn:example:likes")
+pizza = URIRef("urn:example:pizza")
+cheese = URIRef("urn:example:cheese")
+context1 = URIRef("urn:example:graph1")
+context2 = URIRef("urn:example:graph2")
+
+
+@pytest.fixture(params=[None, 2], ids=["graphs", "groups"])
+def get_graph(request):
+    shutil.rmtree(path, ignore_errors=True)
+    graph = ConjunctiveGraph(
+        store=PartitionedSQLiteLSMStore(groups=request.param)
+    )
+    assert graph.open(path, create=True) == VALID_STORE
+    graph.get_context(context1).parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def partitions():
+    return sorted(os.listdir(os.path.join(path, "graphs")))
+
+
+def test_partitions(get_graph):
+    graph = get_graph
+    ntriples = len(graph)
+    assert ntriples == 1285
+    person = next(graph.subjects(RDF.type, FOAF.Person))
+    graph.get_context(context2).add((michel, likes, pizza))
+    # A triple in both graphs is counted once in the union graph
+    graph.get_context(context2).add((person, RDF.type, FOAF.Person))
+    assert len(set(graph.subjects(RDF.type, FOAF.Person))) == 121
+    assert len(list(graph.triples((person, RDF.type, None)))) == 1
+    assert len(graph) == ntriples + 1
+    assert len(graph.get_context(context2)) == 2
+    assert {c.identifier for c in graph.contexts()} == {context1, context2}
+    assert {
+        c.identifier for c in graph.contexts((person, RDF.type, FOAF.Person))
+    } == {context1, context2}
+
+    if graph.store.groups is None:
+        assert graph.store.partition_name(
+            context1
+        ) != graph.store.partition_name(context2)
+        assert len(partitions()) == 2
+
+
+def test_remove_graph(get_graph):
+    graph = get_graph
+    ntriples = len(graph)
+    graph.get_context(context2).add((michel, likes, pizza))
+    graph.get_context(context2).add((bob, likes, pizza))
+    assert len(graph) == ntriples + 2
+
+    graph.remove((michel, likes, None))
+    assert len(graph) == ntriples + 1
+    graph.store.remove_graph(graph.get_context(context1))
+    assert len(graph) == 1
+    assert {c.identifier for c in graph.contexts()} == {context2}
+    if graph.store.groups is None:
+        name = graph.store.partition_name(context1)
+        assert not os.path.exists(os.path.join(path, "graphs", name))
+
+    # A graph added again after its removal is listed again
+    graph.get_context(context1).add((michel, likes, pizza))
+    assert {c.identifier for c in graph.contexts()} == {context1, context2}
+
+
+def test_replace_graph(get_graph):
+    graph = get_graph
+    store = graph.store
+    graph.get_context(context2).add((michel, likes, pizza))
+    if store.groups:
+        with pytest.raises(AssertionError):
+            store.replace_graph(graph.get_context(context2), [])
+        return
+    store.replace_graph(
+        graph.get_context(context2),
+        [(michel, likes, cheese), (bob, likes, cheese)],
+    )
+    assert set(graph.get_context(context2)) == {
+        (michel, likes, cheese),
+        (bob, likes, cheese),
+    }
+    assert len(graph) == 1285 + 2
+    assert partitions() == sorted(
+        store.partition_name(c) for c in (context1, context2)
+    )
+    # The old version was removed once the new one was current
+    name = os.path.join(path, "graphs", store.partition_name(context2))
+    assert len(os.listdir(name)) == 1
+
+
+def test_sparql_and_reopen(get_graph):
+    graph = get_graph
+    groups = graph.store.groups
+    graph.bind("foaf", FOAF)
+    q = """
+        PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+        SELECT (COUNT(?s) AS ?c) WHERE { ?s a foaf:Person }
+        """
+    assert [int(row.c) for row in graph.query(q)] == [121]
+    graph.add((michel, FOAF.name, Literal("Michel"), context2))
+    graph.close()
+
+    graph = ConjunctiveGraph(store="SQLiteLSMPartitioned")
+    assert graph.open(path, create=False) == VALID_STORE
+    assert graph.store.groups == groups
+    assert len(graph) == 1286
+    assert graph.store.namespace("foaf") == URIRef(FOAF)
+    assert graph.value(michel, FOAF.name) == Literal("Michel")
+    graph.close()
+
+    missing = PartitionedSQLiteLSMStore()
+    assert missing.open(path + "-missing", create=False) == NO_STORE
+
+
+def test_max_open():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = ConjunctiveGraph(store=PartitionedSQLiteLSMStore(max_open=1))
+    graph.open(path, create=True)
+    contexts = [URIRef(f"urn:example:graph{i}") for i in range(5)]
+    for i, context in enumerate(contexts):
+        graph.get_context(context).add((michel, likes, Literal(i)))
+    assert len(graph) == 5
+    # A partition being scanned is not closed by the use of others
+    for triple in graph.get_context(contexts[0]):
+        for context in contexts[1:]:
+            graph.get_context(context).add((bob, likes, pizza))
+        assert len(graph.get_context(contexts[3])) == 2
+    assert len(graph) == 6
+    assert set(graph.contexts((bob, likes, pizza))) == {
+        graph.get_context(c) for c in contexts[1:]
+    }
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_replace_graph_while_read(get_graph):
+    graph = get_graph
+    store = graph.store
+    if store.groups:
+        return
+    graph.get_context(context2).add((michel, likes, pizza))
+    graph.get_context(context2).add((bob, likes, pizza))
+    name = os.path.join(path, "graphs", store.partition_name(context2))
+
+    # The version being read is kept until the read is done
+    results = store.triples((None, likes, None), graph.get_context(context2))
+    first = next(results)
+    store.replace_graph(graph.get_context(context2), [(bob, likes, cheese)])
+    assert set(graph.get_context(context2)) == {(bob, likes, cheese)}
+    assert len(os.listdir(name)) == 2
+    assert {first[0], *(t for t, c in results)} == {
+        (michel, likes, pizza),
+        (bob, likes, pizza),
+    }
+    assert len(os.listdir(name)) == 1
+
+    results = store.triples((None, likes, None), graph.get_context(context2))
+    next(results)
+    store.remove_graph(graph.get_context(context2))
+    assert len(graph.get_context(context2)) == 0
+    assert list(results) == []
+    assert not os.listdir(name)
@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+from rdflib.store import NO_STORE, VALID_STORE
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_readonly")
+
+context = URIRef("http://rdflib.net")
+michel = URIRef("urn:example:michel")
+
+
+@pytest.fixture
+def get_graph():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = Graph("SQLiteLSM", context)
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+    graph.bind("foaf", FOAF)
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def open_readonly(configuration=path):
+    store = SQLiteLSMStore()
+    assert (
+        store.open(configuration, create=False, readonly=True) == VALID_STORE
+    )
+    return Graph(store, context)
+
+
+def count_persons(_):
+    graph = open_readonly()
+    n = len(set(graph.subjects(RDF.type, FOAF.Person)))
+    graph.close()
+    return n
+
+
+def test_readonly_reads(get_graph):
+    graph = open_readonly()
+    assert graph.store.readonly
+    assert len(graph) == 1285
+    assert len(set(graph.subjects(RDF.type, FOAF.Person))) == 121
+    assert graph.store.namespace("foaf") == URIRef(FOAF)
+    assert [c.identifier for c in graph.store.contexts()] == [context]
+    # Terms the store has never seen match nothing and are not minted
+    assert list(graph.triples((michel, None, None))) == []
+    assert (michel, RDF.type, FOAF.Person) not in graph
+    assert list(graph.store.contexts((michel, RDF.type, FOAF.Person))) == []
+    assert graph.store.__len__(URIRef("urn:example:nowhere")) == 0
+
+    # A write made by the writer meanwhile is seen, new term and all
+    get_graph.add((michel, RDF.type, FOAF.Person))
+    assert (michel, RDF.type, FOAF.Person) in graph
+    graph.close()
+
+
+def test_readonly_writes(get_graph):
+    graph = open_readonly(path + "?autoflush=1024")
+    with pytest.raises(PermissionError):
+        graph.add((michel, RDF.type, FOAF.Person))
+    with pytest.raises(PermissionError):
+        graph.remove((None, RDF.type, None))
+    with pytest.raises(PermissionError):
+        graph.bind("ex", URIRef("urn:example:"), override=True)
+    with pytest.raises(PermissionError):
+        graph.store.add_graph(Graph(identifier=michel))
+    assert len(graph) == 1285
+    graph.close()
+
+    graph = Graph("SQLiteLSM", context)
+    assert graph.open(path + "?readonly=1", create=False) == VALID_STORE
+    assert graph.store.readonly
+    with pytest.raises(PermissionError):
+        graph.add((michel, FOAF.name, Literal("Michel")))
+    graph.close()
+
+    assert (
+        SQLiteLSMStore().open(path + "-missing", create=False, readonly=True)
+        == NO_STORE
+    )
+    assert not os.path.exists(path + "-missing")
+
+
+def test_readonly_processes(get_graph):
+    with multiprocessing.get_context("spawn").Pool(3) as pool:
+        assert pool.map(count_persons, range(3)) == [121] * 3
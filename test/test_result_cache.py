@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import ConjunctiveGraph, URIRef
+from rdflib.namespace import FOAF, RDF
+from rdflib.store import VALID_STORE
+
+from rdflib_sqlitelsm.sqlitelsmstore import ResultCache, SQLiteLSMStore
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_cache")
+
+michel = URIRef("urn:example:michel")
+bob = URIRef("urn:example:bob")
+likes = URIRef("urn:example:likes")
+pizza = URIRef("urn:example:pizza")
+context1 = URIRef("urn:example:graph1")
+context2 = URIRef("urn:example:graph2")
+
+
+@pytest.fixture
+def get_graph():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = ConjunctiveGraph(store=SQLiteLSMStore(result_cache_size=1 << 20))
+    assert graph.open(path, create=True) == VALID_STORE
+    graph.get_context(context1).add((michel, RDF.type, FOAF.Person))
+    graph.get_context(context2).add((bob, RDF.type, FOAF.Person))
+    graph.get_context(context1).add((michel, likes, pizza))
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def persons(graph):
+    return set(graph.subjects(RDF.type, FOAF.Person))
+
+
+def test_cache_hits(get_graph):
+    graph = get_graph
+    cache = graph.store.result_cache
+
+    assert persons(graph) == {michel, bob}
+    assert cache.stats()["misses"] == 1
+    assert persons(graph) == {michel, bob}
+    assert persons(graph) == {michel, bob}
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["entries"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+    assert 0 < stats["memory"] <= stats["maxmemory"]
+
+    triples = list(graph.store.triples((None, RDF.type, FOAF.Person), None))
+    assert {c for t, cs in triples for c in cs} == {
+        graph.get_context(context1),
+        graph.get_context(context2),
+    }
+
+
+def test_cache_invalidation(get_graph):
+    graph = get_graph
+    cache = graph.store.result_cache
+
+    assert persons(graph) == {michel, bob}
+    assert set(graph.get_context(context1).objects(michel, likes)) == {pizza}
+
+    # A write to another predicate leaves the rdf:type entry valid
+    graph.get_context(context2).add((bob, likes, pizza))
+    hits = cache.hits
+    assert persons(graph) == {michel, bob}
+    assert cache.hits == hits + 1
+
+    graph.get_context(context2).remove((bob, RDF.type, FOAF.Person))
+    assert persons(graph) == {michel}
+
+    graph.remove((michel, None, None))
+    assert persons(graph) == set()
+    assert set(graph.get_context(context1).objects(michel, likes)) == set()
+
+    graph.get_context(context2).add((michel, RDF.type, FOAF.Person))
+    assert persons(graph) == {michel}
+    graph.store.remove_graph(graph.get_context(context2))
+    assert persons(graph) == set()
+
+
+def test_cache_memory_bound():
+    cache = ResultCache(1000)
+    cache.put("a", 0, ["a"], 600)
+    cache.put("b", 0, ["b"], 600)
+    assert cache.get("a", 0) is None
+    assert cache.get("b", 0) == ["b"]
+    assert cache.memory == 600
+    cache.put("c", 0, ["c"], 2000)
+    assert cache.get("c", 0) is None
+    assert cache.get("b", 1) is None
+    assert cache.stats()["entries"] == 0
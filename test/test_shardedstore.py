@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import ConjunctiveGraph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+from rdflib.store import NO_STORE, VALID_STORE
+
+from rdflib_sqlitelsm.generate import generate
+from rdflib_sqlitelsm.shardedstore import (
+    PROCESS_BATCH,
+    ShardedSQLiteLSMStore,
+    shard_number,
+)
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_sharded")
+
+michel = URIRef("urn:example:michel")
+bob = URIRef("urn:example:bob")
+likes = URIRef("urn:example:likes")
+pizza = URIRef("urn:example:pizza")
+context1 = URIRef("urn:example:graph1")
+context2 = URIRef("urn:example:graph2")
+
+
+@pytest.fixture
+def get_graph():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = ConjunctiveGraph(store=ShardedSQLiteLSMStore(shards=3))
+    assert graph.open(path, create=True) == VALID_STORE
+    graph.get_context(context1).parse(
+        location=os.path.join(os.path.dirname(__file__), "sp2b", "1ktriples.n3"),
+        format="n3",
+    )
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_sharding(get_graph):
+    graph = get_graph
+    store = graph.store
+    ntriples = len(graph)
+    assert ntriples == 1285
+    assert sum(len(shard) for shard in store.shards) == ntriples
+    assert all(len(shard) > 0 for shard in store.shards)
+
+    for shard in store.shards:
+        for (s, p, o), c in shard.triples((None, None, None)):
+            assert store.shards[shard_number(s, 3)] is shard
+
+    persons = set(graph.subjects(RDF.type, FOAF.Person))
+    assert len(persons) == 121
+    for person in persons:
+        assert (person, RDF.type, FOAF.Person) in graph
+        assert len(list(graph.triples((person, None, None)))) > 0
+
+
+def test_contexts_and_removal(get_graph):
+    graph = get_graph
+    ntriples = len(graph)
+    graph.get_context(context2).add((michel, likes, pizza))
+    graph.get_context(context2).add((bob, likes, pizza))
+    assert {c.identifier for c in graph.contexts()} == {context1, context2}
+    assert len(graph) == ntriples + 2
+    assert len(graph.get_context(context2)) == 2
+
+    # A triple with an unbound subject may be in any shard
+    graphs = [URIRef(f"urn:example:graph{i}") for i in range(3, 23)]
+    for i, context in enumerate(graphs):
+        graph.get_context(context).add(
+            (URIRef(f"urn:example:{i}"), likes, bob)
+        )
+    assert {
+        c.identifier for c in graph.store.contexts((None, likes, bob))
+    } == set(graphs)
+    contexts = graph.store.contexts((None, likes, None))
+    assert {c.identifier for c in contexts} == {context2, *graphs}
+    graph.remove((None, likes, None))
+    assert len(graph) == ntriples
+    graph.store.remove_graph(graph.get_context(context1))
+    assert len(graph) == 0
+
+
+def test_sparql_and_reopen(get_graph):
+    graph = get_graph
+    graph.bind("foaf", FOAF)
+    q = """
+        PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+        SELECT (COUNT(?s) AS ?c) WHERE { ?s a foaf:Person }
+        """
+    assert [int(row.c) for row in graph.query(q)] == [121]
+    graph.add((michel, FOAF.name, Literal("Michel"), context2))
+    graph.close()
+
+    graph = ConjunctiveGraph(store="SQLiteLSMSharded")
+    assert graph.open(path, create=False) == VALID_STORE
+    assert graph.store.nshards == 3
+    assert len(graph) == 1286
+    assert graph.store.namespace("foaf") == URIRef(FOAF)
+    assert graph.value(michel, FOAF.name) == Literal("Michel")
+    graph.close()
+
+    missing = ShardedSQLiteLSMStore()
+    assert missing.open(path + "-missing", create=False) == NO_STORE
+
+
+def test_addN_in_processes():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = ConjunctiveGraph(
+        store=ShardedSQLiteLSMStore(shards=3, processes=True)
+    )
+    graph.open(path, create=True)
+    quads = [
+        (s, p, o, graph.get_context(c))
+        for s, p, o, c in generate(PROCESS_BATCH, contexts=2)
+    ]
+    graph.addN(quads)
+    store = graph.store
+    assert len(graph) == PROCESS_BATCH
+    assert sum(len(shard) for shard in store.shards) == PROCESS_BATCH
+    for shard in store.shards:
+        for (s, p, o), c in shard.triples((None, None, None)):
+            assert store.shards[shard_number(s, 3)] is shard
+    assert {c.identifier for c in graph.contexts()} == {
+        c.identifier for s, p, o, c in quads
+    }
+    for s, p, o, c in quads[:: PROCESS_BATCH // 16]:
+        assert (s, p, o) in graph.get_context(c.identifier)
+    # The shards are usable in this process once the workers are done
+    graph.add((michel, likes, pizza, graph.get_context(context1)))
+    assert len(graph) == PROCESS_BATCH + 1
+    graph.close()
+    graph.destroy(configuration=path)
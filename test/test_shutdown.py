@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import Graph, URIRef
+from rdflib.namespace import FOAF, RDF
+
+from rdflib_sqlitelsm.sqlitelsmstore import (
+    CLEAN_SHUTDOWN_MARKER,
+    SQLiteLSMStore,
+)
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_shutdown")
+
+context = URIRef("http://rdflib.net")
+michel = URIRef("urn:example:michel")
+marker = os.path.join(path, CLEAN_SHUTDOWN_MARKER)
+
+
+@pytest.fixture
+def get_graph():
+    shutil.rmtree(path, ignore_errors=True)
+    timings = []
+    graph = Graph(SQLiteLSMStore(open_hook=timings.append), context)
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+
+    yield graph, timings
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_clean_shutdown(get_graph):
+    graph, timings = get_graph
+    assert timings[0]["clean"]
+    assert set(timings[0]["databases"]) == {
+        name[:-3] for name in os.listdir(path) if name.endswith(".db")
+    }
+    assert not os.path.exists(marker)
+    graph.close()
+    assert os.path.exists(marker)
+
+    graph.open(path, create=False)
+    assert not os.path.exists(marker)
+    assert timings[1]["clean"]
+    assert timings[1]["recovery"] == 0.0
+    assert timings[1]["total"] >= sum(timings[1]["databases"].values())
+    assert len(graph) == 1285
+
+    # A read-only open leaves the marker alone
+    graph.close()
+    readonly = SQLiteLSMStore()
+    readonly.open(path, create=False, readonly=True)
+    readonly.close()
+    assert os.path.exists(marker)
+    graph.open(path, create=False)
+
+
+def test_unclean_shutdown(get_graph):
+    graph, timings = get_graph
+    store = graph.store
+    graph.close()
+    os.remove(marker)
+    terms = store._terms
+
+    graph.open(path, create=False)
+    assert not timings[1]["clean"]
+    assert timings[1]["recovery"] > 0
+    assert store._terms == terms
+
+    # A term count lost to a crash is recovered from the term dictionary
+    store.set_metadata("terms", terms - 10)
+    graph.close()
+    os.remove(marker)
+    graph.open(path, create=False)
+    assert store._terms == terms
+    graph.add((michel, RDF.type, FOAF.Person))
+    assert store._terms == terms + 1
+    assert (michel, RDF.type, FOAF.Person) in graph
+    assert len(set(graph.subjects(RDF.type, FOAF.Person))) == 122
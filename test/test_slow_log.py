@@ -0,0 +1,95 @@
+import logging
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore, slow_logger
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_slow_log")
+
+context = URIRef("http://rdflib.net")
+michel = URIRef("urn:example:michel")
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def get_graph():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = Graph(SQLiteLSMStore(slow_log_threshold=0), context)
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+    records = Records()
+    slow_logger.addHandler(records)
+
+    yield graph, records.messages
+
+    slow_logger.removeHandler(records)
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_slow_log(get_graph):
+    graph, messages = get_graph
+    persons = list(graph.subjects(RDF.type, FOAF.Person))
+    assert len(messages) == 1
+    message = messages[0]
+    assert message.startswith(
+        f"Slow triples of (? {RDF.type.n3()} {FOAF.Person.n3()})"
+        f" in {context.n3()}"
+    )
+    assert "index cpos" in message
+    assert f"{len(persons)} rows" in message
+    # One more key read to find the end of the range
+    assert f"{len(persons) + 1} keys scanned" in message
+
+    graph.add((michel, FOAF.name, Literal("Michel")))
+    graph.remove((michel, None, None))
+    assert messages[-1].startswith(f"Slow remove of ({michel.n3()} ? ?)")
+    assert "index cspo" in messages[-1]
+    assert messages[-1].endswith(" 1 rows")
+
+    graph.store.slow_log_threshold = 3600
+    list(graph.triples((None, None, None)))
+    assert len(messages) == 2
+
+
+def test_explain(get_graph):
+    graph, messages = get_graph
+    store = graph.store
+    plan = store.explain((None, RDF.type, FOAF.Person), context)
+    assert plan["index"] == "cpos"
+    p, o = plan["ids"][1:]
+    assert plan["ids"][0] is None
+    assert plan["prefix"] == f"{plan['context']}^{p}^{o}^".encode()
+    assert plan["unknown"] == []
+
+    plan = store.explain((None, None, FOAF.Person))
+    assert plan["index"] == "cosp"
+    assert plan["prefix"] == f"^{o}^".encode()
+    assert plan["context"] is None
+
+    # Nothing is scanned, nor is an ID minted for an unknown term
+    terms = store.metadata("terms")
+    plan = store.explain((michel, None, None), context)
+    assert plan["index"] == "cspo"
+    assert plan["prefix"] is None
+    assert plan["unknown"] == [michel]
+    assert store.metadata("terms") == terms
+    assert messages == []
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import threading
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_snapshot")
+
+context = URIRef("http://rdflib.net")
+michel = URIRef("urn:example:michel")
+
+
+@pytest.fixture(params=[False, True], ids=["serial", "threadsafe"])
+def get_graph(request):
+    shutil.rmtree(path, ignore_errors=True)
+    graph = Graph(
+        SQLiteLSMStore(threadsafe=request.param, result_cache_size=1 << 20),
+        context,
+    )
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_snapshot(get_graph):
+    graph = get_graph
+    store = graph.store
+    persons = set(graph.subjects(RDF.type, FOAF.Person))
+    person = next(iter(persons))
+
+    with store.snapshot():
+        scan = graph.triples((None, None, None))
+        first = next(scan)
+        # Writes made during the scan are not seen by it
+        graph.add((michel, RDF.type, FOAF.Person))
+        graph.add((michel, FOAF.name, Literal("Michel")))
+        graph.remove((person, None, None))
+        assert len([first] + list(scan)) == 1285
+        assert set(graph.subjects(RDF.type, FOAF.Person)) == persons
+        assert graph.value(michel, FOAF.name) is None
+        with store.snapshot():
+            assert len(graph) == 1285
+    expected = (persons - {person}) | {michel}
+    assert set(graph.subjects(RDF.type, FOAF.Person)) == expected
+    assert graph.value(michel, FOAF.name) == Literal("Michel")
+    with store.snapshot():
+        graph.add((michel, FOAF.nick, Literal("Michel")))
+    assert graph.value(michel, FOAF.nick) == Literal("Michel")
+
+
+def test_snapshot_with_writer_thread(get_graph):
+    graph = get_graph
+    store = graph.store
+    if not store.threadsafe:
+        pytest.skip("needs a threadsafe store")
+    ntriples = len(graph)
+
+    def load():
+        for i in range(500):
+            graph.add((URIRef(f"urn:example:{i}"), RDF.type, FOAF.Person))
+
+    with store.snapshot():
+        writer = threading.Thread(target=load)
+        writer.start()
+        counts = [
+            len(list(graph.triples((None, None, None)))) for i in range(5)
+        ]
+        writer.join()
+        assert counts == [ntriples] * 5
+        assert len(graph) == ntriples
+    assert len(graph) == ntriples + 500
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import Graph, URIRef
+
+from rdflib_sqlitelsm.sqlitelsmstore import KEYSPACE_FILE, SQLiteLSMStore
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_stats")
+
+context = URIRef("http://rdflib.net")
+
+
+@pytest.fixture(params=["files", "keyspace"])
+def get_graph(request):
+    shutil.rmtree(path, ignore_errors=True)
+    graph = Graph(SQLiteLSMStore(layout=request.param), context)
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_storage_stats(get_graph):
+    store = get_graph.store
+    stats = store.storage_stats()
+    databases = stats["databases"]
+    assert set(databases) == {
+        "cspo",
+        "cpos",
+        "cosp",
+        "contexts",
+        "namespace",
+        "prefix",
+        "k2i",
+        "i2k",
+    }
+    assert stats["terms"] == databases["i2k"]["keys"] > 0
+    # A row for the context and one for the conjunctive graph
+    for name in ("cspo", "cpos", "cosp"):
+        assert databases[name]["keys"] == 2 * 1285
+    assert databases["contexts"]["keys"] == 1
+    cspo = databases["cspo"]
+    assert cspo["average_key_size"] == cspo["key_bytes"] / cspo["keys"]
+
+    if store.layout == "keyspace":
+        assert list(stats["files"]) == [KEYSPACE_FILE]
+        assert {d["file"] for d in databases.values()} == {KEYSPACE_FILE}
+    else:
+        assert len(stats["files"]) == 8
+        assert databases["cspo"]["file"] == "c^s^p^o^.db"
+    for info in stats["files"].values():
+        assert set(info["tree_size"]) == {"old", "current"}
+        assert info["checkpoint_size"] >= 0
+    assert stats["size"] == sum(
+        info["size"] + info["log_size"] for info in stats["files"].values()
+    )
+    name = databases["cspo"]["file"]
+    assert stats["files"][name]["size"] == os.path.getsize(
+        os.path.join(path, name)
+    )
@@ -0,0 +1,121 @@
+import gc
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+logging.basicConfig(level=logging.ERROR, format="%(message)s")
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_concurrency")
+
+
+def open_graph(fixture):
+    shutil.rmtree(path, ignore_errors=True)
+    graph = Graph(SQLiteLSMStore(threadsafe=True), URIRef("http://rdflib.net"))
+    graph.open(path, create=True)
+    graph.parse(
+        location=os.path.join(os.path.dirname(__file__), "sp2b", fixture),
+        format="n3",
+    )
+    return graph
+
+
+@pytest.fixture
+def get_graph():
+    graph = open_graph("1ktriples.n3")
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_concurrent_readers_and_writer(get_graph):
+    graph = get_graph
+    ntriples = len(graph)
+    npersons = len(list(graph.subjects(RDF.type, FOAF.Person)))
+
+    def read(n):
+        for _ in range(5):
+            assert len(list(graph.triples((None, None, None)))) >= ntriples
+            assert len(list(graph.subjects(RDF.type, FOAF.Person))) >= npersons
+        return n
+
+    def write(n):
+        for i in range(200):
+            graph.add((URIRef(f"urn:example:{n}:{i}"), RDF.type, FOAF.Person))
+            graph.add(
+                (URIRef(f"urn:example:{n}:{i}"), FOAF.name, Literal(f"{i}"))
+            )
+        return n
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        futures = [executor.submit(read, n) for n in range(4)]
+        futures += [executor.submit(write, n) for n in range(2)]
+        assert sorted(f.result() for f in futures) == [0, 0, 1, 1, 2, 3]
+
+    assert len(graph) == ntriples + 800
+    assert len(list(graph.subjects(RDF.type, FOAF.Person))) == npersons + 400
+
+
+def test_thread_handles_closed_on_exit(get_graph):
+    graph = get_graph
+    if not os.path.isdir("/proc/self/fd"):
+        pytest.skip("needs /proc to count open files")
+
+    def nfiles():
+        # Files held by the garbage of other tests are closed first
+        gc.collect()
+        return len(os.listdir("/proc/self/fd"))
+
+    def scan():
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda n: len(graph), range(4)))
+
+    scan()
+    before = nfiles()
+    for _ in range(5):
+        scan()
+    # LSM keeps some files of closed handles open for reuse, but leaked
+    # handles would add at least two files with each scan
+    assert nfiles() < before + 5
+
+
+def test_read_scaling():
+    """
+    Read throughput of full scans over the 10k triples fixture as the
+    number of reading threads grows
+    """
+    graph = open_graph("10ktriples.n3")
+    ntriples = len(graph)
+    scans = 8
+
+    def scan(n):
+        return len(list(graph.triples((None, None, None))))
+
+    op = "threads,triples_per_second\n"
+    try:
+        for nthreads in (1, 2, 4, 8):
+            with ThreadPoolExecutor(max_workers=nthreads) as executor:
+                # Open each thread's read handles before timing
+                list(executor.map(lambda n: len(graph), range(nthreads)))
+                t0 = time()
+                results = list(executor.map(scan, range(scans)))
+                t1 = time()
+            assert results == [ntriples] * scans
+            op += f"{nthreads},{int(ntriples * scans / (t1 - t0))}\n"
+    finally:
+        graph.close()
+        graph.destroy(configuration=path)
+
+    logger.info(op)
@@ -1,143 +1,73 @@
+import copy
+import json
 import os
-import gc
-from time import time
-from random import random
-
 import tempfile
-import shutil
-import logging
-
-
-from rdflib import Graph, URIRef
-from rdflib import FOAF, RDF
-
-logging.basicConfig(level=logging.ERROR, format="%(message)s")
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-
-
-def random_uri():
-    return URIRef("%s" % random())
-
-
-fixturelist = [
-    ("500triples", (691, 58)),
-    ("1ktriples", (1285, 121)),
-    ("2ktriples", (2006, 191)),
-    ("3ktriples", (3095, 289)),
-    ("5ktriples", (5223, 497)),
-    ("10ktriples", (10303, 949)),
-    ("25ktriples", (25161, 2162)),
-    ("50ktriples", (50168, 4165)),
-    ("100ktriples", (100073, 8254)),
-    ("250ktriples", (250128, 20144)),
-    ("500ktriples", (500043, 40434)),
-]
-
 
-store = "SQLiteLSM"
-
-path = os.environ.get(
-    "DBURI", os.path.join(tempfile.gettempdir(), f"test_{store.lower()}")
+from rdflib_sqlitelsm.benchmark import (
+    OPERATIONS,
+    benchmark,
+    compare,
+    environment,
+    main,
 )
 
-
-def process_test_data(timings):
-    keys = [
-        "ntriples",
-        "loading",
-        "opening",
-        "iterating",
-        "lengthing",
-        "subjects",
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_benchmark")
+output = path + ".json"
+
+location = os.path.join(os.path.dirname(__file__), "sp2b", "500triples.n3")
+
+
+def test_benchmark():
+    result = benchmark(location, path=path, repeat=1, batch=10)
+    assert not os.path.exists(path)
+    assert result["triples"] == 691
+    operations = result["operations"]
+    assert tuple(operations) == OPERATIONS
+    for timings in operations.values():
+        assert timings["cold"] > 0 and timings["warm"] > 0
+    assert operations["spo"]["rows"] == 10
+    assert operations["???"]["rows"] == 691
+    assert operations["len"]["rows"] == 691
+    assert operations["contexts"]["rows"] == 1
+    assert operations["sparql_count"]["rows"] == 1
+    for name in ("add", "addN", "remove", "remove_graph", "bind"):
+        assert operations[name]["rows"] == 10
+
+    results = dict(environment=environment(), datasets={"500": result})
+    assert compare(results, results) == []
+    baseline = copy.deepcopy(results)
+    baseline["datasets"]["500"]["operations"]["???"]["warm"] /= 10
+    regressions = compare(results, baseline, minimum=0)
+    assert [(r["operation"], r["mode"]) for r in regressions] == [
+        ("???", "warm")
     ]
-    op = ",".join(keys) + "\n"
-    for d in timings:
-        row = ",".join(str(d[k]) for k in keys)
-        op += row + "\n"
-
-    logger.info(op)
-
-
-def test_timing():
-    results = []
-
-    for (k, (ntriples, nfoaf)) in fixturelist:
-        inputloc = os.getcwd() + f"/test/sp2b/{k}.n3"
-
-        if os.path.isdir(path):
-            shutil.rmtree(path)
-        elif os.path.exists(path):
-            os.remove(path)
-
-        results.append(process_input(inputloc, k, ntriples, nfoaf))
-    process_test_data(results)
-
-
-def process_input(inputloc, k, ntriples, nfoaf):
-    timings = dict(
-        ntriples=ntriples,
-        loading=0,
-        opening=0,
-        iterating=0,
-        lengthing=0,
-        subjects=0,
+    assert regressions[0]["ratio"] > 9
+
+
+def test_main():
+    argv = [location, "--repeat", "1", "--batch", "10", "-o", output]
+    assert main(argv + ["--operation", "len"]) == 0
+    with open(output) as f:
+        results = json.load(f)
+    assert results["settings"]["layout"] == "files"
+    assert results["environment"]["rdflib_sqlitelsm"]
+    assert list(results["datasets"]["500triples"]["operations"]) == ["len"]
+
+    results["datasets"]["500triples"]["load"] /= 1000
+    with open(output, "w") as f:
+        json.dump(results, f)
+    argv += ["--baseline", output, "--operation", "len", "--layout"]
+    assert main(argv + ["keyspace"]) == 1
+    os.remove(output)
+
+
+def test_benchmark_synthetic():
+    result = benchmark(
+        "synthetic:2000",
+        path=path,
+        operations=("len", "contexts", "?p?"),
+        repeat=1,
     )
-
-    gcold = gc.isenabled()
-    gc.collect()
-    gc.disable()
-
-    graph = Graph(store, URIRef("http://rdflib.net"))
-
-    graph.open(path, create=True)
-
-    t0 = time()
-    graph.parse(location=inputloc, format="n3")
-    t1 = time()
-
-    timings["loading"] = t1 - t0
-
-    graph.close()
-
-    del graph
-
-    graph = Graph(store, URIRef("http://rdflib.net"))
-
-    # Read triples back into memory from store
-    t0 = time()
-    graph.open(path, create=False)
-    t1 = time()
-    assert len(graph) == ntriples, len(graph)
-    timings["opening"] = t1 - t0
-
-    t0 = time()
-    for triple in graph.triples((None, None, None)):
-        pass
-    t1 = time()
-    timings["iterating"] = t1 - t0
-
-    t0 = time()
-    assert len(list(graph.triples((None, None, None)))) == ntriples
-    t1 = time()
-    timings["lengthing"] = t1 - t0
-
-    t0 = time()
-    res = graph.subjects(predicate=RDF.type, object=FOAF.Person)
-    t1 = time()
-    timings["subjects"] = t1 - t0
-    assert len(list(res)) == nfoaf
-
-    graph.close()
-    graph.destroy(path)
-
-    if gcold:
-        gc.enable()
-    del graph
-
-    if os.path.isdir(path):
-        shutil.rmtree(path)
-    elif os.path.exists(path):
-        os.remove(path)
-
-    return timings
+    assert result["triples"] == 2000
+    assert result["operations"]["len"]["rows"] == 2000
+    assert result["operations"]["contexts"]["rows"] == 1
@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import ConjunctiveGraph, Literal, URIRef
+from rdflib.namespace import RDFS
+from rdflib.store import VALID_STORE
+
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore, tokenize
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_text")
+
+data = """
+    PREFIX : <https://example.org/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    :tim rdfs:label "Tim Berners-Lee" ; :note "Inventor of the Web" .
+    :dan rdfs:label "Dan Brickley" ; :note "Co-author of FOAF, like Tim" .
+    :web rdfs:label "World Wide Web"@en .
+    """
+
+
+@pytest.fixture
+def get_graph():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = ConjunctiveGraph(store=SQLiteLSMStore(text_index=True))
+    assert graph.open(path, create=True) == VALID_STORE
+    graph.parse(data=data, format="ttl")
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def test_tokenize():
+    assert tokenize("Tim Berners-Lee") == ["tim", "berners", "lee"]
+    assert tokenize("  STRASSE, Straße ") == ["strasse", "strasse"]
+    assert tokenize("") == []
+
+
+def test_text_search(get_graph):
+    store = get_graph.store
+    tim = URIRef("https://example.org/tim")
+    dan = URIRef("https://example.org/dan")
+    web = URIRef("https://example.org/web")
+
+    found = {triple for triple, contexts in store.text_search("tim")}
+    assert {s for s, p, o in found} == {tim, dan}
+
+    found = [triple for triple, contexts in store.text_search("TIM berners")]
+    assert found == [(tim, RDFS.label, Literal("Tim Berners-Lee"))]
+
+    found = {s for (s, p, o), c in store.text_search("web", RDFS.label)}
+    assert found == {web}
+
+    assert list(store.text_search("nobody")) == []
+    assert list(store.text_search("tim nobody")) == []
+
+
+def test_rebuild_text_index(get_graph):
+    graph = get_graph
+    graph.close()
+
+    # Reopening without the option keeps maintaining the existing index
+    graph = ConjunctiveGraph(store="SQLiteLSM")
+    graph.open(path, create=False)
+    graph.add((URIRef("urn:example:x"), RDFS.label, Literal("Timbuktu")))
+    assert len(list(graph.store.text_search("timbuktu"))) == 1
+
+    graph.store.rebuild_text_index()
+    assert len(list(graph.store.text_search("tim"))) == 2
+    assert len(list(graph.store.text_search("timbuktu"))) == 1
+    graph.close()
+
+
+def test_no_text_index():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = ConjunctiveGraph(store="SQLiteLSM")
+    graph.open(path, create=True)
+    graph.parse(data=data, format="ttl")
+    with pytest.raises(Exception):
+        list(graph.store.text_search("tim"))
+    graph.store.rebuild_text_index()
+    assert len(list(graph.store.text_search("tim"))) == 2
+    graph.close()
+    graph.destroy(configuration=path)
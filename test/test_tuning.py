@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from lsm import SAFETY_FULL, SAFETY_NORMAL
+from rdflib import Graph, URIRef
+
+from rdflib_sqlitelsm.sqlitelsmstore import (
+    SQLiteLSMStore,
+    dbparams,
+    parse_tuning,
+)
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_tuning")
+
+context = URIRef("http://rdflib.net")
+
+
+def test_parse_tuning():
+    assert parse_tuning(
+        "autoflush=1024&index.mmap=on&index.block_size=8192"
+        "&dictionary.safety=full&k2i.safety=1"
+    ) == {
+        None: {"autoflush": 1024},
+        "index": {"mmap": True, "block_size": 8192},
+        "dictionary": {"write_safety": SAFETY_FULL},
+        "k2i": {"write_safety": SAFETY_NORMAL},
+    }
+    assert parse_tuning({"index.mmap": False}) == {"index": {"mmap": False}}
+    with pytest.raises(ValueError):
+        parse_tuning("indices.mmap=1")
+    assert parse_tuning("i2k.compression=zlib") == {
+        "i2k": {"compression": "zlib"}
+    }
+    for key in ("compression", "index.compression", "k2i.compression"):
+        with pytest.raises(ValueError, match="Only the dictionary"):
+            parse_tuning({key: "zlib"})
+
+
+def test_db_params():
+    store = SQLiteLSMStore(
+        {"autoflush": 1024, "index.mmap": True, "dictionary.safety": "full"}
+    )
+    assert store.db_params("cspo") == dict(dbparams, autoflush=1024, mmap=True)
+    assert store.db_params("i2k") == dict(
+        dbparams, autoflush=1024, write_safety=SAFETY_FULL
+    )
+    assert store.db_params("namespace") == dict(dbparams, autoflush=1024)
+
+
+def test_tuned_store():
+    shutil.rmtree(path, ignore_errors=True)
+    graph = Graph(SQLiteLSMStore({"index.block_size": 8192}), context)
+    graph.open(
+        path + "?index.mmap=1&dictionary.safety=full"
+        "&dictionary.transaction_log=1",
+        create=True,
+    )
+    store = graph.store
+    assert store.db_params("cosp")["block_size"] == 8192
+    assert store.db_params("cosp")["mmap"] == 1
+    assert store.db_params("k2i")["write_safety"] == SAFETY_FULL
+    assert os.path.exists(os.path.join(path, "k2i.db"))
+
+    graph.parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+    assert len(graph) == 1285
+    graph.close()
+
+    graph = Graph("SQLiteLSM", context)
+    graph.open(path, create=False)
+    assert len(graph) == 1285
+    graph.close()
+    graph.destroy(configuration=path + "?index.mmap=1")
+    assert not os.path.exists(path)
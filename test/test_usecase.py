@@ -157,7 +157,8 @@ def test_basic():
         True,
     )
 
-    assert len(list(g.contexts())) == 1
+    # subgraph2, added (empty) as a graph, and context2
+    assert len(list(g.contexts())) == 2
 
     g.remove((None, None, None))
 
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from rdflib import ConjunctiveGraph, Literal, URIRef
+from rdflib.namespace import FOAF, RDF
+
+from rdflib_sqlitelsm import sqlitelsmstore
+from rdflib_sqlitelsm.sqlitelsmstore import SQLiteLSMStore
+
+path = os.path.join(tempfile.gettempdir(), "test_sqlitelsm_vacuum")
+
+context1 = URIRef("urn:example:graph1")
+context2 = URIRef("urn:example:graph2")
+michel = URIRef("urn:example:michel")
+name = Literal("Michel Foucault")
+
+
+@pytest.fixture(params=["files", "keyspace"])
+def get_graph(request):
+    shutil.rmtree(path, ignore_errors=True)
+    graph = ConjunctiveGraph(
+        SQLiteLSMStore(
+            text_index=True, autocomplete_index=True, layout=request.param
+        )
+    )
+    graph.open(path, create=True)
+    graph.get_context(context1).parse(
+        location=os.path.join(
+            os.path.dirname(__file__), "sp2b", "1ktriples.n3"
+        ),
+        format="n3",
+    )
+
+    yield graph
+
+    graph.close()
+    graph.destroy(configuration=path)
+
+
+def nterms(store):
+    return sum(1 for i in store._tables()["i2k"])
+
+
+def test_vacuum_terms(get_graph):
+    graph = get_graph
+    store = graph.store
+    assert store.vacuum_terms() == 0
+    expected = set(graph.quads((None, None, None, None)))
+    before = nterms(store)
+
+    graph.get_context(context2).add((michel, FOAF.name, name))
+    graph.get_context(context2).add((michel, RDF.type, FOAF.Person))
+    # A probe mints an ID for a term the store doesn't hold
+    assert (
+        list(graph.triples((URIRef("urn:example:nobody"), None, None))) == []
+    )
+    assert nterms(store) == before + 4
+    graph.remove((michel, None, None))
+
+    assert store.vacuum_terms() == 3
+    assert nterms(store) == before + 1  # the (now empty) context2
+    assert store.vacuum_terms() == 0
+    assert set(graph.quads((None, None, None, None))) == expected
+    assert list(store.text_search("foucault")) == []
+    assert store.terms_with_prefix("michel") == []
+
+    # Removed terms are minted again, with new IDs
+    graph.get_context(context2).add((michel, FOAF.name, name))
+    assert graph.value(michel, FOAF.name) == name
+    assert [t for t, c in store.text_search("foucault")] == [
+        (michel, FOAF.name, name)
+    ]
+
+
+def test_vacuum_under_snapshot(get_graph):
+    graph = get_graph
+    store = graph.store
+    graph.get_context(context2).add((michel, FOAF.name, name))
+    with store.snapshot():
+        graph.remove((michel, None, None))
+        assert store.vacuum_terms() == 2
+        # Reads within the snapshot still see the terms
+        assert graph.value(michel, FOAF.name) == name
+    assert graph.value(michel, FOAF.name) is None
+    # The IDs of the deleted terms read in the snapshot aren't reused
+    graph.get_context(context2).add((michel, FOAF.name, name))
+    assert store.vacuum_terms() == 0
+    assert graph.value(michel, FOAF.name) == name
+
+
+def test_vacuum_in_chunks(get_graph, monkeypatch):
+    graph = get_graph
+    store = graph.store
+    monkeypatch.setattr(sqlitelsmstore, "BULK_CHUNK", 2)
+    expected = set(graph.quads((None, None, None, None)))
+    before = nterms(store)
+    for n in range(5):
+        graph.get_context(context2).add(
+            (michel, FOAF.name, Literal(f"Michel {n}"))
+        )
+    graph.remove((michel, None, None))
+
+    assert store.vacuum_terms() == 6
+    assert nterms(store) == before + 1
+    assert set(graph.quads((None, None, None, None))) == expected